@@ -0,0 +1,87 @@
+"""Micro-benchmark for the ATR_MEDIAN rolling median on 3y and 10y series.
+
+  pandas     Series.rolling(n).median() (calculate_indicators, per ticker)
+  sorted     a sorted window slid in numpy (searchsorted + insert/delete)
+  stream     RollingMedian peek+push, one bar at a time (IndicatorEngine)
+  strided    np.median over a (ticker, date, window) view (old panel path)
+  kernel     core.rolling.rolling_median on the whole (ticker, date) matrix
+
+Usage: python benchmarks/rolling_median.py [--tickers 500] [--window 100]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.rolling import RollingMedian, rolling_median  # noqa: E402
+
+SERIES = {"3y": 756, "10y": 2520}
+
+
+def _best(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def _sorted_window(row, window):
+    out = np.full(len(row), np.nan)
+    win = np.sort(row[:window - 1])
+    for i in range(window - 1, len(row)):
+        win = np.insert(win, np.searchsorted(win, row[i]), row[i])
+        out[i] = (win[(window - 1) // 2] + win[window // 2]) / 2
+        win = np.delete(win, np.searchsorted(win, row[i - window + 1]))
+    return out
+
+
+def _streaming(row, window):
+    med = RollingMedian(window)
+    for v in row:
+        med.peek(v)
+        med.push(v)
+
+
+def _strided(x, window):
+    out = np.full(x.shape, np.nan)
+    out[:, window - 1:] = np.median(sliding_window_view(x, window, axis=1), axis=-1)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--window", type=int, default=100)
+    args = parser.parse_args()
+    w = args.window
+    rng = np.random.default_rng(0)
+
+    print(f"window={w}, panel={args.tickers} tickers")
+    print(f"{'':5} {'one ticker (ms)':^29}   {'panel (s)':^29}")
+    print(f"{'':5} {'pandas':>9} {'sorted':>9} {'stream':>9}   {'pandas':>9} {'strided':>9} {'kernel':>9}")
+    for label, n in SERIES.items():
+        # ATR-like: positive and slowly varying, no warm-up gaps.
+        x = np.abs(rng.normal(1.0, 0.2, size=(args.tickers, n))).cumsum(axis=1) / np.arange(1, n + 1)
+        one = x[0]
+        assert np.array_equal(rolling_median(x, w), _strided(x, w), equal_nan=True)
+        assert np.array_equal(rolling_median(one, w), _sorted_window(one, w), equal_nan=True)
+
+        single = [
+            _best(lambda: pd.Series(one).rolling(w).median(), 50),
+            _best(lambda: _sorted_window(one, w), 5),
+            _best(lambda: _streaming(one, w), 5),
+        ]
+        panel = [
+            _best(lambda: [pd.Series(r).rolling(w).median() for r in x], 1),
+            _best(lambda: _strided(x, w), 1),
+            _best(lambda: rolling_median(x, w), 1),
+        ]
+        print(f"{label:5} " + " ".join(f"{t * 1e3:9.3f}" for t in single)
+              + "   " + " ".join(f"{t:9.3f}" for t in panel))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,41 @@
+import copy
+import json
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from core.data_fetcher import fetch_data
-from core.indicators import calculate_indicators, check_trinity_setup, check_panic_setup, check_2b_setup, check_donchian_setup
+from functools import reduce
+from types import SimpleNamespace
+from core.bar_store import overlap_matches
+from core.checkpoint import BacktestCheckpoint
+from core.data_fetcher import fetch_many
+from core.edge_stats import EDGE_KEYS, EDGE_STATS_FILE, build_edge_stats, save_edge_stats
+from core.ledger import EQUITY_COLUMNS, TRADE_COLUMNS, ColumnLog
+from core.monte_carlo import MC_PATHS, resample_trades
+from core.panel import build_panel
+from core.performance import performance_metrics
+from core.panel_indicators import calculate_panel_indicators
+from core.regime_stats import RegimeStatsAccumulator
+from core.range_query import SparseTable
+from core.sessions import period_start
+from core.signals import strategy_signals
+from core.streaming import IndicatorEngine
 try:
-    from tracker.position import PositionManager
+    from tracker.position import EXIT_MODE_ATR, EXIT_MODE_DONCHIAN, PositionManager
 except ImportError:
-    from src.tracker.position import PositionManager
+    from src.tracker.position import EXIT_MODE_ATR, EXIT_MODE_DONCHIAN, PositionManager
+
+DONCHIAN_EXIT_WINDOW = 20  # Turtle exit channel, as in the live tracker
 
 class Portfolio:
     def __init__(self, initial_balance=100000):
         self.initial_balance = initial_balance
         self.cash = initial_balance
         self.positions = {} # {ticker: PositionManager}
-        self.history = []
-        self.equity_curve = []
+        self.start_equity = initial_balance  # equity before the first kept equity mark
+        self.history = ColumnLog(TRADE_COLUMNS)       # one row per (partial) exit
+        self.equity_curve = ColumnLog(EQUITY_COLUMNS)  # one row per simulated day
 
     def current_equity(self, current_prices):
         equity = self.cash
@@ -76,7 +97,8 @@ class Portfolio:
 
         return max(0.0, final_qty)
 
-    def open_position(self, ticker, price, qty, sl, tp, strategy, date, side="LONG", atr=None, risk_params=None):
+    def open_position(self, ticker, price, qty, sl, tp, strategy, date, side="LONG", atr=None, risk_params=None,
+                      exit_mode=EXIT_MODE_ATR):
         cost = price * qty
         if self.cash < cost:
             return False # Insufficient funds
@@ -86,7 +108,8 @@ class Portfolio:
         # Instantiate PositionManager — pass the strategy-designed SL through so
         # the position honors the same stop that sizing was calculated against.
         pos = PositionManager(ticker, price, qty, side, atr_at_entry=atr, tp1=tp,
-                              initial_sl=sl, risk_params=risk_params)
+                              initial_sl=sl, risk_params=risk_params, exit_mode=exit_mode,
+                              donchian_exit_window=DONCHIAN_EXIT_WINDOW)
         # Store metadata that PositionManager doesn't care about but Backtester does
         pos.strategy = strategy
         pos.entry_date = date
@@ -142,24 +165,135 @@ class Portfolio:
         if pos.qty <= 0:
             del self.positions[ticker]
 
+    def evict_before(self, cutoff):
+        """Forget trades entered, and equity marks, before `cutoff`: the
+        rolling window of a resumed run. ROI then counts from start_equity,
+        the last evicted mark."""
+        cutoff = pd.Timestamp(cutoff).value
+        old = self.equity_curve.column('date') < cutoff
+        if old.any():
+            self.start_equity = float(self.equity_curve.column('equity')[old][-1])
+            self.equity_curve.keep(~old)
+        self.history.keep(self.history.column('entry_date') >= cutoff)
+
 class Backtester:
     def __init__(self, tickers, period="3y"):
         self.tickers = tickers
         self.period = period
         self.portfolio = Portfolio()
+        self.shadow_portfolios = {} # {name: Portfolio}, from run(shadows=...)
         self.data_store = {} # {ticker: df}
-
-    def load_data(self):
-        print(f"Helper: Downloading data for {len(self.tickers)} tickers ({self.period})...")
+        self._score_memo = {} # {ticker: (df, {(strategy, params): (signals, confidence)})}
+        self._engines = {} # {ticker: IndicatorEngine at data_store's last bar}, after resume()
+        self._resume_point = None # (day, Portfolio before it), from run(checkpoint=True)
+
+    def load_data(self, panel=None):
+        """Populate data_store. With a universe `panel` (core.panel) the bars
+        come straight from its arrays instead of the data fetcher."""
+        if panel is None:
+            print(f"Helper: Downloading data for {len(self.tickers)} tickers ({self.period})...")
+            frames = fetch_many(self.tickers, period=self.period).frames
+            panel = build_panel(frames, tickers=self.tickers, period=self.period)
+        # One vectorized indicator pass for the whole universe.
+        frames = calculate_panel_indicators(panel).frames(self.tickers)
+        self._engines = {}
         for t in self.tickers:
-            df = fetch_data(t, period=self.period)
+            df = frames.get(t)
             if df is not None and not df.empty:
-                df = calculate_indicators(df)
                 self.data_store[t] = df
             else:
                 print(f"Warning: No data for {t}")
 
-    def run(self, min_confidence=70, strategies=None, strategy_params=None, risk_params=None):
+    def _bars(self, df, dates):
+        """The columns the day loop reads, as plain arrays, plus `day`: the
+        bar position for each position in `dates` (-1 where the ticker has
+        no bar that day), and `where`, its inverse."""
+        where = dates.searchsorted(df.index)
+        day = np.full(len(dates), -1, dtype=np.intp)
+        day[where] = np.arange(len(df))
+        return SimpleNamespace(
+            index=df.index, day=day, where=where,
+            open=df['Open'].to_numpy(), high=df['High'].to_numpy(),
+            low=df['Low'].to_numpy(), close=df['Close'].to_numpy(),
+            atr=df['ATR_14'].to_numpy() if 'ATR_14' in df.columns else None,
+        )
+
+    def _scores(self, ticker, b, key, params):
+        """(signals, confidence per bar) for one strategy on one ticker, with
+        -inf on bars it can't enter on. Only the bars, the strategy and its
+        params decide this, so the latest result is kept per (ticker,
+        strategy). Reruns that only change min_confidence, risk params or
+        other strategies' params reuse it.
+
+        A bar is tradable if the Close is at least 5 and there is a next
+        bar with a valid Open to fill at.
+        """
+        df = self.data_store[ticker]
+        memo_key = (key, json.dumps(params, sort_keys=True))
+        built_from, per_ticker = self._score_memo.get(ticker, (None, {}))
+        if built_from is not df:            # new bars for this ticker
+            per_ticker = {}
+            self._score_memo[ticker] = (df, per_ticker)
+        if memo_key in per_ticker:
+            return per_ticker[memo_key]
+
+        built = strategy_signals(df, [key], {key: params} if params else None)
+        if not built:
+            return None
+        (sig,) = built
+        n = len(b.close)
+        tradable = ~(b.close < 5)
+        tradable[-1:] = False               # no next bar to execute on
+        nxt = np.append(b.open[1:], np.nan)
+        tradable &= ~(np.isnan(nxt) | (nxt <= 0))
+
+        confidence = np.full(n, -np.inf)
+        at = np.flatnonzero(sig.signal & tradable)
+        if sig.uses_stats:
+            stats = RegimeStatsAccumulator(df, key.lower(), params=params).stats_at(at)
+        else:
+            stats = [None] * len(at)
+        confidence[at] = [sig.confidence(i, st) for i, st in zip(at.tolist(), stats)]
+
+        for k in [k for k in per_ticker if k[0] == key]:
+            del per_ticker[k]               # keep one params variant per strategy
+        per_ticker[memo_key] = (sig, confidence)
+        return sig, confidence
+
+    def _entry_candidates(self, ticker, b, order, params_for, min_confidence):
+        """{bar: (sig, confidence)} for every bar an entry could be taken on.
+
+        Each bar's candidates are every strategy that fires there. The one
+        with the highest confidence wins, and on a tie the first in `order`
+        wins. It must also clear min_confidence. None of this depends on
+        the portfolio. Only "already holding" is left for the day loop.
+        """
+        scored = [self._scores(ticker, b, name, params_for(name)) for name in order]
+        scored = [x for x in scored if x is not None]
+        if not scored:
+            return {}
+        sigs = [sig for sig, _ in scored]
+        confidence = np.stack([conf for _, conf in scored])
+        best = confidence.argmax(axis=0)    # first of equal maxima
+        best_conf = confidence[best, np.arange(confidence.shape[1])]
+        take = np.flatnonzero(best_conf >= min_confidence)
+        return {i: (sigs[best[i]], int(best_conf[i])) for i in take.tolist()}
+
+    def run(self, min_confidence=70, strategies=None, strategy_params=None, risk_params=None,
+            start=None, end=None, shadows=None, checkpoint=False):
+        """Simulate the portfolio day by day. `start` / `end` limit the
+        simulated days to [start, end). Signals and regime stats still see
+        the whole history up to each day, and an entry is only taken if it
+        fills before `end`.
+
+        `shadows` ({name: {'strategies': [...], 'exit_mode': 'atr' |
+        'donchian'}}) runs extra portfolios in the same pass, left in
+        self.shadow_portfolios. Each one trades like a run restricted to
+        its strategies (default: all of them), with the given exit mode.
+
+        `checkpoint` keeps the main portfolio as it was before the last
+        day, for checkpoint() / resume().
+        """
         # Default to ALL strategies if None
         if strategies is None:
             strategies = ["TRINITY", "PANIC", "2B"]
@@ -167,171 +301,290 @@ class Backtester:
             strategies = [s.upper() for s in strategies]
             
         # 1. Align Dates (Find common date range or just union)
-        # We need to iterate day by day to simulate realistic portfolio state
-        all_dates = set()
-        for df in self.data_store.values():
-            all_dates.update(df.index)
-        
-        sorted_dates = sorted(list(all_dates))
-        print(f"Simulation Range: {sorted_dates[0].date()} to {sorted_dates[-1].date()} ({len(sorted_dates)} trading days)")
+        # We need to iterate day by day to simulate realistic portfolio state.
+        # Each ticker's bars are then addressed by integer position: bars.day
+        # maps a position in `dates` to the ticker's own bar (or -1).
+        dates = reduce(pd.Index.union, (df.index for df in self.data_store.values()))
+        first = dates.searchsorted(start) if start is not None else 0
+        stop = dates.searchsorted(end) if end is not None else len(dates)
+        if first >= stop:
+            print("Warning: No trading days in the simulation range")
+            return
+        print(f"Simulation Range: {dates[first].date()} to {dates[stop - 1].date()} ({stop - first} trading days)")
+        bars = {ticker: self._bars(df, dates) for ticker, df in self.data_store.items()}
+
+        # Entry signals and trade plans for every bar, evaluated once per
+        # ticker (core.signals), scored with point-in-time regime stats
+        # (core.regime_stats) instead of re-backtesting df.loc[:current_date]
+        # on every bar (which made the run quadratic in history length).
+        # Collect every strategy that fires, then pick the one with highest
+        # confidence. (Old code did first-match dispatch, which silenced
+        # PANIC whenever TRINITY happened to fire with a decay-penalized
+        # confidence < min_confidence — discarding what would have been a
+        # valid PANIC trade.)
+        params_for = lambda name: strategy_params.get(name) if strategy_params else None
+        order = [name for name in ("TRINITY", "PANIC", "2B", "DONCHIAN") if name in strategies]
+
+        # One book per portfolio: the main one, plus any shadows. A shadow
+        # takes only its own strategies' signals (picked among themselves
+        # exactly as a run with just those strategies would) and may exit
+        # in another mode. All books share the bars and the signal scores.
+        books = [SimpleNamespace(portfolio=self.portfolio, order=order, exit_mode=EXIT_MODE_ATR)]
+        self.shadow_portfolios = {}
+        for name, spec in (shadows or {}).items():
+            only = [s.upper() for s in spec.get('strategies') or order]
+            self.shadow_portfolios[name] = type(self.portfolio)(self.portfolio.initial_balance)
+            books.append(SimpleNamespace(portfolio=self.shadow_portfolios[name],
+                                         order=[s for s in order if s in only],
+                                         exit_mode=spec.get('exit_mode', EXIT_MODE_ATR)))
+        if any(book.exit_mode == EXIT_MODE_DONCHIAN for book in books):
+            for b in bars.values():
+                b.donchian_low = SparseTable(b.low, 'min').rolling(DONCHIAN_EXIT_WINDOW, shift=1)
+
+        for book in books:
+            book.entries_on = [[] for _ in range(len(dates))]    # per date: (ticker, bar, sig, confidence)
+            for ticker in self.tickers:
+                if ticker not in self.data_store:
+                    continue
+                b = bars[ticker]
+                for i, (sig, confidence) in self._entry_candidates(ticker, b, book.order, params_for, min_confidence).items():
+                    book.entries_on[b.where[i]].append((ticker, i, sig, confidence))
+
+        if checkpoint:
+            self._run_kwargs = dict(min_confidence=min_confidence, strategies=strategies,
+                                    strategy_params=strategy_params, risk_params=risk_params)
 
         # 2. Daily Loop
-        for current_date in sorted_dates:
-            # Capture current prices for equity calc
-            current_prices = {}
+        for j in range(first, stop):
+            if checkpoint and j == stop - 1:
+                self._resume_point = (dates[j], copy.deepcopy(self.portfolio))
+            for book in books:
+                self._simulate_day(book, j, dates[j], bars, stop, risk_params)
+
+    def _simulate_day(self, book, j, current_date, bars, stop, risk_params):
+        """Exits, then entries, then the equity mark for one book on dates[j]."""
+        portfolio = book.portfolio
+        # Capture current prices for equity calc
+        current_prices = {}
+
+        # --- A. Check Exits (Stop Loss / Take Profit) ---
+        active_tickers = list(portfolio.positions.keys())
+
+        for ticker in active_tickers:
+            b = bars.get(ticker)
+            i = b.day[j] if b is not None else -1
+            if i < 0:
+                continue
+
+            pos = portfolio.positions[ticker]
+            bar_open, bar_high, bar_low = b.open[i], b.high[i], b.low[i]
             
-            # --- A. Check Exits (Stop Loss / Take Profit) ---
-            # ... (Exit logic remains unchanged)
-            active_tickers = list(self.portfolio.positions.keys())
+            current_prices[ticker] = b.close[i]
             
-            for ticker in active_tickers:
-                df = self.data_store.get(ticker)
-                if df is None or current_date not in df.index:
-                    continue
-                
-                row = df.loc[current_date]
-                pos = self.portfolio.positions[ticker]
-                
-                current_prices[ticker] = row['Close']
-                
-                # --- CHECK EXITS (Dynamic via PositionManager) ---
-                current_atr = row.get('ATR_14', 0)
-                
-                sl_hit_price = None
-                if pos.side == 'LONG':
-                    if row['Low'] <= pos.current_sl:
-                        sl_hit_price = pos.current_sl
-                        if row['Open'] < pos.current_sl: sl_hit_price = row['Open']
-                else:
-                    if row['High'] >= pos.current_sl:
-                        sl_hit_price = pos.current_sl
-                        if row['Open'] > pos.current_sl: sl_hit_price = row['Open']
-
-                if sl_hit_price:
-                     self.portfolio.close_position(ticker, sl_hit_price, current_date, reason="Stop Loss (Dynamic)")
-                     continue
-
-                trail_price = row['High'] if pos.side == 'LONG' else row['Low']
+            # --- CHECK EXITS (Dynamic via PositionManager) ---
+            current_atr = b.atr[i] if b.atr is not None else 0
+            
+            sl_hit_price = None
+            if pos.side == 'LONG':
+                if bar_low <= pos.current_sl:
+                    sl_hit_price = pos.current_sl
+                    if bar_open < pos.current_sl: sl_hit_price = bar_open
+            else:
+                if bar_high >= pos.current_sl:
+                    sl_hit_price = pos.current_sl
+                    if bar_open > pos.current_sl: sl_hit_price = bar_open
+
+            if sl_hit_price:
+                 portfolio.close_position(ticker, sl_hit_price, current_date, reason="Stop Loss (Dynamic)")
+                 continue
+
+            trail_price = bar_high if pos.side == 'LONG' else bar_low
+            if pos.exit_mode == EXIT_MODE_DONCHIAN:
+                low = b.donchian_low[i]
+                res = pos.update(trail_price, current_atr, donchian_low=None if np.isnan(low) else low)
+            else:
                 res = pos.update(trail_price, current_atr) # PositionManager uses internal injected params if updated
-                
-                if res['action']:
-                    if "SELL_HALF" in res['action']:
-                        if not pos.tp1_hit:
-                             exit_px = pos.tp1
-                             self.portfolio.close_position(ticker, exit_px, current_date, reason="Take Profit 1 (Ladder)", qty_to_close=pos.qty * 0.5)
             
-            # --- B. Check Entries (Signals) ---
-            # Signal is detected on bar t (using data up to t inclusive), but
-            # EXECUTION happens at bar t+1 Open — mirrors reality (EOD signal →
-            # next session fill) and removes the "same-bar close signal + fill"
-            # lookahead bias.
-            for ticker in self.tickers:
-                if ticker in self.portfolio.positions:
-                    continue  # Already holding
-
-                df = self.data_store.get(ticker)
-                if df is None or current_date not in df.index:
-                    continue
-
-                # Need a next bar to execute on; skip if today is the last bar.
-                idx_today = df.index.get_loc(current_date)
-                if idx_today >= len(df) - 1:
-                    continue
-
-                df_context = df.loc[:current_date]
-                row = df.loc[current_date]
+            if res['action']:
+                if "SELL_HALF" in res['action']:
+                    if not pos.tp1_hit:
+                         exit_px = pos.tp1
+                         portfolio.close_position(ticker, exit_px, current_date, reason="Take Profit 1 (Ladder)", qty_to_close=pos.qty * 0.5)
+        
+        # --- B. Check Entries (Signals) ---
+        # Signal is detected on bar t (using data up to t inclusive), but
+        # EXECUTION happens at bar t+1 Open — mirrors reality (EOD signal →
+        # next session fill) and removes the "same-bar close signal + fill"
+        # lookahead bias. Only tickers with a qualifying signal today are
+        # visited, in self.tickers order.
+        curr_eq = None
+        for ticker, idx_today, sig, confidence in book.entries_on[j]:
+            if ticker in portfolio.positions:
+                continue  # Already holding
+
+            b = bars[ticker]
+            if b.where[idx_today + 1] >= stop:
+                continue  # would fill after the simulated range
+            fill_price = b.open[idx_today + 1]
+            plan = sig.plan(idx_today)
+            sl = plan['stop_loss']
+            tp = plan['take_profit']
+
+            # Current equity for sizing. Prices are fixed for the rest of
+            # the day, so it only changes when a position opens. It is
+            # still summed over the (few) open positions, not kept as a
+            # running total: the summation order decides the last bits
+            # of the size.
+            if curr_eq is None:
+                curr_eq = portfolio.current_equity(current_prices)
+
+            qty = portfolio.calculate_size(fill_price, sl, confidence, curr_eq, risk_params=risk_params)
+
+            # open_position would refuse it anyway; skip building its args.
+            if qty > 0 and fill_price * qty <= portfolio.cash:
+                atr = b.atr[idx_today + 1] if b.atr is not None else fill_price * 0.05
+                side = sig.side_at(idx_today)
+                # The Turtle channel exit is long-only; shorts keep the ATR trail.
+                exit_mode = book.exit_mode if side == 'LONG' else EXIT_MODE_ATR
+                if portfolio.open_position(
+                    ticker, fill_price, qty, sl, tp,
+                    sig.strategy, b.index[idx_today + 1],
+                    side=side,
+                    atr=atr,
+                    risk_params=risk_params,
+                    exit_mode=exit_mode
+                ):
+                    curr_eq = None
+
+        # End of Day Tracking
+        portfolio.equity_curve.append({
+            'date': current_date,
+            'equity': portfolio.current_equity(current_prices),
+            'cash': portfolio.cash
+        })
 
-                if row['Close'] < 5:
-                    continue
+    def checkpoint(self):
+        """The state to resume the last run(checkpoint=True) from (see
+        core.checkpoint)."""
+        if self._resume_point is None:
+            raise ValueError("run(checkpoint=True) first")
+        as_of, portfolio = self._resume_point
+        engines = {}
+        for t, df in self.data_store.items():
+            engine = self._engines.get(t) or IndicatorEngine.seed(df[list(IndicatorEngine.BAR_FIELDS)])
+            engines[t] = engine.to_dict()
+        return BacktestCheckpoint(self.period, as_of, dict(self._run_kwargs), copy.deepcopy(portfolio),
+                                  dict(self.data_store), engines)
+
+    def resume(self, checkpoint, frames):
+        """Continue a checkpointed run with the bars of `frames` ({ticker:
+        OHLCV frame}) from the checkpoint's last bar on. Only those days are
+        simulated; the new indicator rows come from the checkpointed
+        engines. Frames are trimmed to the `period` window first, and
+        trades entered before it are evicted afterwards, so neither grows
+        from one resume to the next.
+
+        Returns False, without changing anything, if a frame no longer
+        reaches back to its checkpoint's last bar (too old to continue), or
+        if its closes no longer match the checkpointed ones on shared dates
+        (history re-adjusted for a split or dividend): the checkpointed
+        indicators and positions are on the old price basis.
+        """
+        data_store, engines = {}, {}
+        for t, df in checkpoint.frames.items():
+            engine = IndicatorEngine.from_dict(checkpoint.engines[t])
+            bars = frames.get(t)
+            new = bars[bars.index >= engine.last_label] if bars is not None else None
+            if new is None or new.empty:
+                data_store[t], engines[t] = df, engine
+                continue
+            if bars.index[0] > engine.last_label or not overlap_matches(df, bars):
+                return False
+            rows = [engine.update(label, o, h, l, c, v) for label, o, h, l, c, v in zip(
+                new.index, *(new[f].to_numpy() for f in IndicatorEngine.BAR_FIELDS))]
+            data_store[t] = _extend_frame(df, new.index, rows)
+            engines[t] = engine
+
+        cutoff = period_start(self.period, max(df.index[-1] for df in data_store.values()))
+        if cutoff is not None:
+            data_store = {t: df[df.index >= cutoff] for t, df in data_store.items()}
+            data_store = {t: df for t, df in data_store.items() if not df.empty}
+
+        self.tickers = list(dict.fromkeys([*self.tickers, *data_store]))
+        self.data_store, self._engines = data_store, engines
+        self.portfolio = copy.deepcopy(checkpoint.portfolio)
+        self.run(start=checkpoint.as_of, checkpoint=True, **checkpoint.run_kwargs)
+        if cutoff is not None:
+            self.portfolio.evict_before(cutoff)
+        return True
 
-                # Collect every strategy that fires today, then pick the one
-                # with highest confidence. (Old code did first-match dispatch,
-                # which silenced PANIC whenever TRINITY happened to fire with a
-                # decay-penalized confidence < min_confidence — discarding what
-                # would have been a valid PANIC trade.)
-                candidates_today = []
-                if "TRINITY" in strategies:
-                    t_params = strategy_params.get('TRINITY') if strategy_params else None
-                    trinity = check_trinity_setup(row, df_context, params=t_params)
-                    if trinity:
-                        candidates_today.append(trinity)
-                if "PANIC" in strategies:
-                    p_params = strategy_params.get('PANIC') if strategy_params else None
-                    panic = check_panic_setup(row, df_context, params=p_params)
-                    if panic:
-                        candidates_today.append(panic)
-                if "2B" in strategies:
-                    _2b = check_2b_setup(row, df_context)
-                    if _2b:
-                        candidates_today.append(_2b)
-                if "DONCHIAN" in strategies:
-                    d_params = strategy_params.get('DONCHIAN') if strategy_params else None
-                    donchian = check_donchian_setup(row, df_context, params=d_params)
-                    if donchian:
-                        candidates_today.append(donchian)
-
-                scan_res = max(candidates_today, key=lambda x: x.get('confidence', 0)) if candidates_today else None
-
-                # Execute Entry on NEXT bar's Open
-                if scan_res:
-                    if scan_res['confidence'] < min_confidence:
-                        continue
-
-                    next_row = df.iloc[idx_today + 1]
-                    next_date = df.index[idx_today + 1]
-                    fill_price = next_row['Open']
-                    if pd.isna(fill_price) or fill_price <= 0:
-                        continue
-
-                    confidence = scan_res['confidence']
-                    plan = scan_res['plan']
-                    sl = plan['stop_loss']
-                    tp = plan['take_profit']
-
-                    # Updates current equity for sizing
-                    curr_eq = self.portfolio.current_equity(current_prices)
-
-                    qty = self.portfolio.calculate_size(fill_price, sl, confidence, curr_eq, risk_params=risk_params)
-
-                    if qty > 0:
-                        atr = next_row.get('ATR_14', fill_price * 0.05)
-                        self.portfolio.open_position(
-                            ticker, fill_price, qty, sl, tp,
-                            scan_res['strategy'], next_date,
-                            side=scan_res.get('side', 'LONG'),
-                            atr=atr,
-                            risk_params=risk_params
-                        )
-
-            # End of Day Tracking
-            self.portfolio.equity_curve.append({
-                'date': current_date,
-                'equity': self.portfolio.current_equity(current_prices),
-                'cash': self.portfolio.cash
-            })
+    def walk_forward(self, configs, in_sample_days=252, out_of_sample_days=63, rank_by="roi", max_workers=None):
+        """Walk-forward optimization of `configs` (sweep.SweepConfig) over the
+        loaded data. See sweep.walk_forward."""
+        try:
+            from src.sweep import walk_forward
+        except ImportError:
+            from sweep import walk_forward
+        return walk_forward(self, configs, in_sample_days, out_of_sample_days, rank_by, max_workers)
+
+    def refresh_edge_stats(self, min_confidence=70, exit_modes=(), path=EDGE_STATS_FILE):
+        """Recompute the per-strategy edge stats in one run and save the
+        artifact (see core.edge_stats). The main portfolio trades every
+        strategy; each strategy also trades alone in a shadow portfolio,
+        and once more per extra exit mode ('donchian') if asked."""
+        strategies = list(EDGE_KEYS)
+        shadows = {}
+        for name in strategies:
+            shadows[EDGE_KEYS[name]] = {'strategies': [name]}
+            for mode in exit_modes:
+                shadows[f"{EDGE_KEYS[name]}@{mode}"] = {'strategies': [name], 'exit_mode': mode}
+        for mode in exit_modes:
+            shadows[f"combined@{mode}"] = {'exit_mode': mode}
+
+        self.run(min_confidence=min_confidence, strategies=strategies, shadows=shadows)
+        books = {"combined": self.portfolio, **self.shadow_portfolios}
+        artifact = build_edge_stats(books, self.period, len(self.data_store), min_confidence)
+        save_edge_stats(artifact, path)
+        return artifact
+
+    def monte_carlo(self, n_paths=MC_PATHS, method="bootstrap", seed=None):
+        """Resample the last run's trade ledger (see core.monte_carlo)."""
+        profits = self.portfolio.history.column('profit')
+        return resample_trades(profits, self.portfolio.start_equity, n_paths, method, seed)
+
+    def performance(self):
+        """Drawdown, Sharpe, Sortino, exposure, turnover and per-strategy
+        contribution of the last run (see core.performance)."""
+        p = self.portfolio
+        return performance_metrics(p.equity_curve, p.history, p.start_equity)
 
     def generate_report(self):
-        hist = pd.DataFrame(self.portfolio.history)
-        if hist.empty:
+        hist = self.portfolio.history
+        if not len(hist):
             return "No trades executed."
-            
+
+        profit = hist.column('profit')
         total_trades = len(hist)
-        wins = len(hist[hist['profit'] > 0])
+        wins = int(np.count_nonzero(profit > 0))
         wr = (wins / total_trades) * 100
-        total_pnl = hist['profit'].sum()
+        total_pnl = profit.sum()
         
         final_equity = self.portfolio.equity_curve[-1]['equity']
-        roi = ((final_equity - self.portfolio.initial_balance) / self.portfolio.initial_balance) * 100
+        roi = ((final_equity - self.portfolio.start_equity) / self.portfolio.start_equity) * 100
+        perf = self.performance()
         
-        # Calculate Win Rate per Strategy
-        strat_stats = hist.groupby('strategy').agg(
-            Count=('profit', 'count'),
-            Wins=('profit', lambda x: (x > 0).sum()),
-            Total_PnL=('profit', 'sum'),
-            Avg_PnL=('profit', 'mean')
-        )
-        strat_stats['Win_Rate'] = (strat_stats['Wins'] / strat_stats['Count']) * 100
-        strat_stats = strat_stats.drop(columns=['Wins']) # cleanup
+        # Win Rate per Strategy
+        strat_stats = pd.DataFrame({
+            name: {'Count': s['trades'], 'Total_PnL': s['pnl'], 'Avg_PnL': s['avg_pnl'],
+                   'Win_Rate': s['win_rate'], 'ROI_Contrib': s['roi_contribution']}
+            for name, s in perf['strategies'].items()
+        }).T.rename_axis('strategy')
+        strat_stats['Count'] = strat_stats['Count'].astype(int)
+
+        # Only the rows shown are turned into a DataFrame.
+        recent = ColumnLog(TRADE_COLUMNS, capacity=50)
+        for i in range(max(0, total_trades - 50), total_trades):
+            recent.append(hist[i])
         
         report = f"""
 === Backtest Report ===
@@ -343,12 +596,18 @@ ROI:             {roi:.2f}%
 Total Trades:    {total_trades}
 Win Rate:        {wr:.1f}%
 Total PnL:       ${total_pnl:,.2f}
+-----------------------
+Max Drawdown:    {perf['max_drawdown_pct']:.2f}% (longest {perf['max_drawdown_days']} days under water)
+Sharpe:          {perf['sharpe']:.2f}
+Sortino:         {perf['sortino']:.2f}
+Exposure:        {perf['exposure_pct']:.1f}%
+Turnover:        {perf['turnover']:.2f}x / year
 
 Strategy Performance:
 {strat_stats.to_string(float_format="%.2f")}
 
 Trade History (Last 50):
-{hist[['entry_date', 'exit_date', 'ticker', 'side', 'strategy', 'qty', 'entry_price', 'exit_price', 'duration_days', 'profit', 'pct_gain', 'reason']].tail(50).to_string(index=False)}
+{recent.to_frame()[['entry_date', 'exit_date', 'ticker', 'side', 'strategy', 'qty', 'entry_price', 'exit_price', 'duration_days', 'profit', 'pct_gain', 'reason']].to_string(index=False)}
         """
         return report
 
@@ -356,19 +615,19 @@ Trade History (Last 50):
         """Returns concise metrics for programmatic use."""
         from src.core.stats import wilson_score_interval
 
-        hist = pd.DataFrame(self.portfolio.history)
-        if hist.empty:
+        profit = self.portfolio.history.column('profit')
+        if not len(profit):
             return {"roi": 0.0, "wr": 0.0, "wr_lb": 0.0, "wr_ub": 0.0,
                     "trades": 0, "pnl": 0.0}
 
-        total_trades = len(hist)
-        wins = len(hist[hist['profit'] > 0])
+        total_trades = len(profit)
+        wins = int(np.count_nonzero(profit > 0))
         wr = (wins / total_trades) * 100
         wr_lb, wr_ub = wilson_score_interval(wins, total_trades)
-        total_pnl = hist['profit'].sum()
+        total_pnl = profit.sum()
 
         final_equity = self.portfolio.equity_curve[-1]['equity']
-        roi = ((final_equity - self.portfolio.initial_balance) / self.portfolio.initial_balance) * 100
+        roi = ((final_equity - self.portfolio.start_equity) / self.portfolio.start_equity) * 100
 
         return {
             "roi": round(roi, 2),
@@ -378,3 +637,93 @@ Trade History (Last 50):
             "trades": total_trades,
             "pnl": round(total_pnl, 2)
         }
+
+
+
+def _extend_frame(df, index, rows):
+    """`df` up to the first label of `index`, then the indicator `rows`
+    (IndicatorEngine dicts) on `index`, in df's columns and dtypes."""
+    keep = df.index.searchsorted(index[0])
+    columns = {c: pd.array(np.concatenate((df[c].to_numpy()[:keep], [r[c] for r in rows])), dtype=df[c].dtype)
+               for c in df.columns}
+    return pd.DataFrame(columns, index=df.index[:keep].append(index))
+
+
+def _solo_stats(ticker, frame, period, min_confidence, checkpoints=None):
+    """Summary metrics of a single-ticker Backtester run on `frame`. Runs in
+    a worker process, so it only takes and returns picklable values. With a
+    CheckpointStore, the ticker's last checkpoint is resumed over the new
+    bars when it still fits `frame`, and a new one is saved."""
+    bt = Backtester([ticker], period=period)
+    checkpoint = checkpoints.load(ticker, period, min_confidence) if checkpoints is not None else None
+    if checkpoint is None or not bt.resume(checkpoint, {ticker: frame}):
+        bt.load_data(panel=build_panel({ticker: frame}, period=period))
+        if not bt.data_store:
+            raise ValueError("no bars")
+        bt.run(min_confidence=min_confidence, checkpoint=checkpoints is not None)
+    if checkpoints is not None:
+        checkpoints.save(ticker, period, min_confidence, bt.checkpoint())
+    return bt.get_summary_metrics()
+
+
+def solo_backtests(tickers, period="3y", min_confidence=70, cache=None, max_workers=None, frames=None,
+                   checkpoints=None):
+    """
+    Yield (ticker, summary metrics) for each ticker's solo backtest, as each
+    one becomes available.
+
+    Cache hits (with a BacktestCache `cache`) come first. The misses are
+    fetched in one batch (unless `frames` already has their bars) and
+    simulated in a process pool, so a batch takes about as long as its
+    slowest sim. They are yielded as they finish and written to the cache
+    together once the batch is done (or the caller stops early). A ticker
+    without data, or whose sim fails, yields None and is not cached.
+
+    With a CheckpointStore `checkpoints` (core.checkpoint), a miss resumes
+    the ticker's last simulation over just the bars added since, instead
+    of rerunning the whole period.
+    """
+    todo = []
+    hits = cache.get_many(tickers, period) if cache is not None else {}
+    for t in dict.fromkeys(tickers):
+        if t in hits:
+            yield t, hits[t]
+        else:
+            todo.append(t)
+
+    if todo and frames is None:
+        batch = fetch_many(todo, period=period)
+        frames = batch.frames
+        for t, reason in batch.failures.items():
+            print(f"Warning: No data for {t}: {reason}")
+    for t in [t for t in todo if frames.get(t) is None]:
+        todo.remove(t)
+        yield t, None
+    if not todo:
+        return
+
+    done = {}
+    workers = min(max_workers or os.cpu_count() or 1, len(todo))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if pool is None:
+            # Nothing to overlap: skip the pool's process startup.
+            results = ((t, lambda t=t: _solo_stats(t, frames[t], period, min_confidence, checkpoints)) for t in todo)
+        else:
+            futures = {pool.submit(_solo_stats, t, frames[t], period, min_confidence, checkpoints): t
+                       for t in todo}
+            results = ((futures[f], f.result) for f in as_completed(futures))
+        for t in todo:
+            print(f"🔄 Running {period} sim for {t}...")
+        for t, result in results:
+            try:
+                stats = done[t] = result()
+            except Exception as e:
+                print(f"Warning: {period} sim failed for {t}: {e}")
+                stats = None
+            yield t, stats
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.set_many(done, period)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from src.core.scanner import scan_market
 from src.core.news import get_market_news, news_query_for_ticker
 
@@ -37,9 +38,12 @@ class ScanService:
     SCAN_TIMEOUT = 120  # seconds - yfinance can hang
     NEWS_TIMEOUT = 10   # seconds per ticker
 
-    async def _run_scan(self, tickers: list[str]) -> list[dict]:
+    async def _run_scan(self, tickers: list[str], strategies: list[str] | None = None) -> list[dict]:
+        # Passing the strategies down lets the scanner skip disabled checks
+        # and the indicators only they need.
         return await asyncio.wait_for(
-            asyncio.get_running_loop().run_in_executor(self._executor, scan_market, tickers),
+            asyncio.get_running_loop().run_in_executor(
+                self._executor, partial(scan_market, tickers, strategies=strategies)),
             timeout=self.SCAN_TIMEOUT,
         )
 
@@ -88,6 +92,20 @@ class ScanService:
             allowed.update(matches)
         return [s for s in signals if s.get("strategy", "").lower() in allowed]
 
+    @staticmethod
+    def _union_strategies(user_tickers, user_strategies) -> list[str] | None:
+        """Strategies any user in the batch has enabled, or None if any of
+        them runs everything (no list)."""
+        if not user_strategies:
+            return None
+        union = set()
+        for user_id in user_tickers:
+            strategies = user_strategies.get(user_id)
+            if not strategies:
+                return None
+            union.update(strategies)
+        return sorted(union)
+
     async def scan_for_user(
         self, user_id: int, tickers: list[str], strategies: list[str] | None = None,
         triggered_by: str = "manual",
@@ -99,7 +117,7 @@ class ScanService:
             return None
 
         try:
-            signals = await self._run_scan(tickers)
+            signals = await self._run_scan(tickers, strategies)
             signals = self._filter_by_strategies(signals, strategies)
             signals = await self._enrich_signals(signals)
             return signals
@@ -111,7 +129,7 @@ class ScanService:
         user_strategies: dict[int, list[str] | None] | None = None,
     ) -> dict[int, list[dict]]:
         all_tickers = self.dedupe_tickers(user_tickers)
-        all_signals = await self._run_scan(all_tickers)
+        all_signals = await self._run_scan(all_tickers, self._union_strategies(user_tickers, user_strategies))
         all_signals = await self._enrich_signals(all_signals)
 
         signal_by_ticker = {}
@@ -123,20 +123,27 @@ STRATEGY_PARAMS = {
         "ema_fast": 50,      # Pullback target
         "rsi_period": 14,
         "rsi_min": 40,       # Optimized: Stricter entry (was 35)
-        "rsi_max": 60        # Optimized: Stricter entry (was 65)
+        "rsi_max": 60,       # Optimized: Stricter entry (was 65)
+        # Indicator columns the setup check + regime backtest read. Names are
+        # format()-ed with this dict (see DONCHIAN's templates), but these are
+        # literals: the indicator code only computes the fixed SMA_200 /
+        # EMA_50 / RSI_14 lookbacks, whatever sma_trend etc. say.
+        "indicators": ["SMA_200", "EMA_50", "RSI_14", "MACD", "MACD_Signal", "ATR_14", "Regime"],
     },
     "PANIC": {
         "bb_length": 20,
         "bb_std": 2.0,
         "rsi_period": 14,
         "rsi_oversold": 30,  # Deep value / panic threshold
-        "rvol_min": 1.2      # Capitulation volume floor
+        "rvol_min": 1.2,     # Capitulation volume floor
+        "indicators": ["BBL_20_2.0", "RSI_14", "RVOL", "ATR_14", "Regime"],
     },
     "2B": {
         "lookback_min": 20,
         "lookback_max": 60,
         "rsi_period": 14,
-        "sl_limit_pct": 0.05
+        "sl_limit_pct": 0.05,
+        "indicators": ["RSI_14", "MACD_Hist", "Regime"],
     },
     "DONCHIAN": {
         # Classic turtle S2 (55-day breakout). Modernized with:
@@ -150,6 +157,8 @@ STRATEGY_PARAMS = {
         "tp_atr_mult": 4.0,
         "require_uptrend": True,
         "require_vol_expansion": True,
+        "indicators": ["DONCHIAN_HIGH_{lookback}", "SMA_200", "ATR_14",
+                       "ATR_MEDIAN_{atr_median_window}", "Regime"],
     },
 }
 
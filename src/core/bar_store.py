@@ -0,0 +1,124 @@
+"""Persistent per-ticker daily bar store — one columnar .npz file per ticker.
+
+Each file holds the bar timestamps (int64 UTC nanoseconds + the original tz
+name) and one array per OHLCV column, plus two bits of bookkeeping:
+
+- `history_start`: the earliest date ever requested from the provider for
+  this ticker. Coverage is judged against this, not the first bar, so a
+  ticker that IPO'd 18 months ago still counts as "covering" a 3y request.
+- `fetched_at`: when the provider was last asked. fetch_data compares it to
+  the last session close to decide whether a top-up is needed at all.
+
+Writes go to a temp file and are swapped in with os.replace, so concurrent
+scanner threads never see a half-written file.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+STORE_DIR = "data/bars"
+
+
+@dataclass
+class StoredBars:
+    df: pd.DataFrame
+    history_start: pd.Timestamp   # tz-aware UTC
+    fetched_at: datetime          # tz-aware UTC
+
+
+def merge_bars(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Append `new` onto `old`; overlapping dates take the newer bar (the
+    last stored bar is often a partial intraday one)."""
+    if old is None or old.empty:
+        return new
+    if new is None or new.empty:
+        return old
+    merged = pd.concat([old, new])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+
+def overlap_matches(old: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """True if re-fetched bars agree with the stored ones on shared dates.
+    The last stored bar is skipped — it may have been a partial session.
+    A mismatch means the provider re-adjusted the history (split,
+    dividend), so `new` can't be stitched onto `old`."""
+    common = old.index[:-1].intersection(new.index)
+    if len(common) == 0:
+        return True
+    return bool(np.allclose(old.loc[common, 'Close'].to_numpy(dtype=float),
+                            new.loc[common, 'Close'].to_numpy(dtype=float),
+                            rtol=1e-6, equal_nan=True))
+
+
+class BarStore:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+
+    def _path(self, ticker: str) -> str:
+        safe = ticker.upper().replace(os.sep, "_")
+        return os.path.join(self.root, f"{safe}.npz")
+
+    def load(self, ticker: str) -> Optional[StoredBars]:
+        """Return the stored bars for `ticker`, or None if absent/unreadable."""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                tz = str(z['tz'])
+                index = pd.to_datetime(z['index'], unit='ns', utc=True)
+                if tz:
+                    index = index.tz_convert(tz)
+                columns = [str(c) for c in z['columns']]
+                data = {c: z[f'col_{i}'] for i, c in enumerate(columns)}
+                history_start = pd.Timestamp(int(z['history_start']), tz='UTC')
+                fetched_at = datetime.fromtimestamp(float(z['fetched_at']), tz=timezone.utc)
+        except (OSError, KeyError, ValueError):
+            return None
+        df = pd.DataFrame(data, index=index, columns=columns)
+        df.index.name = 'Date'
+        return StoredBars(df=df, history_start=history_start, fetched_at=fetched_at)
+
+    def save(self, ticker: str, df: pd.DataFrame, history_start,
+             fetched_at: Optional[datetime] = None) -> None:
+        """Atomically replace the stored bars for `ticker`."""
+        if df is None or df.empty:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else ""
+        utc = index.tz_convert('UTC') if index.tz is not None else index
+        arrays = {
+            'index': utc.values.astype('datetime64[ns]').view('int64'),
+            'tz': np.array(tz),
+            'columns': np.array([str(c) for c in df.columns]),
+            'history_start': np.array(_to_utc(history_start).value, dtype=np.int64),
+            'fetched_at': np.array(fetched_at.timestamp()),
+        }
+        for i, c in enumerate(df.columns):
+            arrays[f'col_{i}'] = df[c].to_numpy()
+
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self._path(ticker))
+        except OSError as e:
+            print(f"Warning: Failed to save bars for {ticker}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def _to_utc(ts) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
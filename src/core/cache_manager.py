@@ -1,6 +1,20 @@
+"""Solo backtest summary stats, cached per (ticker, period) for a few days.
+
+The cache is a SQLite database in WAL mode, so the scanner, the MCP server
+and pulse can read and write it from separate processes at once: readers
+never block, and writers queue on the database lock (busy timeout) rather
+than clobbering each other's files. set_many() writes a whole batch in one
+transaction, and the same transaction evicts every entry past the TTL.
+
+Entries are namespaced by _param_version(), so changing the strategy or
+risk params never serves stats from the old ones. Old namespaces simply
+age out.
+"""
 import hashlib
 import json
 import os
+import sqlite3
+from contextlib import closing
 from datetime import datetime, timedelta
 
 try:
@@ -8,7 +22,21 @@ try:
 except ImportError:
     from config import STRATEGY_PARAMS, RISK_PARAMS
 
-CACHE_FILE = "data/cache/backtest_stats.json"
+CACHE_FILE = "data/cache/backtest_stats.db"
+BUSY_TIMEOUT_S = 30
+MAX_QUERY_TICKERS = 500  # per IN (...) query, under SQLite's bound-variable limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backtest_stats (
+    namespace TEXT NOT NULL,    -- _param_version() the stats were computed under
+    ticker    TEXT NOT NULL,
+    period    TEXT NOT NULL,
+    stored_at REAL NOT NULL,    -- unix seconds
+    stats     TEXT NOT NULL,    -- JSON
+    PRIMARY KEY (namespace, ticker, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS backtest_stats_stored_at ON backtest_stats (stored_at);
+"""
 
 
 def _param_version() -> str:
@@ -25,49 +53,61 @@ class BacktestCache:
     def __init__(self, ttl_days=7):
         self.ttl_days = ttl_days
         self.cache_file = CACHE_FILE
-        self.cache = self._load_cache()
+        self._ready = False
+
+    def _connect(self):
+        """A new connection (one per call: safe across threads and forked
+        workers). The first one creates the schema and switches to WAL."""
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.cache_file, timeout=BUSY_TIMEOUT_S)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _cutoff(self) -> float:
+        return (datetime.now() - timedelta(days=self.ttl_days)).timestamp()
 
-    def _ensure_dir(self):
-        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+    def get(self, ticker, period):
+        """Returns cached stats if valid, else None."""
+        return self.get_many([ticker], period).get(ticker)
 
-    def _load_cache(self):
-        if not os.path.exists(self.cache_file):
+    def get_many(self, tickers, period):
+        """{ticker: stats} for the tickers with a valid entry, in one query."""
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
             return {}
+        rows = []
         try:
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with closing(self._connect()) as conn:
+                for lo in range(0, len(tickers), MAX_QUERY_TICKERS):
+                    chunk = tickers[lo:lo + MAX_QUERY_TICKERS]
+                    rows += conn.execute(
+                        "SELECT ticker, stats FROM backtest_stats WHERE namespace = ? AND period = ?"
+                        f" AND stored_at >= ? AND ticker IN ({','.join('?' * len(chunk))})",
+                        (_param_version(), period, self._cutoff(), *chunk),
+                    ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to read cache: {e}")
             return {}
-
-    def _save_cache(self):
-        self._ensure_dir()
-        try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-        except IOError as e:
-            print(f"Warning: Failed to save cache: {e}")
-
-    def _make_key(self, ticker: str, period: str) -> str:
-        return f"{ticker}_{period}_{_param_version()}"
-
-    def get(self, ticker, period):
-        """Returns cached stats if valid, else None."""
-        entry = self.cache.get(self._make_key(ticker, period))
-
-        if not entry:
-            return None
-
-        # Check TTL
-        cached_date = datetime.fromisoformat(entry['timestamp'])
-        if datetime.now() - cached_date > timedelta(days=self.ttl_days):
-            return None  # Expired
-
-        return entry['stats']
+        return {ticker: json.loads(stats) for ticker, stats in rows}
 
     def set(self, ticker, period, stats):
         """Saves stats to cache."""
-        self.cache[self._make_key(ticker, period)] = {
-            "timestamp": datetime.now().isoformat(),
-            "stats": stats,
-        }
-        self._save_cache()
+        self.set_many({ticker: stats}, period)
+
+    def set_many(self, stats_by_ticker, period):
+        """Saves {ticker: stats} to cache in a single transaction, which
+        also evicts expired entries."""
+        if not stats_by_ticker:
+            return
+        namespace, now = _param_version(), datetime.now().timestamp()
+        rows = [(namespace, ticker, period, now, json.dumps(stats)) for ticker, stats in stats_by_ticker.items()]
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM backtest_stats WHERE stored_at < ?", (self._cutoff(),))
+                conn.executemany("INSERT OR REPLACE INTO backtest_stats VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to save cache: {e}")
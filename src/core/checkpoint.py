@@ -0,0 +1,106 @@
+"""Backtest checkpoints, so a rerun only simulates the new bars.
+
+BacktestCache keeps a solo backtest's summary stats for a few days. Before
+checkpoints, an expired entry meant a full 3y simulation, even when only a
+handful of bars were new. A BacktestCheckpoint keeps the whole state
+instead:
+
+- the indicator frame of every ticker, plus an IndicatorEngine
+  (core.streaming) at its last bar, so new rows cost O(1) each;
+- the portfolio (cash, open PositionManagers, ledger, equity curve) as it
+  was before the last simulated day, and that day (`as_of`).
+
+Backtester.resume() re-simulates from `as_of` on. That day is redone
+because it was the last bar at checkpoint time: its signals had no next
+bar to fill on yet, and the bar itself may have been a partial session.
+The new indicator rows match calculate_indicators up to float rounding,
+as core.streaming does. A checkpoint is only resumed while the new bars
+agree with its frames on the dates they share: once the provider has
+re-adjusted the history (split, dividend), the run starts over. Trades
+that fall out of the rolling `period` window are evicted from the ledger
+after each resume.
+
+CheckpointStore keeps one pickle per (ticker, period, min_confidence)
+under data/cache/checkpoints, named with the params it was made under.
+Saving one removes the ticker's checkpoints from other params. Writes are
+atomic, so pool workers can save their own tickers' checkpoints in
+parallel.
+"""
+from __future__ import annotations
+
+import glob
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+try:
+    from src.core.cache_manager import _param_version
+except ImportError:
+    from core.cache_manager import _param_version
+
+CHECKPOINT_DIR = "data/cache/checkpoints"
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class BacktestCheckpoint:
+    period: str
+    as_of: pd.Timestamp       # first day a resumed run re-simulates
+    run_kwargs: dict          # min_confidence, strategies, strategy_params, risk_params
+    portfolio: object         # Portfolio at the end of the day before as_of
+    frames: dict              # ticker -> indicator frame
+    engines: dict             # ticker -> IndicatorEngine.to_dict() at the frame's last bar
+    version: int = CHECKPOINT_VERSION
+    param_version: str = ""
+
+
+class CheckpointStore:
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or CHECKPOINT_DIR
+
+    def _path(self, ticker: str, period: str, min_confidence) -> str:
+        return os.path.join(self.root, f"{ticker}_{period}_{min_confidence}_{_param_version()}.pkl")
+
+    def load(self, ticker, period, min_confidence) -> Optional[BacktestCheckpoint]:
+        """The ticker's checkpoint, or None if there is none or it was made
+        by another checkpoint format or other strategy / risk params."""
+        path = self._path(ticker, period, min_confidence)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                checkpoint = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read checkpoint {path}: {e}")
+            return None
+        if (getattr(checkpoint, 'version', None) != CHECKPOINT_VERSION
+                or checkpoint.param_version != _param_version()):
+            return None
+        return checkpoint
+
+    def save(self, ticker, period, min_confidence, checkpoint: BacktestCheckpoint) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        checkpoint.param_version = _param_version()
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            path = self._path(ticker, period, min_confidence)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: Failed to save checkpoint for {ticker}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        # Checkpoints from other strategy / risk params can never load again.
+        prefix = glob.escape(f"{ticker}_{period}_{min_confidence}_")
+        for old in glob.glob(os.path.join(self.root, f"{prefix}*.pkl")):
+            if old != path:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
@@ -1,51 +1,393 @@
-import yfinance as yf
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
 import pandas as pd
-import os
 
-import requests
-import io
+try:
+    from src.core.bar_store import BarStore, merge_bars, overlap_matches
+    from src.core.providers import get_provider
+    from src.core.sessions import (market_now, is_session_open, last_session_close,
+                                   period_start, slice_period, trades_around_the_clock)
+except ImportError:
+    from core.bar_store import BarStore, merge_bars, overlap_matches
+    from core.providers import get_provider
+    from core.sessions import (market_now, is_session_open, last_session_close,
+                               period_start, slice_period, trades_around_the_clock)
+
+# Bars come from the active provider (core/providers.py). For cacheable
+# (live) providers, fixed-length periods ('1mo', '2y', ...) are served through
+# the series cache + bar store below; 'ytd' / 'max' go straight to the
+# provider.
+
+# A top-up re-requests this many calendar days before the last stored bar.
+# The overlap doubles as an adjustment check: yfinance back-adjusts history on
+# splits/dividends, so if the re-fetched overlap no longer matches what we
+# stored, the whole series is re-downloaded instead of stitching two price
+# bases together.
+TOPUP_OVERLAP_DAYS = 7
+
+# Cold downloads are widened to at least this period so the scanner (2y),
+# the tracker (1mo/3mo) and the backtester (3y) all slice one series instead
+# of each paying for its own download.
+BASE_PERIOD = "3y"
+
+# While a session is running, in-process entries expire after this many
+# seconds so intraday polling (tracker update_market) still sees the live bar.
+# Outside market hours an entry stays valid until the next session close.
+# Around-the-clock tickers (crypto) have no close: this TTL applies always.
+INTRADAY_TTL_SECONDS = 300
+
+# Tickers per bulk request in fetch_many. Large enough to amortize request
+# overhead across a 500-name universe, small enough that one bad chunk or a
+# provider throttle doesn't sink the whole scan.
+CHUNK_SIZE = 50
+
+
+@dataclass
+class _CachedSeries:
+    df: pd.DataFrame
+    history_start: pd.Timestamp
+    fetched_at: datetime
+
+
+class SeriesCache:
+    """In-process cache of the longest daily series seen per ticker.
+
+    Shorter-period requests are answered by slicing the cached series. An
+    entry is valid until the next session close (see core/sessions.py), or
+    for INTRADAY_TTL_SECONDS while the market is open — and at all times for
+    tickers that trade around the clock.
+    """
+
+    def __init__(self, intraday_ttl_seconds: int = INTRADAY_TTL_SECONDS):
+        self.intraday_ttl_seconds = intraday_ttl_seconds
+        self._entries: dict[str, _CachedSeries] = {}
+        self._lock = threading.Lock()
+
+    def _is_valid(self, entry: _CachedSeries, now=None, ticker="") -> bool:
+        age = (market_now(now) - entry.fetched_at).total_seconds()
+        if trades_around_the_clock(ticker):
+            return age < self.intraday_ttl_seconds
+        if entry.fetched_at < last_session_close(now):
+            return False
+        if is_session_open(now):
+            return age < self.intraday_ttl_seconds
+        return True
+
+    def get(self, ticker: str, need_start, now=None) -> Optional[pd.DataFrame]:
+        """Cached series for `ticker` if it covers `need_start` and is still
+        valid. The returned frame is shared — slice/copy before mutating."""
+        with self._lock:
+            entry = self._entries.get(ticker.upper())
+        if entry is None or entry.history_start > need_start:
+            return None
+        if not self._is_valid(entry, now, ticker):
+            return None
+        return entry.df
+
+    def put(self, ticker: str, df: pd.DataFrame, history_start,
+            fetched_at: Optional[datetime] = None) -> None:
+        """Store `df`, keeping whichever history reaches further back."""
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        key = ticker.upper()
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and existing.history_start < history_start:
+                df = merge_bars(existing.df, df)
+                history_start = existing.history_start
+            self._entries[key] = _CachedSeries(df, history_start, fetched_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running block on it and receive the same result (or the same
+    exception) instead of issuing their own provider request. Nothing is
+    remembered once the call finishes — caching is the SeriesCache's job,
+    this only deduplicates work that is already in flight.
+    """
+
+    def __init__(self):
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+_store = BarStore()
+_series_cache = SeriesCache()
+# Scheduled scans, manual /scan requests and MCP tools run fetches on
+# separate threads and often ask for the same ticker at the same moment.
+_inflight = SingleFlight()
+
+
+def _flight_key(*parts):
+    """Coalescing key: the request plus the session it belongs to, so a call
+    that straddles a session close never hands back the previous day's bars."""
+    return (*parts, last_session_close().isoformat())
 
 def get_sp500_tickers():
-    """Fetches the current S&P 500 tickers from Wikipedia."""
+    """Fetches the current S&P 500 tickers (Wikipedia, via the provider)."""
     try:
-        url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
-        headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-
-        tables = pd.read_html(io.StringIO(response.text))
-        df = tables[0]
-        tickers = df['Symbol'].tolist()
-        # Clean tickers (e.g. BRK.B -> BRK-B)
-        tickers = [t.replace('.', '-') for t in tickers]
-        print(f"Loaded {len(tickers)} SP500 tickers from Wikipedia.")
+        tickers = get_provider().sp500_tickers()
+        print(f"Loaded {len(tickers)} SP500 tickers.")
         return tickers
     except Exception as e:
         print(f"Error fetching SP500 list: {e}")
         return []
 
+def _period_start(period: str, now) -> Optional[pd.Timestamp]:
+    """Earliest date a `period` request needs, or None if the period isn't
+    store-backed."""
+    return period_start(period, market_now(now))
+
+
+def _slice_period(df, period, now):
+    """Trim a longer stored series down to what `period` would have returned."""
+    return slice_period(df, period, market_now(now))
+
+
+def _download(ticker, period=None, start=None):
+    """Single provider call. Exactly one of `period` / `start` is used."""
+    return get_provider().history(ticker, period=period, start=start)
+
+
+def is_current(fetched_at, now=None, around_the_clock=False) -> bool:
+    """True if daily bars fetched at `fetched_at` need no refresh yet: they
+    were fetched after the last session close and no session is running
+    right now (intraday polling must still see the live bar). Symbols that
+    trade around the clock have no close to wait for: theirs are current
+    for INTRADAY_TTL_SECONDS."""
+    if around_the_clock:
+        age = (market_now(now) - fetched_at).total_seconds()
+        return age < INTRADAY_TTL_SECONDS
+    if is_session_open(now):
+        return False
+    return fetched_at >= last_session_close(now)
+
+
+def _is_fresh(stored, now=None, ticker="") -> bool:
+    """Whether `ticker`'s stored bars can be served without a top-up."""
+    return is_current(stored.fetched_at, now, trades_around_the_clock(ticker))
+
+
+def _topup_start(stored):
+    return (stored.df.index[-1] - pd.Timedelta(days=TOPUP_OVERLAP_DAYS)).date().isoformat()
+
+
+def _apply_top_up(ticker, stored, tail):
+    """Merge freshly downloaded `tail` bars onto `stored` and persist. If the
+    overlap disagrees (history was re-adjusted for a split/dividend), re-pull
+    the full span instead. Returns (df, fetched_at); on failure that is the
+    stored series with its old fetched_at, so the next call retries rather
+    than caching stale bars as current."""
+    if tail is None:
+        return stored.df, stored.fetched_at
+    if overlap_matches(stored.df, tail):
+        df = merge_bars(stored.df, tail)
+    else:
+        df = _download(ticker, start=stored.history_start.date().isoformat())
+        if df is None:
+            return stored.df, stored.fetched_at
+    fetched_at = datetime.now(timezone.utc)
+    _store.save(ticker, df, history_start=stored.history_start, fetched_at=fetched_at)
+    return df, fetched_at
+
+
+def _top_up(ticker, stored):
+    """Fetch only the bars after the last stored session and persist them.
+    Returns (df, fetched_at) as _apply_top_up does, falling back to the
+    stored series if the provider fails."""
+    try:
+        tail = _download(ticker, start=_topup_start(stored))
+    except Exception as e:
+        print(f"Error fetching {ticker}: {e}")
+        return stored.df, stored.fetched_at
+    return _apply_top_up(ticker, stored, tail)
+
+
+def _cold_start(need_start):
+    """Widen a cold download to at least BASE_PERIOD."""
+    return min(need_start, _period_start(BASE_PERIOD, None))
+
+
+def _load_series(ticker, need_start):
+    """Full stored series covering `need_start`: bar store first, then the
+    provider. Returns (df, history_start, fetched_at) or (None, None, None)."""
+    stored = _store.load(ticker)
+    if stored is not None and stored.history_start <= need_start:
+        if _is_fresh(stored, ticker=ticker):
+            return stored.df, stored.history_start, stored.fetched_at
+        df, fetched_at = _top_up(ticker, stored)
+        return df, stored.history_start, fetched_at
+
+    need_start = _cold_start(need_start)
+    df = _download(ticker, start=need_start.date().isoformat())
+    if df is None:
+        return None, None, None
+    fetched_at = datetime.now(timezone.utc)
+    _store.save(ticker, df, history_start=need_start, fetched_at=fetched_at)
+    return df, need_start, fetched_at
+
+
 def fetch_data(ticker, period="2y"):
     """Fetch daily OHLCV for a ticker.
 
     Default period is 2y so SMA200 has a meaningful warm-up window
     (1y ≈ 252 trading days leaves only ~52 usable bars after SMA200 settles).
+
+    Served from, in order: the in-process SeriesCache, the local bar store
+    (see core/bar_store.py), then the provider. A covered and fresh ticker
+    costs no network at all; a covered but stale one only downloads the bars
+    since its last stored session. Concurrent calls for the same ticker and
+    period share one in-flight fetch. Returns a fresh copy — callers mutate
+    it (calculate_indicators adds columns in place).
     """
     try:
-        dat = yf.Ticker(ticker)
-        df = dat.history(period=period, interval="1d")
+        df = _inflight.do(_flight_key(ticker.upper(), period),
+                          lambda: _fetch_data(ticker, period))
+        return None if df is None else df.copy()
+    except Exception as e:
+        print(f"Error fetching {ticker}: {e}")
+        return None
+
 
-        if df.empty:
+def _fetch_data(ticker, period):
+    """fetch_data without the coalescing/copy wrapper. The result may be
+    shared between callers."""
+    need_start = _period_start(period, None)
+    if need_start is None or not get_provider().cacheable:
+        return _download(ticker, period=period)
+
+    df = _series_cache.get(ticker, need_start)
+    if df is None:
+        df, history_start, fetched_at = _load_series(ticker, need_start)
+        if df is None:
             return None
+        _series_cache.put(ticker, df, history_start, fetched_at)
 
-        # Ensure no MultiIndex (Ticker.history usually returns simple columns)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
+    return _slice_period(df, period, None)
 
-        # Standardize columns just in case
-        # yfinance history returns: Open, High, Low, Close, Volume, Dividends, Stock Splits
-        # We need OHL C V
 
-        return df
-    except Exception as e:
-        print(f"Error fetching {ticker}: {e}")
-        return None
+@dataclass
+class BatchFetch:
+    frames: dict          # {ticker: DataFrame} — each a private copy
+    failures: dict        # {ticker: reason}
+
+
+def _download_many(tickers, start=None, period=None):
+    """Bulk provider call(s), CHUNK_SIZE tickers at a time. A chunk that
+    fails outright marks each of its tickers as failed; the rest of the
+    batch carries on."""
+    provider = get_provider()
+    frames, failures = {}, {}
+    for i in range(0, len(tickers), CHUNK_SIZE):
+        chunk = tickers[i:i + CHUNK_SIZE]
+        try:
+            f, err = provider.history_many(chunk, period=period, start=start)
+        except Exception as e:
+            failures.update({t: str(e) for t in chunk})
+            continue
+        frames.update(f)
+        failures.update(err)
+    return frames, failures
+
+
+def fetch_many(tickers, period="2y") -> BatchFetch:
+    """Batch version of fetch_data for universe scans and backtests.
+
+    Tickers already covered by the SeriesCache / bar store are served
+    locally; stale ones are topped up and cold ones downloaded through
+    chunked bulk requests. A ticker that fails is reported in `failures`
+    without failing the batch. Identical concurrent batches (same universe,
+    same period) share one in-flight fetch.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    batch = _inflight.do(_flight_key(tuple(tickers), period),
+                         lambda: _fetch_many(tickers, period))
+    return BatchFetch({t: df.copy() for t, df in batch.frames.items()}, dict(batch.failures))
+
+
+def _fetch_many(tickers, period) -> BatchFetch:
+    """fetch_many without the coalescing/copy wrapper."""
+    need_start = _period_start(period, None)
+    if need_start is None or not get_provider().cacheable:
+        frames, failures = _download_many(tickers, period=period)
+        return BatchFetch(frames, failures)
+
+    series, failures = {}, {}
+    stale, cold = {}, []
+    for t in tickers:
+        cached = _series_cache.get(t, need_start)
+        if cached is not None:
+            series[t] = cached
+            continue
+        stored = _store.load(t)
+        if stored is None or stored.history_start > need_start:
+            cold.append(t)
+        elif _is_fresh(stored, ticker=t):
+            series[t] = stored.df
+            _series_cache.put(t, stored.df, stored.history_start, stored.fetched_at)
+        else:
+            stale[t] = stored
+
+    if stale:
+        start = min(_topup_start(s) for s in stale.values())
+        tails, _ = _download_many(list(stale), start=start)
+        for t, stored in stale.items():
+            # A failed top-up still serves the stored bars, as in fetch_data,
+            # under their old fetched_at so the next call retries.
+            df, fetched_at = _apply_top_up(t, stored, tails.get(t))
+            series[t] = df
+            _series_cache.put(t, df, stored.history_start, fetched_at)
+
+    if cold:
+        start = _cold_start(need_start)
+        downloaded, err = _download_many(cold, start=start.date().isoformat())
+        failures.update(err)
+        for t, df in downloaded.items():
+            _store.save(t, df, history_start=start)
+            _series_cache.put(t, df, start)
+            series[t] = df
+
+    frames = {t: _slice_period(series[t], period, None) for t in tickers if t in series}
+    return BatchFetch(frames, failures)
@@ -1,4 +1,4 @@
-"""Per-position earnings calendar — yfinance-backed with a 7-day file cache.
+"""Per-position earnings calendar — provider-backed with a 7-day file cache.
 
 Earnings dates rarely move once announced (~quarterly), so a coarse TTL keeps
 the daily monitor cycle cheap without going stale on real revisions. Cache
@@ -13,9 +13,9 @@ from datetime import date, datetime, timedelta
 from typing import Optional
 
 try:
-    import yfinance as yf
+    from src.core.providers import get_provider
 except ImportError:
-    yf = None  # tests can monkeypatch fetch_next_earnings directly
+    from core.providers import get_provider
 
 
 CACHE_FILE = "data/cache/earnings.json"
@@ -39,29 +39,13 @@ class EarningsInfo:
 
 
 def fetch_next_earnings(ticker: str) -> Optional[date]:
-    """Hit yfinance Ticker.calendar for the next earnings date. Returns None
-    on any failure (network, missing data, parse error)."""
-    if yf is None:
-        return None
+    """Ask the market-data provider (yfinance Ticker.calendar when live) for
+    the next earnings date. Returns None on any failure (network, missing
+    data, parse error)."""
     try:
-        cal = yf.Ticker(ticker).calendar
+        return get_provider().next_earnings(ticker)
     except Exception:
         return None
-    if not isinstance(cal, dict):
-        return None
-    raw = cal.get('Earnings Date')
-    if not raw:
-        return None
-    # yfinance returns list[datetime.date]; can be 1 entry (confirmed) or 2
-    # (estimated window). Take the earliest — that's the soonest gap risk.
-    candidates = raw if isinstance(raw, list) else [raw]
-    parsed = []
-    for c in candidates:
-        if isinstance(c, datetime):
-            parsed.append(c.date())
-        elif isinstance(c, date):
-            parsed.append(c)
-    return min(parsed) if parsed else None
 
 
 class EarningsCache:
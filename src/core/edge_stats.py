@@ -0,0 +1,118 @@
+"""Per-strategy edge stats, refreshed from one backtest pass.
+
+config.STRATEGY_EDGE_STATS holds hand-copied 3y numbers per strategy
+(win rate, average $ PnL per trade, trade count, edge sign). The report
+builder uses them to SKIP negative-edge signals and for its edge block.
+
+Backtester.refresh_edge_stats() recomputes them in a single simulation:
+the main portfolio trades every strategy, and a shadow portfolio per
+strategy trades it alone (as `simulate.py --strategy X` would). All of
+them share the signal evaluation. The solo ledgers become a versioned
+JSON artifact, which load_edge_stats() reads back. If the artifact is
+missing, has another format version, or was built with other strategy /
+risk params, the configured numbers are used. So are they for a strategy
+that traded fewer than MIN_EDGE_TRADES times in the refresh: a strategy
+that never fired says nothing about its edge.
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from src.config import STRATEGY_EDGE_STATS
+    from src.core.cache_manager import _param_version
+except ImportError:
+    from config import STRATEGY_EDGE_STATS
+    from core.cache_manager import _param_version
+
+EDGE_STATS_FILE = "data/cache/edge_stats.json"
+EDGE_STATS_VERSION = 1
+
+# Fewer trades than this in a refresh and the configured entry is kept.
+MIN_EDGE_TRADES = 20
+
+# Backtester strategy name -> STRATEGY_EDGE_STATS key.
+EDGE_KEYS = {"TRINITY": "trinity", "PANIC": "panic", "2B": "2b_reversal", "DONCHIAN": "donchian"}
+
+_loaded = {}   # path -> ((mtime_ns, size), stats)
+
+
+def edge_stat(history, key: str | None = None) -> dict:
+    """STRATEGY_EDGE_STATS-shaped entry for one ledger (a ColumnLog).
+    `key` keeps the configured label while the edge sign agrees with it."""
+    profit = history.column('profit')
+    trades = len(profit)
+    avg_pnl = float(profit.mean()) if trades else 0.0
+    edge = "positive" if avg_pnl >= 0 else "negative"
+    configured = STRATEGY_EDGE_STATS.get(key, {})
+    if configured.get("edge") == edge:
+        label = configured["label"]
+    else:
+        label = f"{edge} edge"
+    return {
+        "wr_pct": round(float(np.mean(profit > 0)) * 100, 1) if trades else 0.0,
+        "avg_pnl": int(round(avg_pnl)),
+        "trades": trades,
+        "edge": edge,
+        "label": label,
+    }
+
+
+def build_edge_stats(portfolios: dict, period: str, tickers: int, min_confidence: int) -> dict:
+    """The artifact for {name: Portfolio}. Names that are edge keys and
+    traded at least MIN_EDGE_TRADES times fill 'strategies'; every book
+    (combined, exit-mode variants) is also recorded under 'books' for
+    reference."""
+    books = {name: edge_stat(p.history, name.split("@")[0]) for name, p in portfolios.items()}
+    return {
+        "version": EDGE_STATS_VERSION,
+        "param_version": _param_version(),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "period": period,
+        "tickers": tickers,
+        "min_confidence": min_confidence,
+        "strategies": {name: stat for name, stat in books.items()
+                       if name in STRATEGY_EDGE_STATS and stat["trades"] >= MIN_EDGE_TRADES},
+        "books": books,
+    }
+
+
+def save_edge_stats(artifact: dict, path: str = EDGE_STATS_FILE) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(artifact, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_edge_stats(path: str = EDGE_STATS_FILE) -> dict:
+    """Edge stats per strategy key: the artifact's, over the configured
+    ones. The file is re-read only when it changes."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return STRATEGY_EDGE_STATS
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _loaded.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    stats = STRATEGY_EDGE_STATS
+    try:
+        with open(path) as f:
+            artifact = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        print(f"Warning: Could not read edge stats {path}; using configured values")
+    else:
+        if artifact.get("version") != EDGE_STATS_VERSION:
+            print(f"Warning: Edge stats {path} has format version {artifact.get('version')}; using configured values")
+        elif artifact.get("param_version") != _param_version():
+            print(f"Warning: Edge stats {path} were built with other strategy params; using configured values")
+        else:
+            stats = {**STRATEGY_EDGE_STATS, **artifact.get("strategies", {})}
+    _loaded[path] = (stamp, stats)
+    return stats
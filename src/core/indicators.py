@@ -2,15 +2,77 @@ import pandas as pd
 import numpy as np
 from src.config import STRATEGY_PARAMS
 from src.core.stats import wilson_score_interval
+from src.core.outcomes import first_passage, OUTCOME_WIN, OUTCOME_HOLD
+from src.core.reversal import detect_2b_reversals
 
-def calculate_indicators(df):
+def _donchian_windows():
+    cfg = STRATEGY_PARAMS.get('DONCHIAN', {})
+    return cfg.get('lookback', 55), cfg.get('atr_median_window', 100)
+
+
+def indicator_dependencies() -> dict:
+    """Indicator columns that are computed from other indicator columns."""
+    _, atr_med_win = _donchian_windows()
+    return {
+        'Regime': ('SMA_200',),
+        'RVOL': ('Vol_SMA_20',),
+        'MACD_Signal': ('MACD',),
+        'MACD_Hist': ('MACD', 'MACD_Signal'),
+        f'ATR_MEDIAN_{atr_med_win}': ('ATR_14',),
+    }
+
+
+def required_columns(columns) -> set:
+    """Transitive closure of `columns` over indicator_dependencies()."""
+    deps = indicator_dependencies()
+    need, todo = set(), list(columns)
+    while todo:
+        col = todo.pop()
+        if col not in need:
+            need.add(col)
+            todo.extend(deps.get(col, ()))
+    return need
+
+
+def strategy_key(name: str) -> str:
+    """STRATEGY_PARAMS key for a user-facing / scanner strategy name
+    ('trinity', '2B_Reversal', ...)."""
+    key = str(name).upper()
+    return '2B' if key.startswith('2B') else key
+
+
+def strategy_columns(strategies):
+    """Indicator columns the given strategies read (their STRATEGY_PARAMS
+    'indicators' lists), or None — meaning "everything" — when no strategy
+    filter applies."""
+    if not strategies:
+        return None
+    columns = set()
+    for name in strategies:
+        cfg = STRATEGY_PARAMS.get(strategy_key(name))
+        if cfg is None:
+            continue
+        columns.update(c.format(**cfg) for c in cfg.get('indicators', ()))
+    return columns or None
+
+
+def calculate_indicators(df, columns=None):
     """
     Applies professional-grade technical indicators.
     Now includes: SMA, EMA, RSI, Bollinger Bands, Volume Profile, MACD, ATR.
+
+    `columns` limits the work to those indicator columns plus whatever they
+    are derived from (see strategy_columns / required_columns); None computes
+    everything.
     """
     if df.empty:
         return df
 
+    need = None if columns is None else required_columns(columns)
+
+    def wants(*names):
+        return need is None or any(n in need for n in names)
+
     # --- 1. Data Prep ---
     close = df['Close']
     high = df['High']
@@ -18,57 +80,67 @@ def calculate_indicators(df):
     volume = df['Volume']
 
     # --- 2. Trend & Momentum (Existing) ---
-    df['SMA_200'] = close.rolling(window=200).mean()
-    df['EMA_50'] = close.ewm(span=50, adjust=False).mean()
+    if wants('SMA_200'):
+        df['SMA_200'] = close.rolling(window=200).mean()
+    if wants('EMA_50'):
+        df['EMA_50'] = close.ewm(span=50, adjust=False).mean()
     
     # RSI Calculation (Wilder's Smoothing)
-    delta = close.diff()
-    gain = delta.where(delta > 0, 0).ewm(alpha=1/14, min_periods=14, adjust=False).mean()
-    loss = (-delta.where(delta < 0, 0)).ewm(alpha=1/14, min_periods=14, adjust=False).mean()
-    
-    rs = gain / loss
-    df['RSI_14'] = 100 - (100 / (1 + rs))
+    if wants('RSI_14'):
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).ewm(alpha=1/14, min_periods=14, adjust=False).mean()
+        loss = (-delta.where(delta < 0, 0)).ewm(alpha=1/14, min_periods=14, adjust=False).mean()
+
+        rs = gain / loss
+        df['RSI_14'] = 100 - (100 / (1 + rs))
     
     # --- 3. Volatility & Panic (Existing + New) ---
     # Bollinger Bands
-    sma20 = close.rolling(window=20).mean()
-    std20 = close.rolling(window=20).std()
-    
-    df['BBL_20_2.0'] = sma20 - (2 * std20) # Lower
+    if wants('BBL_20_2.0'):
+        sma20 = close.rolling(window=20).mean()
+        std20 = close.rolling(window=20).std()
+
+        df['BBL_20_2.0'] = sma20 - (2 * std20) # Lower
     
     # Volume Spikes
-    df['Vol_SMA_20'] = volume.rolling(window=20).mean()
-    df['RVOL'] = volume / df['Vol_SMA_20']
+    if wants('Vol_SMA_20'):
+        df['Vol_SMA_20'] = volume.rolling(window=20).mean()
+    if wants('RVOL'):
+        df['RVOL'] = volume / df['Vol_SMA_20']
 
     # --- 4. NEW: MACD (Moving Average Convergence Divergence) ---
     # Good for confirming the trend direction alongside RSI
-    ema12 = close.ewm(span=12, adjust=False).mean()
-    ema26 = close.ewm(span=26, adjust=False).mean()
-    
-    df['MACD'] = ema12 - ema26
-    df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
+    if wants('MACD'):
+        ema12 = close.ewm(span=12, adjust=False).mean()
+        ema26 = close.ewm(span=26, adjust=False).mean()
+
+        df['MACD'] = ema12 - ema26
+    if wants('MACD_Signal'):
+        df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    if wants('MACD_Hist'):
+        df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
 
     # --- 5. NEW: ATR (Average True Range) for Dynamic Stops ---
-    # Calculate True Range
-    tr1 = high - low
-    tr2 = (high - close.shift()).abs()
-    tr3 = (low - close.shift()).abs()
-    
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    # ATR 14 smoothing
-    df['ATR_14'] = tr.ewm(alpha=1/14, min_periods=14, adjust=False).mean()
+    if wants('ATR_14'):
+        # Calculate True Range
+        tr1 = high - low
+        tr2 = (high - close.shift()).abs()
+        tr3 = (low - close.shift()).abs()
+
+        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+        # ATR 14 smoothing
+        df['ATR_14'] = tr.ewm(alpha=1/14, min_periods=14, adjust=False).mean()
 
     # --- 5b. Donchian channels + ATR volatility regime (Modern Turtle inputs) ---
     # shift(1) so today's bar can't be both the prior high AND the breakout
     # — we want "yesterday's 55-day max", i.e. the level being broken.
-    donchian_cfg = STRATEGY_PARAMS.get('DONCHIAN', {})
-    lookback = donchian_cfg.get('lookback', 55)
-    atr_med_win = donchian_cfg.get('atr_median_window', 100)
-    df[f'DONCHIAN_HIGH_{lookback}'] = high.rolling(window=lookback).max().shift(1)
-    df[f'DONCHIAN_LOW_{lookback}'] = low.rolling(window=lookback).min().shift(1)
-    df[f'ATR_MEDIAN_{atr_med_win}'] = df['ATR_14'].rolling(window=atr_med_win).median()
+    lookback, atr_med_win = _donchian_windows()
+    if wants(f'DONCHIAN_HIGH_{lookback}', f'DONCHIAN_LOW_{lookback}'):
+        df[f'DONCHIAN_HIGH_{lookback}'] = high.rolling(window=lookback).max().shift(1)
+        df[f'DONCHIAN_LOW_{lookback}'] = low.rolling(window=lookback).min().shift(1)
+    if wants(f'ATR_MEDIAN_{atr_med_win}'):
+        df[f'ATR_MEDIAN_{atr_med_win}'] = df['ATR_14'].rolling(window=atr_med_win).median()
 
     # --- 6. Market Regime Classification ---
     # Bull: Price > SMA200 & SMA200 Rising (20-day net change)
@@ -77,32 +149,41 @@ def calculate_indicators(df):
     #
     # 1-day diff is too noisy — a single wobbly day flips regime. Use the
     # 20-day net change of SMA200 as the slope signal.
-    sma200_slope = df['SMA_200'] - df['SMA_200'].shift(20)
-
-    conditions = [
-        (close > df['SMA_200']) & (sma200_slope > 0),
-        (close < df['SMA_200']) & (sma200_slope < 0)
-    ]
-    choices = ['Bull', 'Bear']
-    df['Regime'] = np.select(conditions, choices, default='Sideways')
+    if wants('Regime'):
+        sma200_slope = df['SMA_200'] - df['SMA_200'].shift(20)
+
+        conditions = [
+            (close > df['SMA_200']) & (sma200_slope > 0),
+            (close < df['SMA_200']) & (sma200_slope < 0)
+        ]
+        choices = ['Bull', 'Bear']
+        df['Regime'] = np.select(conditions, choices, default='Sideways')
     
     return df
 
-def backtest_regime_performance(df, strategy_type, params=None):
-    """
-    Advanced Backtester:
-    1. Identifies all past signals based on strategy logic.
-    2. Simulates trades with Dynamic ATR SL/TP.
-    3. Segregates performance by Market Regime (Bull/Bear/Sideways).
-    4. Checks for recent strategy decay (Self-Correction).
+REGIME_BUCKETS = (('bull', 'Bull'), ('bear', 'Bear'), ('sideways', 'Sideways'))
+RECENT_DECAY_DAYS = 14
+
+
+def regime_signal_trades(df, strategy_type, params=None):
+    """Simulate every past signal of `strategy_type` in df.
+
+    Returns (entries, outcome, exit_idx) as in core.outcomes.first_passage:
+    bar positions of the signals (excluding the last bar, which has no
+    future), their win/loss/hold outcome, and the bar each one resolved on.
+    Each trade only looks at bars after its entry, so for any prefix
+    df.iloc[:t+1] the trades are the same, except those resolving after t,
+    which are still holds there.
 
     The signal definition here MUST stay aligned with check_*_setup so the
     reported win-rate corresponds to the same strategy that actually triggered.
     """
-    if df.empty:
-        return {}
+    # 1. Identify Signals — read thresholds from STRATEGY_PARAMS (or injected).
+    # Plain arrays rather than Series: NaN compares False either way, and
+    # skipping index alignment is most of the cost at this size.
+    def col(name):
+        return df[name].to_numpy(dtype=float)
 
-    # 1. Identify Signals — read thresholds from STRATEGY_PARAMS (or injected)
     if strategy_type == 'trinity':
         cfg = params if params else STRATEGY_PARAMS['TRINITY']
         rsi_min = cfg.get('rsi_min', 40)
@@ -111,10 +192,13 @@ def backtest_regime_performance(df, strategy_type, params=None):
         dist_high = cfg.get('dist_to_ema_max', 0.03)
 
         # Trend Pullback: Price > SMA200, Pullback to EMA50, RSI Healthy
-        signals = (df['Close'] > df['SMA_200']) & \
-                  ((df['Close'] - df['EMA_50']) / df['EMA_50'] >= dist_low) & \
-                  ((df['Close'] - df['EMA_50']) / df['EMA_50'] <= dist_high) & \
-                  (df['RSI_14'] >= rsi_min) & (df['RSI_14'] <= rsi_max)
+        close, ema50, rsi = col('Close'), col('EMA_50'), col('RSI_14')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dist = (close - ema50) / ema50
+        signals = (close > col('SMA_200')) & \
+                  (dist >= dist_low) & \
+                  (dist <= dist_high) & \
+                  (rsi >= rsi_min) & (rsi <= rsi_max)
         tp_mult, sl_mult = 2.0, 2.0
 
     elif strategy_type == 'panic':
@@ -123,9 +207,9 @@ def backtest_regime_performance(df, strategy_type, params=None):
         rvol_min = cfg.get('rvol_min', 1.2)
 
         # Mean Reversion: Price < BB Low, RSI < oversold, High Vol
-        signals = (df['Close'] < df['BBL_20_2.0']) & \
-                  (df['RSI_14'] < rsi_oversold) & \
-                  (df['RVOL'] > rvol_min)
+        signals = (col('Close') < col('BBL_20_2.0')) & \
+                  (col('RSI_14') < rsi_oversold) & \
+                  (col('RVOL') > rvol_min)
         tp_mult, sl_mult = 3.0, 1.0
 
     elif strategy_type == 'donchian':
@@ -141,70 +225,40 @@ def backtest_regime_performance(df, strategy_type, params=None):
         atr_med_col = f'ATR_MEDIAN_{atr_med_win}'
 
         # Donchian breakout: Close > yesterday's N-day high
-        signals = df['Close'] > df[donchian_col]
+        signals = col('Close') > col(donchian_col)
         if require_uptrend:
-            signals = signals & (df['Close'] > df['SMA_200'])
+            signals = signals & (col('Close') > col('SMA_200'))
         if require_vol_expansion:
-            signals = signals & (df['ATR_14'] > df[atr_med_col])
-    
-    signal_indices = df.index[signals].tolist()
-    
-    # 2. Run Simulation
-    results = []
-    
-    for date_idx in signal_indices:
-        idx = df.index.get_loc(date_idx)
-        if idx >= len(df) - 1: continue # Skip current candle
-        
-        entry_row = df.iloc[idx]
-        entry_price = entry_row['Close']
-        atr = entry_row['ATR_14']
-        regime = entry_row['Regime']
-        
-        if pd.isna(atr): continue
-
-        # Dynamic Exits
-        sl = entry_price - (atr * sl_mult)
-        tp = entry_price + (atr * tp_mult)
-        
-        # Check outcome (look forward 20 days max).
-        # Intra-bar tie-break: when a bar hits both SL and TP, we cannot know the
-        # intra-day path, so use the Open as a proxy for gap direction and
-        # default to the LOSS side to stay conservative.
-        outcome = 'hold'
-        future_candles = df.iloc[idx+1 : idx+21]
-
-        for _, row in future_candles.iterrows():
-            hit_tp = row['High'] >= tp
-            hit_sl = row['Low'] <= sl
-            if hit_tp and hit_sl:
-                # Cannot know intra-bar path. Use Open as proxy:
-                #  gap-down through SL  → loss; gap-up through TP → win;
-                #  Open between → both triggered intraday → assume SL first (conservative).
-                if row['Open'] <= sl:
-                    outcome = 'loss'
-                elif row['Open'] >= tp:
-                    outcome = 'win'
-                else:
-                    outcome = 'loss'
-                break
-            if hit_sl:
-                outcome = 'loss'
-                break
-            if hit_tp:
-                outcome = 'win'
-                break
-        
-        # Record trade
-        results.append({
-            'date': date_idx,
-            'regime': regime,
-            'outcome': outcome
-        })
-
-    # 3. Aggregate Stats
-    df_res = pd.DataFrame(results)
-    stats = {
+            signals = signals & (col('ATR_14') > col(atr_med_col))
+
+    elif strategy_type == '2b':
+        # 2B trades its own plan: stop beyond the breakout wick, 3R target,
+        # short on the bearish side (see core.reversal).
+        bars = detect_2b_reversals(df, params)
+        entries = np.flatnonzero(bars.signal[:-1])
+        outcome, exit_idx = first_passage(
+            col('Open'), col('High'), col('Low'), entries,
+            sl=bars.stop[entries], tp=bars.take_profit[entries],
+            short=bars.bearish[entries],
+        )
+        return entries, outcome, exit_idx
+
+    # 2. Run Simulation — every signal at once (see core.outcomes for the
+    # 20-bar look-forward and the intra-bar SL/TP tie-break). The current
+    # candle has no future bars, and signals without an ATR are skipped.
+    close, atr = col('Close'), col('ATR_14')
+    entries = np.flatnonzero(signals[:-1])
+    entries = entries[~np.isnan(atr[entries])]
+    outcome, exit_idx = first_passage(
+        col('Open'), col('High'), col('Low'), entries,
+        sl=close[entries] - atr[entries] * sl_mult,
+        tp=close[entries] + atr[entries] * tp_mult,
+    )
+    return entries, outcome, exit_idx
+
+
+def empty_regime_stats():
+    return {
         "total": {"wr": 0, "count": 0, "wr_lb": 0, "wr_ub": 0},
         "bull": {"wr": 0, "count": 0, "wr_lb": 0, "wr_ub": 0},
         "bear": {"wr": 0, "count": 0, "wr_lb": 0, "wr_ub": 0},
@@ -213,41 +267,33 @@ def backtest_regime_performance(df, strategy_type, params=None):
         "warning": None
     }
 
-    if df_res.empty:
-        return stats
 
+def regime_stats_from_counts(counts, recent=None):
+    """The backtest_regime_performance dict from resolved-trade counts.
+
+    `counts` maps 'total' / 'bull' / 'bear' / 'sideways' to (wins, decided)
+    where decided excludes holds; `recent` is the same pair for trades
+    entered in the last RECENT_DECAY_DAYS, or None if there were none.
+    """
     # Win-rate helper now also returns the Wilson 95% bounds so callers can
     # see how much sample size is backing the raw WR.
-    def calc_wr(d):
-        if d.empty: return 0, 0, 0, 0
-        wins = len(d[d['outcome'] == 'win'])
-        total = len(d[d['outcome'].isin(['win', 'loss'])]) # Exclude 'hold' from denominator
+    def calc_wr(wins, total):
         if total == 0: return 0, 0, 0, 0
         wr = round((wins / total) * 100, 1)
         lb, ub = wilson_score_interval(wins, total)
         return wr, total, lb, ub
 
-    for bucket, mask in [
-        ('total', None),
-        ('bull', df_res['regime'] == 'Bull'),
-        ('bear', df_res['regime'] == 'Bear'),
-        ('sideways', df_res['regime'] == 'Sideways'),
-    ]:
-        subset = df_res if mask is None else df_res[mask]
-        wr, count, lb, ub = calc_wr(subset)
+    stats = empty_regime_stats()
+    for bucket, (wins, total) in counts.items():
+        wr, count, lb, ub = calc_wr(wins, total)
         stats[bucket]['wr'] = wr
         stats[bucket]['count'] = count
         stats[bucket]['wr_lb'] = lb
         stats[bucket]['wr_ub'] = ub
 
     # 4. Self-Correction (Recent 14 Days vs Total)
-    # Check trades in the last 14 days of data available in the DF
-    last_date = df.index[-1]
-    recent_cutoff = last_date - pd.Timedelta(days=14)
-    recent_trades = df_res[df_res['date'] >= recent_cutoff]
-    
-    if not recent_trades.empty:
-        recent_wr, recent_count, _, _ = calc_wr(recent_trades)
+    if recent is not None:
+        recent_wr, recent_count, _, _ = calc_wr(*recent)
         # Threshold: If recent WR < 50% of Total WR AND trade count >= 2
         if recent_count >= 2 and recent_wr < (stats['total']['wr'] * 0.5):
             stats['recent_decay'] = True
@@ -255,9 +301,59 @@ def backtest_regime_performance(df, strategy_type, params=None):
 
     return stats
 
-def check_trinity_setup(row, df_context=None, params=None) -> dict:
+
+def backtest_regime_performance(df, strategy_type, params=None):
+    """
+    Advanced Backtester:
+    1. Identifies all past signals based on strategy logic.
+    2. Simulates trades with Dynamic ATR SL/TP.
+    3. Segregates performance by Market Regime (Bull/Bear/Sideways).
+    4. Checks for recent strategy decay (Self-Correction).
+
+    For the same numbers at every bar of a walk through history, use
+    core.regime_stats.RegimeStatsAccumulator instead of calling this on
+    each prefix.
+    """
+    if df.empty:
+        return {}
+
+    entries, outcome, _ = regime_signal_trades(df, strategy_type, params)
+    if len(entries) == 0:
+        return empty_regime_stats()
+
+    # 3. Aggregate Stats
+    regime = df['Regime'].to_numpy()[entries]
+    win = outcome == OUTCOME_WIN
+    decided = outcome != OUTCOME_HOLD # Exclude 'hold' from denominator
+
+    def count(mask):
+        return int(np.count_nonzero(win & mask)), int(np.count_nonzero(decided & mask))
+
+    counts = {'total': count(True)}
+    for bucket, label in REGIME_BUCKETS:
+        counts[bucket] = count(regime == label)
+
+    # Check trades in the last 14 days of data available in the DF
+    recent_cutoff = df.index[-1] - pd.Timedelta(days=RECENT_DECAY_DAYS)
+    recent = df.index[entries] >= recent_cutoff
+    return regime_stats_from_counts(counts, count(recent) if recent.any() else None)
+
+def trinity_confidence(stats) -> int:
+    # Confidence Score Calc — use Wilson 95% LB rather than raw WR so small
+    # samples don't get rewarded for lucky streaks. Threshold lowered from
+    # 60 → 50 to keep the bonus reachable at ~30-trade per-ticker samples.
+    confidence = 80 # Base
+    if stats.get('recent_decay'): confidence = 20
+    if stats.get('total', {}).get('wr_lb', 0) > 50: confidence += 10
+    return confidence
+
+def check_trinity_setup(row, df_context=None, params=None, stats=None) -> dict:
     """
     Trinity Strategy (Updated): Trend Pullback + ATR Risk + Backtest.
+
+    `stats` — regime stats already computed for this bar (e.g. by
+    core.regime_stats.RegimeStatsAccumulator) — skips re-running
+    backtest_regime_performance over df_context.
     """
     # Load Params (Injection or Default)
     # If params is provided (from Optimizer), it should be a dict like {"rsi_min": 30, ...}
@@ -320,14 +416,10 @@ def check_trinity_setup(row, df_context=None, params=None) -> dict:
         "warning": None
     }
     
-    stats = backtest_regime_performance(df_context, 'trinity', params=config) if df_context is not None else default_stats
+    if stats is None:
+        stats = backtest_regime_performance(df_context, 'trinity', params=config) if df_context is not None else default_stats
     
-    # Confidence Score Calc — use Wilson 95% LB rather than raw WR so small
-    # samples don't get rewarded for lucky streaks. Threshold lowered from
-    # 60 → 50 to keep the bonus reachable at ~30-trade per-ticker samples.
-    confidence = 80 # Base
-    if stats.get('recent_decay'): confidence = 20
-    if stats.get('total', {}).get('wr_lb', 0) > 50: confidence += 10
+    confidence = trinity_confidence(stats)
 
     return {
         "strategy": "trinity",
@@ -348,18 +440,21 @@ def check_trinity_setup(row, df_context=None, params=None) -> dict:
         "side": "LONG"
     }
 
-def check_2b_setup(row, df_context=None) -> dict:
+def check_2b_setup(row, df_context=None, params=None, stats=None) -> dict:
     """
     2B Reversal Strategy: 
     1. Identify significant High/Low in past 20-60 days.
     2. Check for False Breakout (2B).
     3. Filter by Momentum (RSI Divergence/MACD).
     4. Calculate SL/TP with 1:3 RR.
+
+    core.reversal.detect_2b_reversals finds the same bars over a whole
+    history; `stats` works as in check_trinity_setup.
     """
     if df_context is None or df_context.empty:
         return None
 
-    cfg = STRATEGY_PARAMS['2B']
+    cfg = params if params else STRATEGY_PARAMS['2B']
     lookback_min = cfg.get('lookback_min', 20)
     lookback_max = cfg.get('lookback_max', 60)
 
@@ -449,15 +544,15 @@ def check_2b_setup(row, df_context=None) -> dict:
         # Adjust size logic or just flag it
 
     tp_price = price - (abs(price - sl_price) * 3) if "Bearish" in signal_type else price + (abs(price - sl_price) * 3)
-    
-    # --- Backtest (Optional, reusing regime logic if applicable or skip for MVP) ---
-    # For now, skip bespoke backtest integration for 2B to keep scope small, 
-    # relying on the independent test in Spec.
-    
+
+    # --- Backtest: past 2B trades on their own plans, by regime ---
+    if stats is None:
+        stats = backtest_regime_performance(df_context, '2b', params=params)
+
     return {
         "strategy": "2B_Reversal",
         "price": price,
-        "confidence": 85 if rating == "High" else 65,
+        "confidence": two_b_confidence(stats, rating == "High"),
         "metrics": {
             "type": signal_type,
             "key_level": f"${key_level:.2f}",
@@ -466,14 +561,7 @@ def check_2b_setup(row, df_context=None) -> dict:
             "rating": rating,
             "regime": regime
         },
-        "stats": {
-            "total": {"wr": 0, "count": 0, "wr_lb": 0, "wr_ub": 0},
-            "bull": {"wr": 0, "count": 0, "wr_lb": 0, "wr_ub": 0},
-            "bear": {"wr": 0, "count": 0, "wr_lb": 0, "wr_ub": 0},
-            "sideways": {"wr": 0, "count": 0, "wr_lb": 0, "wr_ub": 0},
-            "recent_decay": False,
-            "warning": "New Strategy - Low Sample Size"
-        },
+        "stats": stats,
         "plan": {
             "stop_loss": round(sl_price, 2),
             "take_profit": round(tp_price, 2),
@@ -482,7 +570,30 @@ def check_2b_setup(row, df_context=None) -> dict:
         "side": "SHORT" if "Bearish" in signal_type else "LONG"
     }
 
-def check_donchian_setup(row, df_context=None, params=None) -> dict:
+def two_b_confidence(stats, high_rating) -> int:
+    # Fixed by setup quality: divergence plus a fading MACD histogram with a
+    # tight stop is "High". The regime stats are reported, not scored.
+    return 85 if high_rating else 65
+
+def donchian_confidence(stats, strong_breakout, regime) -> int:
+    # Confidence: base 75, +10 strong breakout (>1 ATR above prior high),
+    # +5 confirmed Bull regime, -50 if recent decay detected.
+    confidence = 75
+    if strong_breakout:
+        confidence += 10
+    if regime == 'Bull':
+        confidence += 5
+    # Use Wilson 95% LB; threshold lowered from 65 → 55 to compensate for
+    # the LB's natural discount at ~30-trade samples. Donchian universe edge
+    # is 62.1%, so a Wilson LB > 55% means this ticker actually beats it
+    # with statistical room to spare.
+    if stats.get('total', {}).get('wr_lb', 0) > 55:
+        confidence += 10
+    if stats.get('recent_decay'):
+        confidence = 25
+    return confidence
+
+def check_donchian_setup(row, df_context=None, params=None, stats=None) -> dict:
     """
     Donchian Breakout (Modern Turtle):
     1. Close breaks above 55-day Donchian high (excludes today via shift(1)).
@@ -490,6 +601,10 @@ def check_donchian_setup(row, df_context=None, params=None) -> dict:
     3. Volatility expansion: ATR > 100-day median ATR — real moves come with vol.
     4. ATR-based stop (2x) + TP (4x, 1:2 RR). Trailing stop in PositionManager
        takes over after the breakeven trigger, so big runners aren't capped.
+
+    `stats` — regime stats already computed for this bar (e.g. by
+    core.regime_stats.RegimeStatsAccumulator) — skips re-running
+    backtest_regime_performance over df_context.
     """
     config = params if params else STRATEGY_PARAMS['DONCHIAN']
     lookback = config.get('lookback', 55)
@@ -534,27 +649,14 @@ def check_donchian_setup(row, df_context=None, params=None) -> dict:
         "recent_decay": False,
         "warning": None,
     }
-    stats = backtest_regime_performance(df_context, 'donchian', params=config) if df_context is not None else default_stats
+    if stats is None:
+        stats = backtest_regime_performance(df_context, 'donchian', params=config) if df_context is not None else default_stats
 
-    # Confidence: base 75, +10 strong breakout (>1 ATR above prior high),
-    # +5 confirmed Bull regime, -50 if recent decay detected.
     breakout_dist = price - donchian_high
     strong_breakout = breakout_dist > atr
     breakout_pct = breakout_dist / donchian_high if donchian_high > 0 else 0
 
-    confidence = 75
-    if strong_breakout:
-        confidence += 10
-    if regime == 'Bull':
-        confidence += 5
-    # Use Wilson 95% LB; threshold lowered from 65 → 55 to compensate for
-    # the LB's natural discount at ~30-trade samples. Donchian universe edge
-    # is 62.1%, so a Wilson LB > 55% means this ticker actually beats it
-    # with statistical room to spare.
-    if stats.get('total', {}).get('wr_lb', 0) > 55:
-        confidence += 10
-    if stats.get('recent_decay'):
-        confidence = 25
+    confidence = donchian_confidence(stats, strong_breakout, regime)
 
     return {
         "strategy": "donchian",
@@ -576,9 +678,22 @@ def check_donchian_setup(row, df_context=None, params=None) -> dict:
     }
 
 
-def check_panic_setup(row, df_context=None, params=None) -> dict:
+def panic_confidence(stats) -> int:
+    # Confidence Score Calc — Wilson LB > 60 (vs raw > 70). Panic has lower
+    # universe edge (42.9% WR) and noisier signals, so the threshold sits
+    # higher relative to Trinity/Donchian's LB cutoffs.
+    confidence = 75 # Base for Panic (Riskier)
+    if stats.get('recent_decay'): confidence = 15 # Severe penalty
+    if stats.get('total', {}).get('wr_lb', 0) > 60: confidence += 15
+    return confidence
+
+def check_panic_setup(row, df_context=None, params=None, stats=None) -> dict:
     """
     Panic Strategy (Updated): Mean Reversion + ATR Targets + Backtest.
+
+    `stats` — regime stats already computed for this bar (e.g. by
+    core.regime_stats.RegimeStatsAccumulator) — skips re-running
+    backtest_regime_performance over df_context.
     """
     config = params if params else STRATEGY_PARAMS['PANIC']
     
@@ -611,14 +726,10 @@ def check_panic_setup(row, df_context=None, params=None) -> dict:
     take_profit = round(price + (3.0 * atr), 2)
 
     # --- REGIME BACKTEST ---
-    stats = backtest_regime_performance(df_context, 'panic', params=config) if df_context is not None else {}
+    if stats is None:
+        stats = backtest_regime_performance(df_context, 'panic', params=config) if df_context is not None else {}
 
-    # Confidence Score Calc — Wilson LB > 60 (vs raw > 70). Panic has lower
-    # universe edge (42.9% WR) and noisier signals, so the threshold sits
-    # higher relative to Trinity/Donchian's LB cutoffs.
-    confidence = 75 # Base for Panic (Riskier)
-    if stats.get('recent_decay'): confidence = 15 # Severe penalty
-    if stats.get('total', {}).get('wr_lb', 0) > 60: confidence += 15
+    confidence = panic_confidence(stats)
 
     return {
         "strategy": "panic",
@@ -0,0 +1,99 @@
+"""Column-array logs for the backtester's equity curve and trade ledger.
+
+Portfolio.equity_curve gets one row per simulated day and
+Portfolio.history one row per (partial) exit. A ColumnLog keeps each
+column in its own preallocated numpy array, which doubles when it fills.
+Analytics (core.performance) and reports read whole columns without
+building a DataFrame. Long runs stay small: numbers and dates take 8
+bytes a row, and text columns only hold references to the few distinct
+strings.
+
+Rows still read like the old lists of dicts: log[-1]['equity'], iteration
+and len() all work, and to_frame() gives the DataFrame.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Column kinds: 'float', 'int', 'text', or 'date' (tz-aware or naive
+# Timestamps, stored as int64 nanoseconds).
+EQUITY_COLUMNS = {'date': 'date', 'equity': 'float', 'cash': 'float'}
+TRADE_COLUMNS = {
+    'ticker': 'text', 'strategy': 'text', 'side': 'text',
+    'entry_date': 'date', 'exit_date': 'date', 'duration_days': 'int',
+    'entry_price': 'float', 'exit_price': 'float', 'qty': 'float',
+    'profit': 'float', 'pct_gain': 'float', 'reason': 'text',
+}
+_DTYPES = {'float': np.float64, 'int': np.int64, 'text': object, 'date': np.int64}
+
+
+class ColumnLog:
+    """Append-only table of typed column arrays.
+
+    >>> curve = ColumnLog(EQUITY_COLUMNS)
+    >>> curve.append({'date': day, 'equity': 100000.0, 'cash': 100000.0})
+    >>> curve.column('equity')      # float64 view of the rows so far
+    """
+
+    def __init__(self, columns: dict, capacity: int = 256):
+        self.kinds = dict(columns)
+        self._data = {name: np.empty(capacity, dtype=_DTYPES[kind]) for name, kind in self.kinds.items()}
+        self._tz = {}                 # date column -> tz of its first value
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def append(self, row: dict) -> None:
+        n = self._n
+        if n == len(next(iter(self._data.values()))):
+            for name, arr in self._data.items():
+                grown = np.empty(2 * len(arr), dtype=arr.dtype)
+                grown[:n] = arr[:n]
+                self._data[name] = grown
+        for name, kind in self.kinds.items():
+            value = row[name]
+            if kind == 'date':
+                value = pd.Timestamp(value)
+                self._tz.setdefault(name, value.tz)
+                value = value.value
+            self._data[name][n] = value
+        self._n = n + 1
+
+    def keep(self, mask) -> None:
+        """Drop the rows where `mask` (one bool per row) is False."""
+        mask = np.asarray(mask, dtype=bool)
+        for name, arr in self._data.items():
+            kept = arr[:self._n][mask]
+            arr[:len(kept)] = kept
+        self._n = int(mask.sum())
+
+    def column(self, name: str) -> np.ndarray:
+        """The column's values so far (a view; dates as int64 ns)."""
+        return self._data[name][:self._n]
+
+    def dates(self, name: str) -> pd.DatetimeIndex:
+        """A date column as a DatetimeIndex in its original timezone."""
+        index = pd.DatetimeIndex(self.column(name).view('M8[ns]'))
+        tz = self._tz.get(name)
+        return index.tz_localize('UTC').tz_convert(tz) if tz is not None else index
+
+    def __getitem__(self, i: int) -> dict:
+        if not -self._n <= i < self._n:
+            raise IndexError("ColumnLog index out of range")
+        i %= self._n
+        row = {}
+        for name, kind in self.kinds.items():
+            value = self._data[name][i]
+            if kind == 'date':
+                value = pd.Timestamp(int(value), tz=self._tz.get(name))
+            row[name] = value
+        return row
+
+    def __iter__(self):
+        return (self[i] for i in range(self._n))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: self.dates(name) if kind == 'date' else self.column(name)
+                             for name, kind in self.kinds.items()})
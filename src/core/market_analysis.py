@@ -15,9 +15,9 @@ from dataclasses import dataclass
 from typing import Optional
 
 try:
-    from src.core.data_fetcher import fetch_data
+    from src.core.data_fetcher import fetch_data, fetch_many
 except ImportError:
-    from core.data_fetcher import fetch_data
+    from core.data_fetcher import fetch_data, fetch_many
 
 
 # Ordered for display in the brief
@@ -41,9 +41,12 @@ class GaugeReading:
     chg_5d_pct: float     # 5-day % change
 
 
-def _read_gauge(symbol: str, display: str, label: str) -> Optional[GaugeReading]:
-    """Pull last 10 daily bars; compute today/5d % change. None on fetch fail."""
-    df = fetch_data(symbol, period="1mo")
+def _read_gauge(symbol: str, display: str, label: str, df=None) -> Optional[GaugeReading]:
+    """Pull last 10 daily bars; compute today/5d % change. None on fetch fail.
+
+    `df` takes bars already fetched by fetch_market_snapshot's batch call."""
+    if df is None:
+        df = fetch_data(symbol, period="1mo")
     if df is None or len(df) < 6:
         return None
     closes = df["Close"]
@@ -56,10 +59,14 @@ def _read_gauge(symbol: str, display: str, label: str) -> Optional[GaugeReading]
 
 
 def fetch_market_snapshot() -> list[GaugeReading]:
-    """Read all gauges; skip any that fail."""
+    """Read all gauges in one batch fetch; skip any that fail."""
+    batch = fetch_many([sym for sym, _, _ in GAUGES], period="1mo")
     out: list[GaugeReading] = []
     for sym, disp, lab in GAUGES:
-        r = _read_gauge(sym, disp, lab)
+        df = batch.frames.get(sym)
+        if df is None:
+            continue
+        r = _read_gauge(sym, disp, lab, df)
         if r is not None:
             out.append(r)
     return out
@@ -0,0 +1,98 @@
+"""Monte Carlo robustness of a backtest's trade ledger.
+
+A backtest gives one ROI and one drawdown from one ordering of its trades.
+Resampling the ledger shows how much of that was the particular sequence:
+
+- 'bootstrap' draws each path's trades with replacement, so the set of
+  trades varies (final equity, drawdown and time under water all spread).
+- 'shuffle' keeps the same trades in a random order, so final equity is
+  fixed and only the path (drawdown, time under water) varies.
+
+Paths are built additively from each trade's dollar profit, as the
+ledger records it. They are computed as (paths, trades) arrays a block
+of paths at a time, so 10,000 paths over 300 trades take about 0.1 s.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+MC_PATHS = 10_000
+PERCENTILES = (5, 50, 95)
+BLOCK_CELLS = 1 << 18   # paths x trades per block
+
+
+@dataclass
+class MonteCarloResult:
+    method: str
+    initial_balance: float
+    final_equity: np.ndarray      # per path
+    max_drawdown: np.ndarray      # per path, % below the running peak
+    time_under_water: np.ndarray  # per path, longest run of trades below the peak
+
+    def summary(self) -> dict:
+        """Percentiles of each distribution plus the share of losing paths."""
+        def pct(x):
+            return {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(x, PERCENTILES))}
+        return {
+            "method": self.method,
+            "paths": len(self.final_equity),
+            "final_equity": pct(self.final_equity),
+            "max_drawdown_pct": pct(self.max_drawdown),
+            "time_under_water_trades": pct(self.time_under_water),
+            "prob_loss": round(float(np.mean(self.final_equity < self.initial_balance)) * 100, 1),
+        }
+
+
+def resample_trades(profits, initial_balance: float, n_paths: int = MC_PATHS,
+                    method: str = "bootstrap", seed=None) -> MonteCarloResult:
+    """Resample the per-trade dollar `profits` (in ledger order) into
+    n_paths equity paths starting at initial_balance."""
+    profits = np.asarray(profits, dtype=float)
+    if method not in ("bootstrap", "shuffle"):
+        raise ValueError(f"method must be 'bootstrap' or 'shuffle', not {method!r}")
+    if len(profits) == 0:
+        flat = np.zeros(n_paths)
+        return MonteCarloResult(method, initial_balance, flat + initial_balance, flat, flat)
+
+    rng = np.random.default_rng(seed)
+    m = len(profits)
+    steps = np.arange(1, m + 1)
+    final = np.empty(n_paths)
+    max_dd = np.empty(n_paths)
+    longest = np.empty(n_paths, dtype=np.intp)
+
+    # Blocks of paths through reused buffers: the working set stays small
+    # and nothing is allocated per block beyond the comparison mask.
+    rows = max(1, min(n_paths, BLOCK_CELLS // m))
+    equity, peak = np.empty((rows, m)), np.empty((rows, m))
+    at_peak = np.empty((rows, m), dtype=np.intp)
+    for lo in range(0, n_paths, rows):
+        k = min(rows, n_paths - lo)
+        eq, pk, ap = equity[:k], peak[:k], at_peak[:k]
+        if method == "bootstrap":
+            np.take(profits, rng.integers(0, m, size=(k, m)), out=eq)
+        else:
+            eq[:] = profits
+            rng.permuted(eq, axis=1, out=eq)
+        np.cumsum(eq, axis=1, out=eq)
+        eq += initial_balance
+        np.maximum.accumulate(eq, axis=1, out=pk)
+        np.maximum(pk, initial_balance, out=pk)
+
+        # Longest run of consecutive trades under water: distance from each
+        # trade back to the last one at a peak.
+        np.multiply(eq >= pk, steps, out=ap)
+        np.maximum.accumulate(ap, axis=1, out=ap)
+        np.subtract(steps, ap, out=ap)
+        longest[lo:lo + k] = ap.max(axis=1)
+
+        final[lo:lo + k] = eq[:, -1]
+        np.subtract(pk, eq, out=eq)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(eq, pk, out=eq, where=pk > 0)
+        eq[pk <= 0] = 0.0
+        max_dd[lo:lo + k] = eq.max(axis=1) * 100
+
+    return MonteCarloResult(method, initial_balance, final, max_dd, longest)
@@ -2,9 +2,9 @@ import re
 from datetime import datetime, timedelta, timezone
 
 try:
-    from ddgs import DDGS
-except ImportError:  # fallback for old envs still on the renamed package
-    from duckduckgo_search import DDGS
+    from src.core.providers import get_provider
+except ImportError:
+    from core.providers import get_provider
 
 # Strip backticks/newlines so headlines render cleanly inside Telegram-MD.
 _SANITIZE_RE = re.compile(r'[`\r\n]+')
@@ -99,7 +99,8 @@ def format_news_lines(news_str, max_items=2, prefix="  📰 ", title_max_len=90)
 
 def get_market_news(query, max_results=3):
     """
-    Fetches recent news for a given ticker or topic using DuckDuckGo.
+    Fetches recent news for a given ticker or topic via the market-data
+    provider (DuckDuckGo when live).
     Used to filter out fundamental risks (e.g., bankruptcy, lawsuits).
 
     Applies client-side freshness filter (<= _MAX_AGE_DAYS old) to avoid
@@ -108,7 +109,7 @@ def get_market_news(query, max_results=3):
     """
     try:
         # Over-fetch so the freshness filter still yields max_results.
-        results = DDGS().news(query, max_results=max_results * 3)
+        results = get_provider().news(query, max_results * 3)
         if not results:
             return "No recent news found."
 
@@ -0,0 +1,77 @@
+"""First-passage outcomes for simulated entries.
+
+Given entry bars with a stop-loss and take-profit each, find which level
+the following bars touch first. Every entry is evaluated at once: each one
+gets a row of the next `horizon` bars' Open/High/Low, taken from a strided
+view of the series padded with NaN past the last bar. The first bar in the
+row that hits either level decides the outcome.
+
+Intra-bar tie-break (unchanged from the original per-candle loop): when one
+bar hits both SL and TP, the intra-day path is unknown. The Open stands in
+for gap direction. A gap down through SL is a loss, a gap up through TP is
+a win, and an Open in between counts as a loss (conservative).
+
+Short entries (2B's bearish side) are the mirror image: their target sits
+below and their stop above, so they are run on negated prices.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+OUTCOME_WIN = 1
+OUTCOME_LOSS = -1
+OUTCOME_HOLD = 0  # neither level hit within the horizon (or no bars left)
+
+FORWARD_BARS = 20
+
+
+def _forward_windows(x, entries, horizon):
+    """(len(entries), horizon) rows of x[i+1 : i+1+horizon], NaN past the end."""
+    padded = np.concatenate((np.asarray(x, dtype=float)[1:], np.full(horizon, np.nan)))
+    return sliding_window_view(padded, horizon)[entries]
+
+
+def first_passage(open_, high, low, entries, sl, tp, horizon: int = FORWARD_BARS, short=None):
+    """Outcome of each entry and the bar index it resolved on.
+
+    `entries` are bar positions; `sl` / `tp` are per-entry levels; `short`
+    optionally marks entries that are short. Returns (outcome, exit_idx):
+    outcome is OUTCOME_WIN / OUTCOME_LOSS / OUTCOME_HOLD per entry; exit_idx
+    is the position of the deciding bar, or -1 for a hold.
+    """
+    entries = np.asarray(entries, dtype=np.intp)
+    sl = np.asarray(sl, dtype=float)[:, None]
+    tp = np.asarray(tp, dtype=float)[:, None]
+    outcome = np.full(len(entries), OUTCOME_HOLD, dtype=np.int8)
+    exit_idx = np.full(len(entries), -1, dtype=np.intp)
+    if len(entries) == 0:
+        return outcome, exit_idx
+
+    highs = _forward_windows(high, entries, horizon)
+    lows = _forward_windows(low, entries, horizon)
+    opens = _forward_windows(open_, entries, horizon)
+    if short is not None and np.any(short):
+        # A short's High is the negated long's Low, and so on.
+        short = np.asarray(short, dtype=bool)
+        highs[short], lows[short] = -lows[short], -highs[short]
+        opens[short] = -opens[short]
+        sign = np.where(short, -1.0, 1.0)[:, None]
+        sl, tp = sl * sign, tp * sign
+
+    hit_tp = highs >= tp
+    hit_sl = lows <= sl
+    hit = hit_tp | hit_sl
+    resolved = hit.any(axis=1)
+    first = np.argmax(hit, axis=1)
+
+    rows = np.flatnonzero(resolved)
+    at = first[rows]
+    tp_first, sl_first = hit_tp[rows, at], hit_sl[rows, at]
+    opened = opens[rows, at]
+    both = tp_first & sl_first
+    win = np.where(both, (opened > sl[rows, 0]) & (opened >= tp[rows, 0]), tp_first)
+
+    outcome[rows] = np.where(win, OUTCOME_WIN, OUTCOME_LOSS)
+    exit_idx[rows] = entries[rows] + 1 + at
+    return outcome, exit_idx
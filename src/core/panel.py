@@ -0,0 +1,243 @@
+"""Universe panel — every ticker's bars on one shared trading-day axis.
+
+A Panel holds a single float64 array shaped (field, ticker, date): `values[f]`
+is a tickers × dates matrix for one field, and `values[f, t]` is one ticker's
+contiguous series. Dates are the union of all tickers' bars; a ticker with no
+bar on a date (pre-IPO, halted, delisted) has NaN there, and `valid` is the
+corresponding mask.
+
+On disk a panel is a directory:
+
+    values.npy   the (field, ticker, date) array
+    dates.npy    int64 UTC nanoseconds (same encoding as the bar store)
+    meta.json    tickers, fields, original dtypes, tz, period, built_at
+
+`load_panel` memory-maps values.npy read-only, so a multi-hundred-ticker
+panel opens in milliseconds and worker processes that load the same path
+share the OS page cache instead of each holding a copy.
+
+Only raw bars are stored on disk. Indicators are derived, for a whole panel
+at once, by core.panel_indicators. Those in-memory panels carry Regime as a
+numeric code (REGIME_CODES), and frame() decodes it back to strings.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.core.data_fetcher import fetch_many, is_current
+    from src.core.sessions import trades_around_the_clock
+except ImportError:
+    from core.data_fetcher import fetch_many, is_current
+    from core.sessions import trades_around_the_clock
+
+PANEL_DIR = "data/panels"
+PANEL_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+# Regime is categorical in calculate_indicators; panels carry it as a code.
+REGIME_CODES = {"Bull": 1.0, "Bear": -1.0, "Sideways": 0.0}
+
+
+class Panel:
+    def __init__(self, tickers, dates, fields, values, dtypes=None,
+                 period: Optional[str] = None, built_at: Optional[datetime] = None):
+        self.tickers: List[str] = list(tickers)
+        self.dates: pd.DatetimeIndex = pd.DatetimeIndex(dates, name='Date')
+        self.fields: List[str] = list(fields)
+        self.values: np.ndarray = values
+        self.dtypes: Dict[str, str] = dict(dtypes or {})
+        self.period = period
+        self.built_at = built_at or datetime.now(timezone.utc)
+        self._tix = {t: i for i, t in enumerate(self.tickers)}
+        self._fix = {f: i for i, f in enumerate(self.fields)}
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._tix
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def ticker_index(self, ticker: str) -> int:
+        return self._tix[ticker]
+
+    def field(self, name: str) -> np.ndarray:
+        """tickers × dates matrix for one field (a view, read-only if mmapped)."""
+        return self.values[self._fix[name]]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """tickers × dates mask of dates each ticker actually has a bar on."""
+        key = 'Close' if 'Close' in self._fix else self.fields[0]
+        return ~np.isnan(self.field(key))
+
+    def frame(self, ticker: str) -> Optional[pd.DataFrame]:
+        """One ticker as a regular bar DataFrame (missing dates dropped), in
+        the shape fetch_data returns. The result is a private copy."""
+        i = self._tix.get(ticker)
+        if i is None:
+            return None
+        block = self.values[:, i, :]
+        keep = self.valid[i]
+        if not keep.any():
+            return None
+        df = pd.DataFrame(np.array(block[:, keep].T), index=self.dates[keep], columns=self.fields)
+        for f, dtype in self.dtypes.items():
+            if f in df.columns and dtype != str(df[f].dtype) and df[f].notna().all():
+                df[f] = df[f].astype(dtype)
+        if 'Regime' in df.columns:
+            codes = df['Regime'].to_numpy()
+            df['Regime'] = np.select([codes == v for v in REGIME_CODES.values()],
+                                     list(REGIME_CODES), default='Sideways')
+        return df
+
+    def frames(self, tickers: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+        out = {}
+        for t in (self.tickers if tickers is None else tickers):
+            df = self.frame(t)
+            if df is not None:
+                out[t] = df
+        return out
+
+    def last_valid(self, name: str = 'Close') -> np.ndarray:
+        """Per-ticker most recent non-NaN value of `name` (NaN if none)."""
+        m = self.field(name)
+        ok = ~np.isnan(m)
+        # Index of the last True per row; rows with no data fall back to 0
+        # and are masked out below.
+        last = m.shape[1] - 1 - np.argmax(ok[:, ::-1], axis=1)
+        out = m[np.arange(m.shape[0]), last].astype(float)
+        out[~ok.any(axis=1)] = np.nan
+        return out
+
+    def save(self, path: str) -> None:
+        """Write the panel to directory `path`, replacing any previous one.
+
+        The new files are assembled in a sibling temp dir and swapped in, so
+        a reader never opens a half-written panel. Processes that already
+        have the old values.npy mapped keep reading their (unlinked) copy.
+        """
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=parent, prefix='.panel-')
+        try:
+            np.save(os.path.join(tmp, 'values.npy'), np.ascontiguousarray(self.values))
+            utc = self.dates.tz_convert('UTC') if self.dates.tz is not None else self.dates
+            np.save(os.path.join(tmp, 'dates.npy'), utc.values.astype('datetime64[ns]').view('int64'))
+            meta = {
+                'tickers': self.tickers,
+                'fields': self.fields,
+                'dtypes': self.dtypes,
+                'tz': str(self.dates.tz) if self.dates.tz is not None else "",
+                'period': self.period,
+                'built_at': self.built_at.timestamp(),
+            }
+            with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+
+            old = None
+            if os.path.exists(path):
+                old = f"{tmp}-old"
+                os.replace(path, old)
+            os.replace(tmp, path)
+            if old:
+                shutil.rmtree(old, ignore_errors=True)
+        except OSError as e:
+            print(f"Warning: Failed to save panel to {path}: {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def build_panel(frames: Dict[str, pd.DataFrame], fields: Iterable[str] = PANEL_FIELDS,
+                tickers: Optional[Iterable[str]] = None, period: Optional[str] = None) -> Panel:
+    """Align per-ticker bar frames onto one date axis.
+
+    `tickers` fixes the ticker order (and may include tickers with no frame,
+    which become all-NaN rows); by default it is the order of `frames`.
+    """
+    tickers = list(frames) if tickers is None else list(dict.fromkeys(tickers))
+    fields = list(fields)
+    present = [frames[t] for t in tickers if frames.get(t) is not None and not frames[t].empty]
+
+    dates = pd.DatetimeIndex([])
+    for df in present:
+        dates = dates.union(pd.DatetimeIndex(df.index))
+    dates = dates.sort_values()
+
+    values = np.full((len(fields), len(tickers), len(dates)), np.nan)
+    dtypes = {}
+    for i, t in enumerate(tickers):
+        df = frames.get(t)
+        if df is None or df.empty:
+            continue
+        pos = dates.get_indexer(df.index)
+        for k, f in enumerate(fields):
+            if f in df.columns:
+                values[k, i, pos] = df[f].to_numpy(dtype=float)
+                dtypes.setdefault(f, str(df[f].dtype))
+    return Panel(tickers, dates, fields, values, dtypes=dtypes, period=period)
+
+
+def load_panel(path: str, mmap: bool = True) -> Optional[Panel]:
+    """Open a saved panel, memory-mapped read-only unless `mmap=False`.
+    Returns None if the directory is missing or unreadable."""
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r' if mmap else None)
+        raw = np.load(os.path.join(path, 'dates.npy'))
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(path):
+            print(f"Warning: Failed to load panel {path}: {e}")
+        return None
+    dates = pd.to_datetime(raw, unit='ns', utc=True)
+    if meta.get('tz'):
+        dates = dates.tz_convert(meta['tz'])
+    return Panel(meta['tickers'], dates, meta['fields'], values,
+                 dtypes=meta.get('dtypes'), period=meta.get('period'),
+                 built_at=datetime.fromtimestamp(meta['built_at'], tz=timezone.utc))
+
+
+def panel_path(tickers: Iterable[str], period: str, root: str = PANEL_DIR) -> str:
+    """Default location for a universe panel — keyed by period and a hash of
+    the (sorted) ticker list, so different universes don't overwrite each
+    other."""
+    key = zlib.crc32(",".join(sorted(set(tickers))).encode())
+    return os.path.join(root, f"{period}_{key:08x}")
+
+
+def _is_fresh(panel: Panel, now: Optional[datetime] = None) -> bool:
+    # Same rule as the bar store: a panel built after the last close is good
+    # until the next one; during the session always rebuild. One crypto
+    # ticker puts the whole panel on the short around-the-clock TTL.
+    return is_current(panel.built_at, now, any(map(trades_around_the_clock, panel.tickers)))
+
+
+def universe_panel(tickers, period: str = "3y", path: Optional[str] = None,
+                   fields: Iterable[str] = PANEL_FIELDS, now: Optional[datetime] = None) -> Panel:
+    """Load the saved panel for this universe/period if it is still fresh,
+    otherwise rebuild it from fetch_many (which is itself served mostly from
+    the bar store) and save it."""
+    tickers = list(dict.fromkeys(tickers))
+    path = path or panel_path(tickers, period)
+    panel = load_panel(path)
+    if panel is not None and _is_fresh(panel, now) and set(tickers) <= set(panel.tickers):
+        return panel
+
+    batch = fetch_many(tickers, period=period)
+    for t, reason in batch.failures.items():
+        print(f"Warning: No data for {t}: {reason}")
+    panel = build_panel(batch.frames, fields=fields, tickers=tickers, period=period)
+    panel.save(path)
+    return panel
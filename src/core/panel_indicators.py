@@ -0,0 +1,193 @@
+"""calculate_indicators for a whole universe panel in one vectorized pass.
+
+Every indicator is computed as 2-D array operations over (ticker, date)
+rather than once per ticker DataFrame. Rolling windows use strided views,
+and EWM recursions step along the date axis with vector ops across tickers.
+
+Per-ticker frames only contain the days a ticker actually traded, so a
+rolling window counts bars rather than calendar slots. To get the same
+numbers, each ticker's bars are first packed right-aligned: gaps are
+squeezed out and missing history becomes leading NaN. The computed values
+are then scattered back onto the panel's date axis. Results match
+calculate_indicators up to float rounding.
+
+Regime is stored as a numeric code (see core.panel.REGIME_CODES), and
+Panel.frame() turns it back into the 'Bull' / 'Bear' / 'Sideways' strings
+the check_*_setup functions read.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from src.config import STRATEGY_PARAMS
+    from src.core.indicators import required_columns
+    from src.core.panel import Panel, REGIME_CODES
+    from src.core.range_query import SparseTable
+    from src.core.rolling import rolling_median
+except ImportError:
+    from config import STRATEGY_PARAMS
+    from core.indicators import required_columns
+    from core.panel import Panel, REGIME_CODES
+    from core.range_query import SparseTable
+    from core.rolling import rolling_median
+
+# Cap on elements materialized at once by window reductions that copy
+# (std); larger universes are processed in ticker chunks.
+_MAX_WINDOW_ELEMENTS = 8_000_000
+
+
+def _pack(valid):
+    """Index arrays mapping each valid (ticker, date) cell to its slot in a
+    right-aligned packed array (each ticker's bars contiguous, ending at the
+    last column)."""
+    rows, cols = np.nonzero(valid)
+    n_dates = valid.shape[1]
+    counts = valid.sum(axis=1)
+    rank = np.cumsum(valid, axis=1)[rows, cols] - 1
+    packed_cols = n_dates - counts[rows] + rank
+    return rows, cols, packed_cols
+
+
+def _gather(x, idx):
+    rows, cols, packed_cols = idx
+    out = np.full(x.shape, np.nan)
+    out[rows, packed_cols] = x[rows, cols]
+    return out
+
+
+def _scatter(x, idx):
+    rows, cols, packed_cols = idx
+    out = np.full(x.shape, np.nan)
+    out[rows, cols] = x[rows, packed_cols]
+    return out
+
+
+def _shift(x, n=1):
+    out = np.full(x.shape, np.nan)
+    out[:, n:] = x[:, :-n]
+    return out
+
+
+def _rolling(x, window, fn, **kwargs):
+    """fn over trailing windows along the date axis. Any NaN in the window
+    gives NaN (pandas' default min_periods=window)."""
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] < window:
+        return out
+    step = max(1, _MAX_WINDOW_ELEMENTS // max(1, (x.shape[1] - window + 1) * window))
+    for i in range(0, x.shape[0], step):
+        view = sliding_window_view(x[i:i + step], window, axis=1)
+        out[i:i + step, window - 1:] = fn(view, axis=-1, **kwargs)
+    return out
+
+
+def _ewm(x, alpha, min_periods=0):
+    """ewm(alpha, adjust=False, min_periods).mean() per row; the recursion
+    starts at each row's first non-NaN value."""
+    out = np.full(x.shape, np.nan)
+    prev = np.full(x.shape[0], np.nan)
+    count = np.zeros(x.shape[0], dtype=np.int64)
+    for j in range(x.shape[1]):
+        xj = x[:, j]
+        ok = ~np.isnan(xj)
+        prev = np.where(ok, np.where(np.isnan(prev), xj, (1 - alpha) * prev + alpha * xj), prev)
+        count += ok
+        out[:, j] = np.where(count >= max(min_periods, 1), prev, np.nan)
+    return out
+
+
+def indicator_arrays(open_, high, low, close, volume, lookback=55, atr_med_win=100, need=None):
+    """Indicator matrices for packed (ticker, date) bar matrices, keyed by the
+    calculate_indicators column names. `need` (already closed over
+    dependencies) restricts which are computed; None means all."""
+    def wants(*names):
+        return need is None or any(n in need for n in names)
+
+    out = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if wants('SMA_200'):
+            out['SMA_200'] = _rolling(close, 200, np.mean)
+        if wants('EMA_50'):
+            out['EMA_50'] = _ewm(close, 2 / 51)
+
+        if wants('RSI_14'):
+            delta = close - _shift(close)
+            has_bar = ~np.isnan(close)
+            gain = np.where(has_bar, np.where(delta > 0, delta, 0.0), np.nan)
+            loss = np.where(has_bar, np.where(delta < 0, -delta, 0.0), np.nan)
+            rs = _ewm(gain, 1 / 14, 14) / _ewm(loss, 1 / 14, 14)
+            out['RSI_14'] = 100 - (100 / (1 + rs))
+
+        if wants('BBL_20_2.0'):
+            sma20 = _rolling(close, 20, np.mean)
+            std20 = _rolling(close, 20, np.std, ddof=1)
+            out['BBL_20_2.0'] = sma20 - (2 * std20)
+
+        if wants('Vol_SMA_20'):
+            out['Vol_SMA_20'] = _rolling(volume, 20, np.mean)
+        if wants('RVOL'):
+            out['RVOL'] = volume / out['Vol_SMA_20']
+
+        if wants('MACD'):
+            out['MACD'] = _ewm(close, 2 / 13) - _ewm(close, 2 / 27)
+        if wants('MACD_Signal'):
+            out['MACD_Signal'] = _ewm(out['MACD'], 2 / 10)
+        if wants('MACD_Hist'):
+            out['MACD_Hist'] = out['MACD'] - out['MACD_Signal']
+
+        if wants('ATR_14'):
+            prev_close = _shift(close)
+            tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+            out['ATR_14'] = _ewm(tr, 1 / 14, 14)
+
+        if wants(f'DONCHIAN_HIGH_{lookback}', f'DONCHIAN_LOW_{lookback}'):
+            # Range-query tables: O(log lookback) per bar to build instead
+            # of reducing every lookback-wide window.
+            out[f'DONCHIAN_HIGH_{lookback}'] = SparseTable(high, 'max').rolling(lookback, shift=1)
+            out[f'DONCHIAN_LOW_{lookback}'] = SparseTable(low, 'min').rolling(lookback, shift=1)
+        if wants(f'ATR_MEDIAN_{atr_med_win}'):
+            out[f'ATR_MEDIAN_{atr_med_win}'] = rolling_median(out['ATR_14'], atr_med_win)
+
+        if wants('Regime'):
+            sma200 = out['SMA_200']
+            slope = sma200 - _shift(sma200, 20)
+            out['Regime'] = np.select(
+                [(close > sma200) & (slope > 0), (close < sma200) & (slope < 0)],
+                [REGIME_CODES['Bull'], REGIME_CODES['Bear']],
+                default=REGIME_CODES['Sideways'],
+            )
+    return out
+
+
+def calculate_panel_indicators(panel: Panel, columns=None) -> Panel:
+    """Return a new in-memory Panel with the raw fields plus the
+    calculate_indicators columns, computed for all tickers at once.
+    `columns` works as in calculate_indicators."""
+    donchian_cfg = STRATEGY_PARAMS.get('DONCHIAN', {})
+    valid = panel.valid
+    idx = _pack(valid)
+
+    def packed(name):
+        if name not in panel.fields:
+            return np.full(valid.shape, np.nan)
+        return _gather(np.asarray(panel.field(name), dtype=float), idx)
+
+    arrays = indicator_arrays(
+        packed('Open'), packed('High'), packed('Low'), packed('Close'), packed('Volume'),
+        lookback=donchian_cfg.get('lookback', 55),
+        atr_med_win=donchian_cfg.get('atr_median_window', 100),
+        need=None if columns is None else required_columns(columns),
+    )
+
+    names = list(arrays)
+    values = np.empty((len(panel.fields) + len(names),) + valid.shape)
+    values[:len(panel.fields)] = panel.values
+    for k, name in enumerate(names):
+        col = _scatter(arrays[name], idx)
+        col[~valid] = np.nan
+        values[len(panel.fields) + k] = col
+
+    return Panel(panel.tickers, panel.dates, panel.fields + names, values,
+                 dtypes=panel.dtypes, period=panel.period, built_at=panel.built_at)
@@ -0,0 +1,76 @@
+"""Performance analytics over a backtest's equity curve and trade ledger.
+
+performance_metrics() reads the column arrays of Portfolio.equity_curve
+and Portfolio.history (core.ledger). It computes everything with whole-
+array numpy operations, in one call:
+
+- drawdown: the largest % fall from a running peak, and the longest
+  stretch of days below a peak.
+- Sharpe / Sortino: annualized daily equity returns, risk-free rate 0.
+  Sortino divides by the downside deviation (negative returns only).
+- exposure: the average share of equity held in positions.
+- turnover: traded notional (entries plus exits, halved) over average
+  equity, per year.
+- per strategy: trades, win rate, PnL and its ROI contribution.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True in a 1-D mask."""
+    steps = np.arange(1, len(mask) + 1)
+    last_false = np.maximum.accumulate(np.where(mask, 0, steps)) if len(mask) else steps
+    return int((steps - last_false).max(initial=0))
+
+
+def performance_metrics(equity_curve, history, initial_balance: float) -> dict:
+    """Risk / return metrics of one run. `equity_curve` and `history` are
+    the Portfolio's ColumnLogs."""
+    equity = equity_curve.column('equity')
+    cash = equity_curve.column('cash')
+    out = {"days": len(equity)}
+
+    prev = np.concatenate(([initial_balance], equity[:-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(prev > 0, equity / prev - 1, 0.0)
+        peak = np.maximum(np.maximum.accumulate(equity), initial_balance)
+        drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+        exposure = np.where(equity > 0, (equity - cash) / equity, 0.0)
+
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2)) if len(returns) else 0.0
+    mean = returns.mean() if len(returns) else 0.0
+    out.update({
+        "max_drawdown_pct": round(float(drawdown.max(initial=0)) * 100, 2),
+        "max_drawdown_days": _longest_run(equity < peak),
+        "sharpe": round(float(mean / std * np.sqrt(TRADING_DAYS)), 2) if std > 0 else 0.0,
+        "sortino": round(float(mean / downside * np.sqrt(TRADING_DAYS)), 2) if downside > 0 else 0.0,
+        "exposure_pct": round(float(exposure.mean()) * 100, 1) if len(exposure) else 0.0,
+    })
+
+    qty = history.column('qty')
+    notional = float(np.sum(qty * (history.column('entry_price') + history.column('exit_price')))) / 2
+    years = len(equity) / TRADING_DAYS
+    avg_equity = float(equity.mean()) if len(equity) else initial_balance
+    out["turnover"] = round(notional / avg_equity / years, 2) if years > 0 and avg_equity > 0 else 0.0
+
+    profit = history.column('profit')
+    names, which = np.unique(history.column('strategy').astype(str), return_inverse=True)
+    pnl = np.bincount(which, weights=profit, minlength=len(names))
+    count = np.bincount(which, minlength=len(names))
+    wins = np.bincount(which, weights=profit > 0, minlength=len(names))
+    out["strategies"] = {
+        str(name): {
+            "trades": int(count[k]),
+            "win_rate": round(float(wins[k] / count[k]) * 100, 1),
+            "pnl": round(float(pnl[k]), 2),
+            "avg_pnl": round(float(pnl[k] / count[k]), 2),
+            "roi_contribution": round(float(pnl[k] / initial_balance) * 100, 2),
+        }
+        for k, name in enumerate(names)
+    }
+    return out
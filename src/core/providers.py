@@ -0,0 +1,365 @@
+"""Market-data providers — the only place that talks to the network.
+
+fetch_data / fetch_many, fetch_next_earnings, get_market_news and
+get_sp500_tickers all go through `get_provider()`:
+
+- LiveProvider   — yfinance bars + earnings calendar, DuckDuckGo news,
+                   Wikipedia S&P 500 list. The default.
+- ReplayProvider — file-backed and fully offline. Serves recorded bars
+                   (`<root>/bars/<TICKER>.csv`), earnings (`earnings.json`),
+                   news (`news.json`) and the S&P list (`sp500.json`), and
+                   falls back to deterministic synthetic data for anything
+                   not recorded. Used to benchmark / load-test the scanner,
+                   backtester and bot on an isolated machine.
+
+Select with MARKET_DATA_PROVIDER=replay (+ REPLAY_DATA_DIR), or call
+set_provider() from code. `record()` snapshots live data into a replay dir.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+try:
+    import yfinance as yf
+except ImportError:
+    yf = None
+
+try:
+    from ddgs import DDGS
+except ImportError:  # fallback for old envs still on the renamed package
+    try:
+        from duckduckgo_search import DDGS
+    except ImportError:
+        DDGS = None
+
+try:
+    from src.core.sessions import MARKET_TZ, slice_period, PERIOD_RE
+except ImportError:
+    from core.sessions import MARKET_TZ, slice_period, PERIOD_RE
+
+
+REPLAY_DIR = "data/replay"
+
+# Synthetic series defaults: ~4y of business days ending on a fixed date so
+# every run (and every machine) sees identical bars.
+SYNTHETIC_END = "2026-01-02"
+SYNTHETIC_BARS = 1000
+
+SP500_URL = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
+_SP500_HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
+
+
+class MarketDataProvider:
+    """Interface every provider implements.
+
+    `cacheable` tells data_fetcher whether results should go through the
+    on-disk bar store and the in-process series cache. Live data should;
+    replay data is already local and must not leak into the real store.
+    """
+    name = "base"
+    cacheable = True
+
+    def history(self, ticker: str, period: Optional[str] = None,
+                start: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Daily OHLCV. Exactly one of `period` / `start` is used. None if
+        the provider has nothing for `ticker`."""
+        raise NotImplementedError
+
+    def history_many(self, tickers: list[str], period: Optional[str] = None,
+                     start: Optional[str] = None) -> tuple[dict, dict]:
+        """Bulk history → ({ticker: df}, {ticker: failure reason}). The
+        default loops over history(); providers with a real bulk endpoint
+        override it."""
+        frames, failures = {}, {}
+        for t in tickers:
+            try:
+                df = self.history(t, period=period, start=start)
+            except Exception as e:
+                failures[t] = str(e)
+                continue
+            if df is None or df.empty:
+                failures[t] = "no data returned"
+            else:
+                frames[t] = df
+        return frames, failures
+
+    def next_earnings(self, ticker: str) -> Optional[date]:
+        raise NotImplementedError
+
+    def news(self, query: str, max_results: int) -> list[dict]:
+        """Raw news items: dicts with 'title', 'body', 'url', 'date'."""
+        raise NotImplementedError
+
+    def sp500_tickers(self) -> list[str]:
+        raise NotImplementedError
+
+
+class LiveProvider(MarketDataProvider):
+    name = "live"
+
+    def history(self, ticker, period=None, start=None):
+        dat = yf.Ticker(ticker)
+        if start is not None:
+            df = dat.history(start=start, interval="1d")
+        else:
+            df = dat.history(period=period, interval="1d")
+
+        if df.empty:
+            return None
+
+        # Ensure no MultiIndex (Ticker.history usually returns simple columns)
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+
+        # yfinance history returns: Open, High, Low, Close, Volume, Dividends, Stock Splits
+        return df
+
+    def history_many(self, tickers, period=None, start=None):
+        kwargs = {"start": start} if start is not None else {"period": period}
+        raw = yf.download(tickers, interval="1d", group_by="ticker", actions=True,
+                          auto_adjust=True, ignore_tz=False, progress=False,
+                          threads=True, **kwargs)
+        if raw is None or raw.empty:
+            return {}, {t: "no data returned" for t in tickers}
+        return split_download(raw, tickers)
+
+    def next_earnings(self, ticker):
+        """yfinance Ticker.calendar → earliest upcoming earnings date. None on
+        any failure (network, missing data, parse error)."""
+        if yf is None:
+            return None
+        try:
+            cal = yf.Ticker(ticker).calendar
+        except Exception:
+            return None
+        if not isinstance(cal, dict):
+            return None
+        raw = cal.get('Earnings Date')
+        if not raw:
+            return None
+        # yfinance returns list[datetime.date]; can be 1 entry (confirmed) or 2
+        # (estimated window). Take the earliest — that's the soonest gap risk.
+        candidates = raw if isinstance(raw, list) else [raw]
+        parsed = []
+        for c in candidates:
+            if isinstance(c, datetime):
+                parsed.append(c.date())
+            elif isinstance(c, date):
+                parsed.append(c)
+        return min(parsed) if parsed else None
+
+    def news(self, query, max_results):
+        return DDGS().news(query, max_results=max_results) or []
+
+    def sp500_tickers(self):
+        response = requests.get(SP500_URL, headers=_SP500_HEADERS)
+        response.raise_for_status()
+        tables = pd.read_html(io.StringIO(response.text))
+        # Clean tickers (e.g. BRK.B -> BRK-B)
+        return [t.replace('.', '-') for t in tables[0]['Symbol'].tolist()]
+
+
+def split_download(raw, tickers):
+    """Split a yf.download(group_by='ticker') result into per-ticker frames.
+
+    Columns come back as (ticker, field); a single-ticker request may come
+    back flat. Rows where the ticker has no bar (another ticker's calendar
+    padding the index) are dropped."""
+    frames, failures = {}, {}
+    for t in tickers:
+        try:
+            if isinstance(raw.columns, pd.MultiIndex):
+                level = 0 if t in raw.columns.get_level_values(0) else 1
+                if t not in raw.columns.get_level_values(level):
+                    failures[t] = "no data returned"
+                    continue
+                df = raw.xs(t, axis=1, level=level)
+            elif len(tickers) == 1:
+                df = raw
+            else:
+                failures[t] = "no data returned"
+                continue
+            df = df.dropna(subset=['Close'])
+            if df.empty:
+                failures[t] = "no data returned"
+                continue
+            df = df.copy()
+            df.columns.name = None
+            if df.index.tz is None:
+                df.index = df.index.tz_localize(MARKET_TZ)
+            frames[t] = df
+        except Exception as e:
+            failures[t] = str(e)
+    return frames, failures
+
+
+def _seed(key: str) -> int:
+    # crc32 rather than hash(): str hashing is salted per process.
+    return zlib.crc32(key.upper().encode())
+
+
+def synthetic_bars(ticker: str, periods: int = SYNTHETIC_BARS,
+                   end: str = SYNTHETIC_END) -> pd.DataFrame:
+    """Deterministic geometric random walk shaped like Ticker.history()."""
+    rng = np.random.default_rng(_seed(ticker))
+    vol = rng.uniform(0.01, 0.03)
+    drift = rng.uniform(-0.0002, 0.0008)
+    rets = rng.normal(drift, vol, periods)
+    close = rng.uniform(20, 400) * np.exp(np.cumsum(rets))
+    prev = np.concatenate(([close[0]], close[:-1]))
+    open_ = prev * (1 + rng.normal(0, vol / 3, periods))
+    wick = np.abs(rng.normal(0, vol / 2, (2, periods)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = rng.lognormal(15, 0.4, periods).astype(np.int64)
+    idx = pd.bdate_range(end=end, periods=periods, tz=MARKET_TZ, name="Date")
+    return pd.DataFrame({
+        "Open": open_, "High": high, "Low": low, "Close": close,
+        "Volume": volume, "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=idx)
+
+
+class ReplayProvider(MarketDataProvider):
+    """Offline, deterministic provider. See module docstring for the layout.
+
+    Period requests are sliced relative to the series' own last bar (the
+    replay clock), not today's date, so old recordings stay usable.
+    """
+    name = "replay"
+    cacheable = False
+
+    def __init__(self, root: str = REPLAY_DIR, synthetic: bool = True,
+                 synthetic_end: str = SYNTHETIC_END,
+                 synthetic_bars_count: int = SYNTHETIC_BARS):
+        self.root = root
+        self.synthetic = synthetic
+        self.synthetic_end = synthetic_end
+        self.synthetic_bars_count = synthetic_bars_count
+        self._bars: dict[str, Optional[pd.DataFrame]] = {}
+        self._earnings = self._load_json("earnings.json", {})
+        self._news = self._load_json("news.json", {})
+        self._sp500 = self._load_json("sp500.json", None)
+
+    def _load_json(self, name, default):
+        path = os.path.join(self.root, name)
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return default
+
+    def _series(self, ticker: str) -> Optional[pd.DataFrame]:
+        key = ticker.upper()
+        if key not in self._bars:
+            path = os.path.join(self.root, "bars", f"{key}.csv")
+            if os.path.exists(path):
+                df = pd.read_csv(path, index_col=0)
+                df.index = pd.to_datetime(df.index, utc=True).tz_convert(MARKET_TZ)
+                df.index.name = "Date"
+            elif self.synthetic:
+                df = synthetic_bars(key, self.synthetic_bars_count, self.synthetic_end)
+            else:
+                df = None
+            self._bars[key] = df
+        return self._bars[key]
+
+    def history(self, ticker, period=None, start=None):
+        df = self._series(ticker)
+        if df is None or df.empty:
+            return None
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start, tz=MARKET_TZ)]
+        elif period and PERIOD_RE.fullmatch(period):
+            df = slice_period(df, period, df.index[-1])
+        return df.copy() if not df.empty else None
+
+    def next_earnings(self, ticker):
+        key = ticker.upper()
+        if key in self._earnings:
+            raw = self._earnings[key]
+            return date.fromisoformat(raw) if raw else None
+        if not self.synthetic:
+            return None
+        # Relative to the replay's fixed end date, not today, so a replay
+        # run gives the same answer whenever it runs.
+        end = pd.Timestamp(self.synthetic_end).date()
+        return end + timedelta(days=3 + _seed(key) % 60)
+
+    def news(self, query, max_results):
+        if query in self._news:
+            return list(self._news[query])[:max_results]
+        if not self.synthetic:
+            return []
+        return [
+            {"title": f"Replay headline {i + 1} for {query}",
+             "body": "Synthetic replay item.",
+             "url": f"replay://news/{_seed(query)}/{i}",
+             "date": None}
+            for i in range(max_results)
+        ]
+
+    def sp500_tickers(self):
+        if self._sp500 is not None:
+            return list(self._sp500)
+        try:
+            from src.config import SP500_TOP_200
+        except ImportError:
+            from config import SP500_TOP_200
+        return list(SP500_TOP_200)
+
+
+def record(tickers, period: str = "3y", root: str = REPLAY_DIR,
+           source: Optional[MarketDataProvider] = None) -> dict:
+    """Snapshot bars + next-earnings for `tickers` from `source` (default:
+    live) into a replay directory. Returns {ticker: bar count} for what was
+    written."""
+    source = source or LiveProvider()
+    os.makedirs(os.path.join(root, "bars"), exist_ok=True)
+    written, earnings = {}, {}
+    for t in tickers:
+        df = source.history(t, period=period)
+        if df is None or df.empty:
+            continue
+        df.to_csv(os.path.join(root, "bars", f"{t.upper()}.csv"))
+        written[t] = len(df)
+        nxt = source.next_earnings(t)
+        earnings[t.upper()] = nxt.isoformat() if nxt else None
+    with open(os.path.join(root, "earnings.json"), "w") as f:
+        json.dump(earnings, f, indent=2)
+    return written
+
+
+_provider: Optional[MarketDataProvider] = None
+
+
+def _provider_from_env() -> MarketDataProvider:
+    name = os.getenv("MARKET_DATA_PROVIDER", "live").lower()
+    if name == "replay":
+        return ReplayProvider(os.getenv("REPLAY_DATA_DIR", REPLAY_DIR))
+    return LiveProvider()
+
+
+def get_provider() -> MarketDataProvider:
+    global _provider
+    if _provider is None:
+        _provider = _provider_from_env()
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> Optional[MarketDataProvider]:
+    """Swap the active provider (None → re-read env on next use). Returns the
+    previous one so callers can restore it."""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
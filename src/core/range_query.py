@@ -0,0 +1,125 @@
+"""Range max/min queries over a price series.
+
+The 2B key levels (an older 20-60 bar window) and the Donchian channels
+both ask for "the highest High (or lowest Low) between bar a and bar b",
+and for 2B also where it was. A SparseTable answers any such range [start, stop) in O(1) after an
+O(n log n) build, so each new window or lookback is two lookups rather than
+another pass over the bars.
+
+Level k of the table holds, for every bar i, the extreme of x[i : i + 2**k]
+and its position. A range is covered by two (overlapping) power-of-two blocks,
+one from each end, and the answer is the better of the two. Levels are built
+the first time a query needs them.
+
+Semantics follow pandas. NaN is skipped as in Series.max() / idxmax(), an
+all-NaN or empty range gives NaN (position -1), and ties go to the first bar.
+rolling() instead gives NaN for any window containing a NaN, like
+Series.rolling(window).max().
+
+A 2-D (row, time) matrix gets one table per row, built in one go, and the
+same query ranges apply to every row.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+class SparseTable:
+    """Range max (op='max') or min (op='min') index over the last axis of x.
+
+    >>> highs = SparseTable(df['High'].to_numpy(), 'max')
+    >>> highs.value(i - 60, i - 5), highs.arg(i - 60, i - 5)
+    """
+
+    def __init__(self, x, op: str = 'max'):
+        if op not in ('max', 'min'):
+            raise ValueError(f"op must be 'max' or 'min', not {op!r}")
+        self.x = np.asarray(x, dtype=float)
+        self.n = self.x.shape[-1]
+        self.op = op
+        self._sign = 1.0 if op == 'max' else -1.0
+        self._levels = None
+
+    def _grow(self, top: int):
+        """Build levels up to `top` (block length 2**top). Levels are made on
+        first use, so fixed short windows never pay for the long ones."""
+        if self._levels is None:
+            # Time first, so a table lookup at bar positions yields (m, *rows).
+            # Keys are x (or -x for min) with NaN sorted below everything.
+            key = self._sign * np.moveaxis(self.x, -1, 0)
+            key = np.where(np.isnan(key), -np.inf, key)
+            pos = np.broadcast_to(np.arange(self.n).reshape((-1,) + (1,) * (self.x.ndim - 1)), key.shape)
+            self._levels = [(key, pos)]
+        elif top < len(self._levels):
+            return
+        while len(self._levels) <= top:
+            k, p = self._levels[-1]
+            span = 1 << (len(self._levels) - 1)
+            take_right = k[span:] > k[:-span]                    # ties keep the first
+            self._levels.append((np.where(take_right, k[span:], k[:-span]),
+                                 np.where(take_right, p[span:], p[:-span])))
+        # Pad every level to n so one array holds the whole table.
+        key, pos = self._levels[0]
+        self._keys = np.stack([np.concatenate((k, key[len(k):])) for k, _ in self._levels])
+        self._pos = np.stack([np.concatenate((p, pos[len(p):])) for _, p in self._levels])
+
+    def _blocks(self, start, stop):
+        """The two covering blocks' (level, first bar) for query arrays, plus
+        which queries are non-empty and in bounds."""
+        length = stop - start
+        ok = (start >= 0) & (stop <= self.n) & (length > 0)
+        start, length = np.where(ok, start, 0), np.where(ok, length, 1)
+        k = np.frexp(length.astype(float))[1] - 1            # floor(log2(length))
+        return k, start, start + length - (1 << k), ok
+
+    def extreme(self, start, stop):
+        """(value, position) of the extreme of x[start:stop]: the value with
+        NaN skipped, and the position of its first occurrence. An empty,
+        out-of-bounds or all-NaN range gives (NaN, -1). start/stop may be
+        ints or equal-length arrays; with a 2-D x the result is (rows, m)."""
+        scalar = np.ndim(start) == 0 and np.ndim(stop) == 0
+        start = np.atleast_1d(np.asarray(start, dtype=np.intp))
+        stop = np.atleast_1d(np.asarray(stop, dtype=np.intp))
+        start, stop = np.broadcast_arrays(start, stop)
+        k, left, right, ok = self._blocks(start, stop)
+        self._grow(int(k.max()) if len(k) else 0)
+
+        key_l, key_r = self._keys[k, left], self._keys[k, right]
+        take_right = key_r > key_l
+        best = np.where(take_right, key_r, key_l)
+        ok = ok.reshape(ok.shape + (1,) * (best.ndim - 1)) & (best > -np.inf)   # not all NaN
+        value = np.moveaxis(np.where(ok, self._sign * best, np.nan), 0, -1)
+        pos = np.where(take_right, self._pos[k, right], self._pos[k, left])
+        pos = np.moveaxis(np.where(ok, pos, -1), 0, -1)
+        if scalar:
+            return value[..., 0][()], pos[..., 0][()]
+        return value, pos
+
+    def value(self, start, stop):
+        """The extreme of x[start:stop] (see extreme())."""
+        return self.extreme(start, stop)[0]
+
+    def arg(self, start, stop):
+        """Position of the extreme of x[start:stop] (see extreme())."""
+        return self.extreme(start, stop)[1]
+
+    def rolling(self, window: int, shift: int = 0) -> np.ndarray:
+        """rolling(window).max() (or .min()).shift(shift) along the last axis:
+        NaN until the window fills, and for any window containing NaN.
+
+        Every window has the same length, so only the levels up to that
+        length are needed. They are built here with NaN-propagating
+        maximum / minimum, without positions and without the full table.
+        """
+        reduce = np.maximum if self.op == 'max' else np.minimum
+        out = np.full(self.x.shape, np.nan)
+        n_windows = self.n - window + 1 - shift
+        if window < 1 or n_windows <= 0:
+            return out
+        level, span = self.x, 1
+        while 2 * span <= window:
+            level = reduce(level[..., :-span], level[..., span:])
+            span *= 2
+        out[..., window - 1 + shift:] = reduce(level[..., :n_windows],
+                                               level[..., window - span:window - span + n_windows])
+        return out
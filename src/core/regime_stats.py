@@ -0,0 +1,143 @@
+"""Point-in-time regime stats for a walk through history.
+
+check_trinity_setup / check_panic_setup / check_donchian_setup score a bar
+with backtest_regime_performance(df_context), where df_context is the
+history up to that bar. A backtest that walks a ticker day by day would
+re-simulate the whole prefix on every bar, which is quadratic in history
+length.
+
+RegimeStatsAccumulator simulates each signal once over the full history
+(regime_signal_trades). A trade entered on bar i that resolves on bar h
+counts toward the stats at bar t exactly when h <= t. Before that it is
+still a hold at t, and holds are left out of the win rates. So advancing
+from t to t+1 only adds the trades that resolve on t+1, and drops trades
+whose entry fell out of the 14-day recent-decay window. stats() then
+returns the dict backtest_regime_performance(df.iloc[:t+1], ...) would.
+"""
+from __future__ import annotations
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.core.indicators import (REGIME_BUCKETS, RECENT_DECAY_DAYS, regime_signal_trades,
+                                     regime_stats_from_counts)
+    from src.core.outcomes import OUTCOME_WIN
+except ImportError:
+    from core.indicators import (REGIME_BUCKETS, RECENT_DECAY_DAYS, regime_signal_trades,
+                                 regime_stats_from_counts)
+    from core.outcomes import OUTCOME_WIN
+
+
+class RegimeStatsAccumulator:
+    """backtest_regime_performance(df.iloc[:t+1], strategy_type, params) for
+    a non-decreasing sequence of bar positions t, in O(1) amortized per bar.
+
+    >>> acc = RegimeStatsAccumulator(df, 'trinity')
+    >>> for t in range(len(df)):
+    ...     stats = acc.at(t)
+    """
+
+    def __init__(self, df, strategy_type, params=None):
+        entries, outcome, exit_idx = regime_signal_trades(df, strategy_type, params)
+        self.t = -1
+
+        # Holds never resolve; the rest are replayed in resolution order.
+        decided = exit_idx >= 0
+        order = np.argsort(exit_idx[decided], kind='stable')
+        self._exits = exit_idx[decided][order]
+        self._entries = entries[decided][order]
+        self._wins = outcome[decided][order] == OUTCOME_WIN
+        regime = df['Regime'].to_numpy()[self._entries]
+        self._in_bucket = {b: regime == label for b, label in REGIME_BUCKETS}
+        self._exit = self._exits.tolist()
+        self._entry = self._entries.tolist()
+        self._win = self._wins.tolist()
+        buckets = {label: b for b, label in REGIME_BUCKETS}
+        self._bucket = [buckets.get(r) for r in regime]
+        self._next = 0
+
+        # First bar inside the recent-decay window ending at each bar.
+        dates = df.index
+        self._recent_start = dates.searchsorted(dates - pd.Timedelta(days=RECENT_DECAY_DAYS), side='left')
+
+        self._counts = {'total': [0, 0], **{b: [0, 0] for b, _ in REGIME_BUCKETS}}
+        self._recent = [0, 0]
+        self._recent_heap = []        # (entry, win) of resolved trades in the window
+        self._stats = None
+
+    def advance(self, t: int) -> None:
+        """Move the point in time forward to bar t."""
+        if t < self.t:
+            raise ValueError(f"RegimeStatsAccumulator cannot go back from bar {self.t} to {t}")
+        if t == self.t:
+            return
+        self.t = t
+
+        start = int(self._recent_start[t])
+        while self._recent_heap and self._recent_heap[0][0] < start:
+            _, win = heapq.heappop(self._recent_heap)
+            self._recent[0] -= win
+            self._recent[1] -= 1
+            self._stats = None
+
+        while self._next < len(self._exit) and self._exit[self._next] <= t:
+            k = self._next
+            win = int(self._win[k])
+            for bucket in ('total', self._bucket[k]):
+                if bucket is not None:
+                    self._counts[bucket][0] += win
+                    self._counts[bucket][1] += 1
+            if self._entry[k] >= start:
+                heapq.heappush(self._recent_heap, (self._entry[k], win))
+                self._recent[0] += win
+                self._recent[1] += 1
+            self._next += 1
+            self._stats = None
+
+    def stats(self) -> dict:
+        """Stats as of the current bar. The dict is shared between calls
+        until the stats change, so treat it as read-only."""
+        # No resolved trades (or none recent) gives all-zero buckets and no
+        # decay, the same dict backtest_regime_performance returns when the
+        # prefix has no signals at all.
+        if self._stats is None:
+            counts = {b: tuple(c) for b, c in self._counts.items()}
+            self._stats = regime_stats_from_counts(counts, tuple(self._recent))
+        return self._stats
+
+    def at(self, t: int) -> dict:
+        self.advance(t)
+        return self.stats()
+
+    def stats_at(self, positions) -> list:
+        """[at(t) for t in positions] in one pass, for any bar positions and
+        without moving the accumulator. Bars whose counts are the same share
+        one (read-only) dict."""
+        t = np.asarray(positions, dtype=np.intp)
+        # Trades in exit order, so the ones resolved by t are a prefix.
+        resolved = np.searchsorted(self._exits, t, side='right')
+
+        def prefix(mask):
+            cum = np.concatenate(([0], np.cumsum(mask)))
+            return cum[resolved]
+
+        columns = [prefix(self._wins), resolved]
+        for bucket, _ in REGIME_BUCKETS:
+            columns += [prefix(self._wins & self._in_bucket[bucket]), prefix(self._in_bucket[bucket])]
+        # Resolved trades entered inside each bar's recent-decay window.
+        recent = ((np.arange(len(self._exits)) < resolved[:, None])
+                  & (self._entries >= self._recent_start[t][:, None]))
+        columns += [np.count_nonzero(recent & self._wins, axis=1), np.count_nonzero(recent, axis=1)]
+
+        names = ['total'] + [b for b, _ in REGIME_BUCKETS]
+        out, cache = [], {}
+        for row in zip(*(c.tolist() for c in columns)):
+            stats = cache.get(row)
+            if stats is None:
+                counts = {name: row[2 * k:2 * k + 2] for k, name in enumerate(names)}
+                stats = cache[row] = regime_stats_from_counts(counts, row[-2:])
+            out.append(stats)
+        return out
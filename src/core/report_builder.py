@@ -10,12 +10,14 @@ from datetime import datetime, timezone
 from typing import Iterable
 
 try:
-    from src.config import PRESET_WATCHLISTS, STRATEGY_EDGE_STATS
+    from src.config import PRESET_WATCHLISTS
+    from src.core.edge_stats import load_edge_stats
     from src.core.fed_calendar import format_calendar_block
     from src.core.market_analysis import format_market_block
     from src.core.news import format_news_lines
 except ImportError:
-    from config import PRESET_WATCHLISTS, STRATEGY_EDGE_STATS
+    from config import PRESET_WATCHLISTS
+    from core.edge_stats import load_edge_stats
     from core.fed_calendar import format_calendar_block
     from core.market_analysis import format_market_block
     from core.news import format_news_lines
@@ -81,7 +83,7 @@ _REGIME_CN = {
 
 
 def _normalize_strategy(strategy: str) -> str:
-    """Normalize free-form strategy strings to STRATEGY_EDGE_STATS keys."""
+    """Normalize free-form strategy strings to edge-stats keys."""
     s = (strategy or "").lower().strip()
     if s in ("2b", "2b reversal", "2b_reversal", "2b-reversal"):
         return "2b_reversal"
@@ -130,12 +132,13 @@ def _signal_side(signal: dict) -> str:
 def classify_signal(signal: dict) -> tuple[str, str | None]:
     """Return (verdict, reason). verdict ∈ {TAKE, WATCH, SKIP}."""
     strategy_key = _normalize_strategy(signal.get("strategy", ""))
-    edge = STRATEGY_EDGE_STATS.get(strategy_key, {}).get("edge")
+    edge_stats = load_edge_stats()
+    edge = edge_stats.get(strategy_key, {}).get("edge")
     confidence = signal.get("confidence", 0) or 0
     stats = signal.get("stats") or {}
 
     if edge == "negative":
-        stat = STRATEGY_EDGE_STATS[strategy_key]
+        stat = edge_stats[strategy_key]
         return "SKIP", f"負期望值策略 (3年 ${stat['avg_pnl']}/筆)"
 
     if stats.get("recent_decay"):
@@ -224,7 +227,7 @@ def _regime_summary(signals: Iterable[dict]) -> str:
 
 def _strategy_edge_block() -> str:
     lines = ["📊 *策略邊際*  _(3年 AI 標的池)_"]
-    for key, stat in STRATEGY_EDGE_STATS.items():
+    for key, stat in load_edge_stats().items():
         name = STRATEGY_DISPLAY.get(key, key)
         mark = STRATEGY_EDGE_LABEL.get(stat["edge"], "·")
         pnl = stat["avg_pnl"]
@@ -0,0 +1,116 @@
+"""2B reversals over a ticker's whole history.
+
+check_2b_setup decides one bar from the context before it: the extreme
+High/Low of an older window (lookback_max .. exclude_recent bars back), a
+false breakout of it within the last 3 bars, and a momentum filter (RSI
+divergence against the bar that set the level, or a shrinking MACD
+histogram). detect_2b_reversals() does the same for every bar at once. The
+window extremes and their positions are range queries on a SparseTable
+(core.range_query), and the RSI at each extreme is gathered from those
+positions.
+
+The result matches check_2b_setup bar for bar. Range extremes skip NaN like
+pandas' max / idxmax, and ties go to the first (oldest) bar as idxmax does.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    from src.config import STRATEGY_PARAMS
+    from src.core.range_query import SparseTable
+except ImportError:
+    from config import STRATEGY_PARAMS
+    from core.range_query import SparseTable
+
+RR_MULTIPLE = 3  # 2B targets a fixed 1:3 reward:risk
+
+
+@dataclass
+class TwoBReversals:
+    """Per-bar 2B result. Everything except `signal` is only meaningful where
+    `signal` is True."""
+    signal: np.ndarray          # bool: a 2B that passed the momentum filter
+    bearish: np.ndarray         # bool: Bearish 2B (short); else Bullish (long)
+    key_level: np.ndarray       # the prior high / low that was faked out
+    stop: np.ndarray            # unrounded stop beyond the breakout wick
+    take_profit: np.ndarray     # unrounded 3R target
+    divergence: np.ndarray      # bool: RSI diverged from the level's bar
+    macd_shrinking: np.ndarray  # bool: |MACD_Hist| below yesterday's
+    wide_stop: np.ndarray       # bool: stop further than sl_limit_pct away
+
+    @property
+    def high_rating(self) -> np.ndarray:
+        return self.divergence & self.macd_shrinking & ~self.wide_stop
+
+    def rating(self, i: int) -> str:
+        if self.wide_stop[i]:
+            return "Low (Wide Stop)"
+        return "High" if self.divergence[i] and self.macd_shrinking[i] else "Medium"
+
+
+def _lag(x, n):
+    return np.concatenate((np.full(n, np.nan), x[:-n]))
+
+
+def detect_2b_reversals(df, params=None) -> TwoBReversals:
+    """Every bar of df where check_2b_setup(df.iloc[i], df.iloc[:i+1])
+    would fire, with its side, key level, momentum flags and trade levels."""
+    cfg = params if params else STRATEGY_PARAMS['2B']
+    lookback_min = cfg.get('lookback_min', 20)
+    lookback_max = cfg.get('lookback_max', 60)
+    sl_limit = cfg.get('sl_limit_pct', 0.05)
+    exclude_recent = max(5, lookback_min // 4)
+
+    def col(name):
+        if name not in df.columns:
+            return np.full(len(df), np.nan)
+        return df[name].to_numpy(dtype=float)
+
+    price, high, low = col('Close'), col('High'), col('Low')
+    rsi, macd_hist = col('RSI_14'), col('MACD_Hist')
+    regime = df['Regime'].to_numpy() if 'Regime' in df.columns else np.full(len(df), 'Unknown', dtype=object)
+
+    highs, lows = SparseTable(high, 'max'), SparseTable(low, 'min')
+    bar = np.arange(len(df))
+
+    # Key levels and where they were set, from the window lookback_max ..
+    # exclude_recent bars back. Bars with less history than that get none.
+    start = np.where(bar >= lookback_max, bar - lookback_max, -1)
+    prev_high, high_pos = highs.extreme(start, bar - exclude_recent)
+    prev_low, low_pos = lows.extreme(start, bar - exclude_recent)
+    prev_high_rsi = np.where(high_pos >= 0, rsi[high_pos], np.nan)
+    prev_low_rsi = np.where(low_pos >= 0, rsi[low_pos], np.nan)
+
+    # False breakouts within the last 3 bars that closed back inside. fmax /
+    # fmin skip NaN like the range queries do.
+    recent_high = np.fmax(np.fmax(high, _lag(high, 1)), _lag(high, 2))
+    recent_low = np.fmin(np.fmin(low, _lag(low, 1)), _lag(low, 2))
+    recent_high[:2] = recent_low[:2] = np.nan     # fewer than 3 bars
+    bearish = (recent_high > prev_high) & (price < prev_high) & (regime != 'Bull')
+    bullish = (recent_low < prev_low) & (price > prev_low) & (regime != 'Bear')
+
+    # Both on one bar: keep the side that broke further past its level.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bear_dist = np.where(prev_high > 0, (recent_high - prev_high) / prev_high, 0)
+        bull_dist = np.where(prev_low > 0, (prev_low - recent_low) / prev_low, 0)
+    both = bearish & bullish
+    bullish &= ~(both & (bear_dist >= bull_dist))
+    bearish &= ~(both & (bear_dist < bull_dist))
+
+    key_level = np.where(bearish, prev_high, prev_low)
+    stop = np.where(bearish, recent_high * 1.005, recent_low * 0.995)  # just beyond the wick
+    divergence = np.where(bearish, rsi < prev_high_rsi, rsi > prev_low_rsi)
+    prev_hist = np.concatenate(([np.nan], macd_hist[:-1]))
+    macd_shrinking = np.abs(macd_hist) < np.abs(prev_hist)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        risk = np.abs(price - stop)
+        wide_stop = risk / price > sl_limit
+    take_profit = np.where(bearish, price - (risk * RR_MULTIPLE), price + (risk * RR_MULTIPLE))
+
+    signal = (bearish | bullish) & (divergence | macd_shrinking)
+    return TwoBReversals(signal, bearish, key_level, stop, take_profit,
+                         divergence, macd_shrinking, wide_stop)
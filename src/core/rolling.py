@@ -0,0 +1,90 @@
+"""Rolling median for the ATR_MEDIAN_{n} column, shared by the panel
+(whole-universe) and streaming indicator paths.
+
+rolling_median() runs pandas' rolling median, which slides a sorted window
+(a skiplist, in compiled code) one bar at a time, so each step costs
+O(log window) instead of re-sorting the window. A 2-D (ticker, date) matrix
+goes through in one call with tickers as columns, rather than one Series per
+ticker or a median over a strided (ticker, date, window) copy. The values are
+by construction those of Series.rolling(window).median(): a window containing
+NaN gives NaN, as does every position before the window fills.
+
+A sorted window or two-heap written in numpy or Python is slower than that
+skiplist at every size we run; benchmarks/rolling_median.py has the numbers.
+
+RollingMedian is the one-bar-at-a-time form for IndicatorEngine. It keeps
+the last window-1 values in arrival order plus a sorted copy.
+"""
+from __future__ import annotations
+
+import bisect
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+
+
+def _isnan(x) -> bool:
+    return x is None or x != x
+
+
+def rolling_median(x, window: int) -> np.ndarray:
+    """rolling(window).median() along the last axis of a 1-D series or a
+    2-D (row, time) matrix."""
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        return pd.Series(x).rolling(window=window).median().to_numpy()
+    return pd.DataFrame(x.T).rolling(window=window).median().to_numpy().T
+
+
+class RollingMedian:
+    """rolling(window).median() ending at the peeked value. Keeps the last
+    window-1 committed values in arrival order plus a sorted copy; a window
+    containing NaN yields NaN, as in pandas."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.sorted = []
+        self.nans = 0
+
+    def peek(self, x) -> float:
+        if len(self.values) < self.window - 1 or self.nans or _isnan(x):
+            return NAN
+        s, p = self.sorted, bisect.bisect_left(self.sorted, x)
+
+        def kth(k):
+            return s[k] if k < p else x if k == p else s[k - 1]
+
+        n = self.window
+        if n % 2:
+            return kth(n // 2)
+        return (kth(n // 2 - 1) + kth(n // 2)) / 2
+
+    def push(self, x):
+        self.values.append(x)
+        if _isnan(x):
+            self.nans += 1
+        else:
+            bisect.insort(self.sorted, x)
+        if len(self.values) > self.window - 1:
+            y = self.values.popleft()
+            if _isnan(y):
+                self.nans -= 1
+            else:
+                del self.sorted[bisect.bisect_left(self.sorted, y)]
+
+    def state(self):
+        return {'values': list(self.values)}
+
+    def load(self, s):
+        self.values = deque()
+        self.sorted, self.nans = [], 0
+        for x in s['values']:
+            self.values.append(x)
+            if _isnan(x):
+                self.nans += 1
+            else:
+                bisect.insort(self.sorted, x)
@@ -1,24 +1,40 @@
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from src.core.data_fetcher import fetch_data
-from src.core.indicators import calculate_indicators, check_trinity_setup, check_panic_setup, check_2b_setup, check_donchian_setup
+from src.core.data_fetcher import fetch_data, fetch_many
+from src.core.indicators import (calculate_indicators, check_trinity_setup, check_panic_setup, check_2b_setup,
+                                 check_donchian_setup, strategy_columns, strategy_key)
+from src.core.panel import build_panel
+from src.core.panel_indicators import calculate_panel_indicators
 
 # Configure Logger
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
-def process_ticker(ticker):
+# Panel prefilter thresholds. $5 matches the backtester's entry floor; 20
+# bars is the shortest warm-up any strategy needs (BB/RSI/RVOL).
+PREFILTER_MIN_PRICE = 5.0
+PREFILTER_MIN_BARS = 20
+
+def process_ticker(ticker, df=None, has_indicators=False, strategies=None):
     """
     Worker function to process a single ticker.
     Returns a candidate dict if a strategy matches, else None.
+
+    `df` lets scan_market hand in bars it already batch-fetched; when omitted
+    the ticker is fetched on its own. `has_indicators` marks a df that already
+    carries the calculate_indicators columns (see universe_indicators).
+    `strategies` (e.g. a user's enabled list) limits both the checks that run
+    and the indicators computed for them; None runs everything.
     """
     try:
-        df = fetch_data(ticker)
+        if df is None:
+            df = fetch_data(ticker)
         if df is None:
             return None
             
         # Calc Indicators
-        df = calculate_indicators(df)
+        if not has_indicators:
+            df = calculate_indicators(df, columns=strategy_columns(strategies))
         
         # Get latest row
         latest = df.iloc[-1]
@@ -35,7 +51,16 @@ def process_ticker(ticker):
             "2b_reversal": "🔄 FOUND 2B REVERSAL",
             "donchian": "🚀 FOUND DONCHIAN",
         }
-        for fn in (check_trinity_setup, check_panic_setup, check_2b_setup, check_donchian_setup):
+        checks = {
+            "TRINITY": check_trinity_setup,
+            "PANIC": check_panic_setup,
+            "2B": check_2b_setup,
+            "DONCHIAN": check_donchian_setup,
+        }
+        if strategies:
+            enabled = {strategy_key(s) for s in strategies}
+            checks = {k: fn for k, fn in checks.items() if k in enabled}
+        for fn in checks.values():
             try:
                 res = fn(latest, df)
             except Exception as e:
@@ -59,16 +84,67 @@ def process_ticker(ticker):
         logger.error(f"Error processing {ticker}: {e}")
         return None
 
-def scan_market(tickers, max_workers=10):
+def universe_indicators(frames, columns=None):
+    """
+    calculate_indicators for every frame at once, via one vectorized panel
+    pass (core/panel_indicators.py) instead of per-ticker pandas work in the
+    worker threads. Returns {ticker: df with indicator columns}, or None if
+    the panel pass fails — callers then fall back to per-ticker indicators.
+    """
+    try:
+        return calculate_panel_indicators(build_panel(frames), columns=columns).frames()
+    except Exception as e:
+        logger.error(f"Panel indicator pass failed, computing per ticker: {e}")
+        return None
+
+def prefilter_tickers(panel, tickers=None, min_price=PREFILTER_MIN_PRICE, min_bars=PREFILTER_MIN_BARS):
+    """
+    Drop tickers a universe panel already shows can't produce a candidate:
+    too little history, last close under `min_price`, or no bar on the
+    panel's most recent date (halted / delisted). Works on the panel arrays
+    directly, so it costs nothing per ticker. Tickers missing from the panel
+    are kept — no data is not a reason to skip them.
+    """
+    tickers = list(panel.tickers if tickers is None else tickers)
+    if not len(panel.dates):
+        return tickers
+
+    valid = panel.valid
+    ok = (valid.sum(axis=1) >= min_bars) & valid[:, -1] & (panel.last_valid('Close') >= min_price)
+    return [t for t in tickers if t not in panel or ok[panel.ticker_index(t)]]
+
+def scan_market(tickers, max_workers=10, panel=None, strategies=None):
     """
     Scans a list of tickers for strategy matches concurrently.
+
+    If a universe `panel` is given, tickers it rules out are dropped before
+    anything is fetched (see prefilter_tickers). `strategies` restricts the
+    scan to those strategies and the indicators they need.
     """
     candidates = []
-    
+
+    if panel is not None:
+        kept = prefilter_tickers(panel, tickers)
+        if len(kept) < len(tickers):
+            logger.info(f"Prefilter dropped {len(tickers) - len(kept)} of {len(tickers)} assets.")
+        tickers = kept
+
     logger.info(f"🔍 Scanning {len(tickers)} assets...")
-    
+
+    # One chunked bulk download for the whole universe; the worker threads
+    # then only do indicator + strategy work.
+    batch = fetch_many(tickers)
+    for t, reason in batch.failures.items():
+        logger.error(f"Error fetching {t}: {reason}")
+
+    with_indicators = universe_indicators(batch.frames, columns=strategy_columns(strategies))
+    frames = with_indicators if with_indicators is not None else batch.frames
+
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_ticker = {executor.submit(process_ticker, t): t for t in tickers}
+        future_to_ticker = {
+            executor.submit(process_ticker, t, frames[t], with_indicators is not None, strategies): t
+            for t in tickers if t in frames
+        }
         
         for future in as_completed(future_to_ticker):
             try:
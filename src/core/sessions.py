@@ -0,0 +1,90 @@
+"""US equity session boundaries for the daily-bar caches.
+
+The bar store (and anything else that caches daily OHLCV) is only stale once
+a new session has closed, so freshness is keyed to the most recent 16:00 ET
+close rather than a wall-clock TTL. Exchange holidays are not modelled — on a
+holiday the worst case is one redundant top-up request after 16:00.
+
+Crypto pairs (yfinance '-USD' symbols) trade around the clock and have no
+session close, so their caches fall back to a wall-clock TTL.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+MARKET_TZ = ZoneInfo("America/New_York")
+SESSION_OPEN = time(9, 30)
+SESSION_CLOSE = time(16, 0)
+
+# yfinance-style period strings with a fixed length. 'ytd' / 'max' are not
+# matched and callers treat them as "ask the provider as-is".
+PERIOD_RE = re.compile(r'(\d+)(d|mo|y)')
+
+
+def market_now(now: Optional[datetime] = None) -> datetime:
+    """Current time in exchange-local time. `now` overrides (for tests)."""
+    if now is None:
+        return datetime.now(MARKET_TZ)
+    return now.astimezone(MARKET_TZ)
+
+
+def trades_around_the_clock(ticker: str) -> bool:
+    """True for symbols with no session (crypto pairs like BTC-USD)."""
+    return (ticker or "").upper().endswith("-USD")
+
+
+def is_session_open(now: Optional[datetime] = None) -> bool:
+    """True during regular trading hours on a weekday."""
+    n = market_now(now)
+    return n.weekday() < 5 and SESSION_OPEN <= n.time() < SESSION_CLOSE
+
+
+def last_session_close(now: Optional[datetime] = None) -> datetime:
+    """Timestamp of the most recent completed session close (16:00 ET).
+
+    Before today's close (or on a weekend) this walks back to the previous
+    weekday, so a Monday-morning call returns Friday 16:00.
+    """
+    n = market_now(now)
+    d = n.date()
+    if n.weekday() >= 5 or n.time() < SESSION_CLOSE:
+        d -= timedelta(days=1)
+    while d.weekday() >= 5:
+        d -= timedelta(days=1)
+    return datetime.combine(d, SESSION_CLOSE, tzinfo=MARKET_TZ)
+
+
+def period_start(period: str, anchor) -> Optional[pd.Timestamp]:
+    """Earliest date a `period` request ending at `anchor` needs, or None for
+    periods without a fixed length. Day periods count trading days, so the
+    calendar span is padded for weekends/holidays."""
+    m = PERIOD_RE.fullmatch(period or "")
+    if not m:
+        return None
+    n, unit = int(m.group(1)), m.group(2)
+    anchor = pd.Timestamp(anchor).normalize()
+    if unit == 'd':
+        return anchor - pd.Timedelta(days=2 * n + 5)
+    if unit == 'mo':
+        return anchor - pd.DateOffset(months=n)
+    return anchor - pd.DateOffset(years=n)
+
+
+def slice_period(df, period: str, anchor):
+    """Trim a longer daily series down to what a `period` request ending at
+    `anchor` would return. Day periods are the last N bars."""
+    m = PERIOD_RE.fullmatch(period)
+    n, unit = int(m.group(1)), m.group(2)
+    if unit == 'd':
+        return df.iloc[-n:]
+    start = period_start(period, anchor)
+    if df.index.tz is None:
+        start = start.tz_localize(None)
+    elif start.tzinfo is None:
+        start = start.tz_localize(df.index.tz)
+    return df[df.index >= start]
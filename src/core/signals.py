@@ -0,0 +1,153 @@
+"""Whole-history entry signals for the backtester.
+
+check_trinity_setup / check_panic_setup / check_donchian_setup /
+check_2b_setup decide one bar at a time from a row. strategy_signals() evaluates the same entry
+conditions for every bar of a ticker at once and returns, per strategy, a
+boolean signal array plus the trade plan for each signalling bar: stop,
+target, side, and the per-bar inputs to the confidence score. The
+backtester's day loop then only indexes into these arrays.
+
+The masks reproduce the scalar checks bar for bar, including their NaN
+behaviour. A failed `price <= level` guard lets a NaN through, and the
+following checks then reject it. The checks round numpy scalars, which is
+np.round, so the plan arrays hold the exact floats they return.
+Confidence still depends on the point-in-time regime stats
+(core.regime_stats), so it is scored with the same *_confidence helpers
+when a signal is actually considered.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+try:
+    from src.config import STRATEGY_PARAMS
+    from src.core.indicators import (donchian_confidence, panic_confidence, trinity_confidence,
+                                     two_b_confidence)
+    from src.core.reversal import detect_2b_reversals
+except ImportError:
+    from config import STRATEGY_PARAMS
+    from core.indicators import (donchian_confidence, panic_confidence, trinity_confidence,
+                                 two_b_confidence)
+    from core.reversal import detect_2b_reversals
+
+
+@dataclass
+class StrategySignals:
+    """One strategy's entries over a ticker's history. Plan values are only
+    meaningful where `signal` is True."""
+    key: str                       # STRATEGY_PARAMS key, e.g. 'TRINITY'
+    strategy: str                  # the check_*_setup result's "strategy"
+    signal: np.ndarray             # bool per bar
+    stop_loss: np.ndarray
+    take_profit: np.ndarray
+    side: Union[str, np.ndarray] = "LONG"          # or a per-bar array of sides
+    score: Optional[Callable[..., int]] = None   # (stats, *inputs) -> confidence
+    inputs: tuple = field(default_factory=tuple)  # per-bar arrays passed to score
+    uses_stats: bool = True                        # False: score ignores the stats
+
+    def confidence(self, i: int, stats: dict) -> int:
+        return self.score(stats, *(x[i] for x in self.inputs))
+
+    def side_at(self, i: int) -> str:
+        return self.side if isinstance(self.side, str) else self.side[i]
+
+    def plan(self, i: int) -> dict:
+        return {"stop_loss": self.stop_loss[i], "take_profit": self.take_profit[i]}
+
+
+def _columns(df):
+    def col(name):
+        if name not in df.columns:
+            return np.full(len(df), np.nan)
+        return df[name].to_numpy(dtype=float)
+    return col
+
+
+def trinity_signals(df, params=None) -> StrategySignals:
+    config = params if params else STRATEGY_PARAMS['TRINITY']
+    col = _columns(df)
+    price, sma200, ema50, rsi, atr = col('Close'), col('SMA_200'), col('EMA_50'), col('RSI_14'), col('ATR_14')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dist = (price - ema50) / ema50
+    signal = (~np.isnan(sma200) & ~np.isnan(ema50) & ~np.isnan(rsi) & ~np.isnan(atr)
+              & ~(price <= sma200)
+              & (config.get('dist_to_ema_min', -0.015) <= dist) & (dist <= config.get('dist_to_ema_max', 0.03))
+              & (config.get('rsi_min', 40) <= rsi) & (rsi <= config.get('rsi_max', 60)))
+
+    # Same plan as check_trinity_setup: the looser of the 2-ATR stop and
+    # SMA200, target at 2R.
+    atr_stop = np.round(price - (2.0 * atr), 2)
+    clamped = sma200 < atr_stop
+    stop_loss = np.where(clamped, np.round(np.minimum(atr_stop, sma200), 2), atr_stop)
+    take_profit = np.round(price + ((price - stop_loss) * 2), 2)
+    return StrategySignals('TRINITY', 'trinity', signal, stop_loss, take_profit, score=trinity_confidence)
+
+
+def panic_signals(df, params=None) -> StrategySignals:
+    config = params if params else STRATEGY_PARAMS['PANIC']
+    col = _columns(df)
+    price, bbl, rsi, rvol, atr = col('Close'), col('BBL_20_2.0'), col('RSI_14'), col('RVOL'), col('ATR_14')
+
+    signal = (~np.isnan(bbl) & ~np.isnan(rsi) & ~np.isnan(rvol) & ~np.isnan(atr)
+              & ~(price >= bbl)
+              & ~(rsi >= config.get('rsi_oversold', 30))
+              & ~(rvol < config.get('rvol_min', 1.2)))
+
+    stop_loss = np.round(price - (1.0 * atr), 2)
+    take_profit = np.round(price + (3.0 * atr), 2)
+    return StrategySignals('PANIC', 'panic', signal, stop_loss, take_profit, score=panic_confidence)
+
+
+def donchian_signals(df, params=None) -> StrategySignals:
+    config = params if params else STRATEGY_PARAMS['DONCHIAN']
+    lookback = config.get('lookback', 55)
+    atr_med_win = config.get('atr_median_window', 100)
+    col = _columns(df)
+    price, sma200, atr = col('Close'), col('SMA_200'), col('ATR_14')
+    donchian_high, atr_median = col(f'DONCHIAN_HIGH_{lookback}'), col(f'ATR_MEDIAN_{atr_med_win}')
+
+    signal = (~np.isnan(donchian_high) & ~np.isnan(sma200) & ~np.isnan(atr) & ~np.isnan(atr_median)
+              & ~(price <= donchian_high))
+    if config.get('require_uptrend', True):
+        signal &= ~(price <= sma200)
+    if config.get('require_vol_expansion', True):
+        signal &= ~(atr <= atr_median)
+
+    stop_loss = np.round(price - (config.get('sl_atr_mult', 2.0) * atr), 2)
+    take_profit = np.round(price + (config.get('tp_atr_mult', 4.0) * atr), 2)
+    strong_breakout = (price - donchian_high) > atr
+    regime = df['Regime'].to_numpy() if 'Regime' in df.columns else np.full(len(df), 'Unknown', dtype=object)
+    return StrategySignals('DONCHIAN', 'donchian', signal, stop_loss, take_profit,
+                           score=donchian_confidence, inputs=(strong_breakout, regime))
+
+
+def two_b_signals(df, params=None) -> StrategySignals:
+    bars = detect_2b_reversals(df, params)
+    return StrategySignals('2B', '2B_Reversal', bars.signal,
+                           np.round(bars.stop, 2), np.round(bars.take_profit, 2),
+                           side=np.where(bars.bearish, "SHORT", "LONG").astype(object),
+                           score=two_b_confidence, inputs=(bars.high_rating,), uses_stats=False)
+
+
+SIGNAL_BUILDERS = {
+    'TRINITY': trinity_signals,
+    'PANIC': panic_signals,
+    '2B': two_b_signals,
+    'DONCHIAN': donchian_signals,
+}
+
+
+def strategy_signals(df, strategies: Iterable[str],
+                     strategy_params: Optional[Dict[str, dict]] = None) -> List[StrategySignals]:
+    """Signals for each of `strategies` (STRATEGY_PARAMS keys) that has a
+    vectorized builder, in the order given."""
+    out = []
+    for key in strategies:
+        build = SIGNAL_BUILDERS.get(key)
+        if build is not None:
+            out.append(build(df, params=(strategy_params or {}).get(key)))
+    return out
@@ -7,14 +7,17 @@ small-sample lucky streaks from inflating signal quality scores.
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 
 
+@lru_cache(maxsize=65536)
 def wilson_score_interval(wins: int, total: int, z: float = 1.96) -> tuple[float, float]:
     """Return Wilson score 95% CI as (low_pct, high_pct) on [0, 100].
 
     Falls back to (0, 0) when total <= 0. Otherwise the bounds are clamped
     to [0, 100] (Wilson can overshoot under floating-point error at the
-    extremes wins==0 / wins==total).
+    extremes wins==0 / wins==total). Results are cached: regime stats ask
+    for the same few (wins, total) pairs over and over.
     """
     if total <= 0:
         return (0.0, 0.0)
@@ -0,0 +1,361 @@
+"""Incremental indicator engine — the calculate_indicators columns, one bar
+at a time.
+
+calculate_indicators recomputes every column over the whole frame. For
+callers that only ever need the newest values (the tracker's polling loop,
+intraday refreshes), IndicatorEngine keeps running state instead. It is
+seeded once from history, and each new bar then costs O(1) per indicator.
+The ATR median is the exception: it keeps a sorted window (see
+core.rolling.RollingMedian), so its cost is bounded by the window length.
+
+The engine separates *committed* bars from the *pending* one. Feeding a bar
+whose label equals the last one replaces the pending bar (a partial session
+re-polled intraday) instead of appending it. A bar is only folded into the
+running state once a later label arrives. That is why every component below
+has both `peek(x)` (values as if x were appended, with no mutation) and
+`push(x)` (commit).
+
+Values match calculate_indicators up to float rounding. The rolling sums are
+updated incrementally rather than re-summed, so they differ in the last few
+ulps. State round-trips through to_dict()/from_dict() as plain JSON types,
+so a tracker or scanner can resume without replaying years of bars.
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+try:
+    from src.config import STRATEGY_PARAMS
+    from src.core.rolling import RollingMedian
+except ImportError:
+    from config import STRATEGY_PARAMS
+    from core.rolling import RollingMedian
+
+NAN = float('nan')
+STATE_VERSION = 1
+
+
+def _isnan(x) -> bool:
+    return x is None or x != x
+
+
+class _EMA:
+    """pandas ewm(alpha, adjust=False, min_periods) recursion."""
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = NAN
+        self.count = 0
+
+    def _next(self, x):
+        if self.count == 0:
+            return x
+        return (1 - self.alpha) * self.value + self.alpha * x
+
+    def peek(self, x) -> float:
+        v = self._next(x)
+        return v if self.count + 1 >= self.min_periods else NAN
+
+    def push(self, x):
+        self.value = self._next(x)
+        self.count += 1
+
+    def state(self):
+        return {'value': self.value, 'count': self.count}
+
+    def load(self, s):
+        self.value, self.count = s['value'], s['count']
+
+
+class _RollingMoments:
+    """Rolling mean / sample std over `window` values ending at the peeked one.
+
+    Holds the last window-1 committed values with Welford mean/M2, updated
+    on add and remove (the same scheme pandas' rolling var uses).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @staticmethod
+    def _add(n, mean, m2, x):
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+        return n, mean, m2
+
+    def peek(self, x):
+        """(mean, std) of the window ending at x, NaN until it is full."""
+        if len(self.values) < self.window - 1:
+            return NAN, NAN
+        n, mean, m2 = self._add(len(self.values), self.mean, self.m2, x)
+        std = math.sqrt(max(m2, 0.0) / (n - 1)) if n > 1 else NAN
+        return mean, std
+
+    def push(self, x):
+        _, self.mean, self.m2 = self._add(len(self.values), self.mean, self.m2, x)
+        self.values.append(x)
+        if len(self.values) > self.window - 1:
+            y = self.values.popleft()
+            n = len(self.values)
+            if n == 0:
+                self.mean, self.m2 = 0.0, 0.0
+            else:
+                delta = y - self.mean
+                self.mean -= delta / n
+                self.m2 -= delta * (y - self.mean)
+
+    def state(self):
+        return {'values': list(self.values), 'mean': self.mean, 'm2': self.m2}
+
+    def load(self, s):
+        self.values = deque(s['values'])
+        self.mean, self.m2 = s['mean'], s['m2']
+
+
+class _PriorExtreme:
+    """max (or min) of the `window` committed values *before* the current
+    bar — rolling(window).max().shift(1). Monotonic deque, amortized O(1)."""
+
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self.n = 0
+        self.mono = deque()   # (index, value), values monotonic
+
+    def value(self) -> float:
+        return self.mono[0][1] if self.n >= self.window else NAN
+
+    def push(self, x):
+        beats = (lambda a, b: a >= b) if self.is_max else (lambda a, b: a <= b)
+        while self.mono and beats(x, self.mono[-1][1]):
+            self.mono.pop()
+        self.mono.append((self.n, x))
+        self.n += 1
+        while self.mono[0][0] <= self.n - 1 - self.window:
+            self.mono.popleft()
+
+    def state(self):
+        return {'n': self.n, 'mono': [list(p) for p in self.mono]}
+
+    def load(self, s):
+        self.n = s['n']
+        self.mono = deque(tuple(p) for p in s['mono'])
+
+
+def _ratio(a, b) -> float:
+    """a / b with numpy semantics (x/0 → ±inf, 0/0 → NaN)."""
+    if _isnan(a) or _isnan(b):
+        return NAN
+    if b == 0:
+        return NAN if a == 0 else math.copysign(math.inf, a)
+    return a / b
+
+
+def _encode_label(label):
+    if isinstance(label, (pd.Timestamp, datetime)):
+        return {'ts': pd.Timestamp(label).isoformat()}
+    return label
+
+
+def _decode_label(label):
+    if isinstance(label, dict) and 'ts' in label:
+        return pd.Timestamp(label['ts'])
+    return label
+
+
+class IndicatorEngine:
+    """Stateful equivalent of calculate_indicators for the latest bar.
+
+    >>> engine = IndicatorEngine.seed(df)          # once, from history
+    >>> latest = engine.update(ts, o, h, l, c, v)  # each new / revised bar
+    >>> latest['ATR_14'], latest['Regime']
+    """
+
+    BAR_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+    def __init__(self, donchian_lookback: Optional[int] = None,
+                 atr_median_window: Optional[int] = None):
+        cfg = STRATEGY_PARAMS.get('DONCHIAN', {})
+        self.donchian_lookback = donchian_lookback or cfg.get('lookback', 55)
+        self.atr_median_window = atr_median_window or cfg.get('atr_median_window', 100)
+
+        self.sma200 = _RollingMoments(200)
+        self.ema50 = _EMA(2 / 51)
+        self.gain = _EMA(1 / 14, min_periods=14)
+        self.loss = _EMA(1 / 14, min_periods=14)
+        self.bb20 = _RollingMoments(20)
+        self.vol20 = _RollingMoments(20)
+        self.ema12 = _EMA(2 / 13)
+        self.ema26 = _EMA(2 / 27)
+        self.signal9 = _EMA(2 / 10)
+        self.atr = _EMA(1 / 14, min_periods=14)
+        self.don_high = _PriorExtreme(self.donchian_lookback, is_max=True)
+        self.don_low = _PriorExtreme(self.donchian_lookback, is_max=False)
+        self.atr_median = RollingMedian(self.atr_median_window)
+        self.sma_hist = deque(maxlen=20)   # committed SMA_200, for the regime slope
+
+        self.prev_close = NAN
+        self.last_label = None
+        self.pending: Optional[dict] = None   # bar fields of the uncommitted bar
+        self.latest: Optional[dict] = None
+
+    # --- feeding bars ---
+
+    @classmethod
+    def seed(cls, df: pd.DataFrame, **kwargs) -> "IndicatorEngine":
+        """Build an engine from a bar history (the calculate_indicators input)."""
+        engine = cls(**kwargs)
+        engine.extend(df)
+        return engine
+
+    def extend(self, df: pd.DataFrame) -> Optional[dict]:
+        """Feed the rows of `df` from the current bar onward. Rows labelled
+        before the engine's last bar are skipped, so re-feeding an overlapping
+        window (e.g. the last month of bars on every poll) is safe."""
+        rows = df
+        if self.last_label is not None and len(df):
+            try:
+                rows = df[df.index >= self.last_label]
+            except TypeError:
+                rows = df
+        for label, row in zip(rows.index, rows.to_dict('records')):
+            self.update(label, row.get('Open', NAN), row['High'], row['Low'],
+                        row['Close'], row.get('Volume', NAN))
+        return self.latest
+
+    def update(self, label, open_, high, low, close, volume) -> dict:
+        """Apply one bar and return the indicator row for it. A bar with the
+        same label as the previous one replaces it."""
+        bar = {'Open': float(open_), 'High': float(high), 'Low': float(low),
+               'Close': float(close), 'Volume': float(volume)}
+        if self.pending is not None and label != self.last_label:
+            self._commit(self.pending)
+        self.pending = bar
+        self.last_label = label
+        self.latest = self._peek(bar)
+        return self.latest
+
+    # --- internals ---
+
+    def _true_range(self, bar):
+        hl = bar['High'] - bar['Low']
+        if _isnan(self.prev_close):
+            return hl
+        return max(hl, abs(bar['High'] - self.prev_close), abs(bar['Low'] - self.prev_close))
+
+    def _gain_loss(self, close):
+        delta = close - self.prev_close   # NaN on the first bar → 0 / 0
+        return (delta if delta > 0 else 0.0), (-delta if delta < 0 else 0.0)
+
+    def _peek(self, bar) -> dict:
+        close, volume = bar['Close'], bar['Volume']
+
+        sma200, _ = self.sma200.peek(close)
+        ema50 = self.ema50.peek(close)
+
+        gain, loss = self._gain_loss(close)
+        rsi = 100 - _ratio(100, 1 + _ratio(self.gain.peek(gain), self.loss.peek(loss)))
+
+        sma20, std20 = self.bb20.peek(close)
+        vol_sma, _ = self.vol20.peek(volume)
+
+        ema12, ema26 = self.ema12.peek(close), self.ema26.peek(close)
+        macd = ema12 - ema26
+        macd_signal = self.signal9.peek(macd)
+
+        atr = self.atr.peek(self._true_range(bar))
+
+        slope = sma200 - self.sma_hist[0] if len(self.sma_hist) == 20 else NAN
+        if close > sma200 and slope > 0:
+            regime = 'Bull'
+        elif close < sma200 and slope < 0:
+            regime = 'Bear'
+        else:
+            regime = 'Sideways'
+
+        return {
+            **bar,
+            'SMA_200': sma200,
+            'EMA_50': ema50,
+            'RSI_14': rsi,
+            'BBL_20_2.0': sma20 - 2 * std20,
+            'Vol_SMA_20': vol_sma,
+            'RVOL': _ratio(volume, vol_sma),
+            'MACD': macd,
+            'MACD_Signal': macd_signal,
+            'MACD_Hist': macd - macd_signal,
+            'ATR_14': atr,
+            f'DONCHIAN_HIGH_{self.donchian_lookback}': self.don_high.value(),
+            f'DONCHIAN_LOW_{self.donchian_lookback}': self.don_low.value(),
+            f'ATR_MEDIAN_{self.atr_median_window}': self.atr_median.peek(atr),
+            'Regime': regime,
+        }
+
+    def _commit(self, bar):
+        close = bar['Close']
+        sma200, _ = self.sma200.peek(close)
+        atr = self.atr.peek(self._true_range(bar))
+        macd = self.ema12.peek(close) - self.ema26.peek(close)
+        gain, loss = self._gain_loss(close)
+
+        self.sma_hist.append(sma200)
+        self.sma200.push(close)
+        self.ema50.push(close)
+        self.gain.push(gain)
+        self.loss.push(loss)
+        self.bb20.push(close)
+        self.vol20.push(bar['Volume'])
+        self.ema12.push(close)
+        self.ema26.push(close)
+        self.signal9.push(macd)
+        self.atr.push(self._true_range(bar))
+        self.atr_median.push(atr)
+        self.don_high.push(bar['High'])
+        self.don_low.push(bar['Low'])
+        self.prev_close = close
+
+    # --- persistence ---
+
+    _COMPONENTS = ('sma200', 'ema50', 'gain', 'loss', 'bb20', 'vol20', 'ema12', 'ema26',
+                   'signal9', 'atr', 'don_high', 'don_low', 'atr_median')
+
+    def to_dict(self) -> dict:
+        """JSON-serializable snapshot (NaN is written as a bare NaN, which
+        the json module reads back)."""
+        return {
+            'version': STATE_VERSION,
+            'donchian_lookback': self.donchian_lookback,
+            'atr_median_window': self.atr_median_window,
+            'components': {name: getattr(self, name).state() for name in self._COMPONENTS},
+            'sma_hist': list(self.sma_hist),
+            'prev_close': self.prev_close,
+            'last_label': _encode_label(self.last_label),
+            'pending': self.pending,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "IndicatorEngine":
+        if state.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {state.get('version')}")
+        engine = cls(donchian_lookback=state['donchian_lookback'],
+                     atr_median_window=state['atr_median_window'])
+        for name in cls._COMPONENTS:
+            getattr(engine, name).load(state['components'][name])
+        engine.sma_hist = deque(state['sma_hist'], maxlen=20)
+        engine.prev_close = state['prev_close']
+        engine.last_label = _decode_label(state['last_label'])
+        engine.pending = state['pending']
+        if engine.pending is not None:
+            engine.latest = engine._peek(engine.pending)
+        return engine
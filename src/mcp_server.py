@@ -12,12 +12,14 @@ from core.scanner import scan_market, process_ticker
 from core.data_fetcher import fetch_data
 from core.indicators import calculate_indicators
 from core.cache_manager import BacktestCache
-from backtest import Backtester
+from core.checkpoint import CheckpointStore
+from backtest import Backtester, solo_backtests
 from tracker.service import TrackerService
 from tracker.risk import CapitalAllocator
 from config import US_STOCKS, AI_LIST, SPACE_LIST
 
 _cache = BacktestCache()
+_checkpoints = CheckpointStore()
 
 mcp = FastMCP("openclaw")
 
@@ -70,7 +72,7 @@ def handle_scan(tickers=None, mode="US", strategies=None):
             else:
                 tickers = list(US_STOCKS)
         tickers = _filter_tickers_by_mode(tickers, mode)
-        signals = scan_market(tickers)
+        signals = scan_market(tickers, strategies=strategies)
         signals = _filter_signals_by_strategy(signals, strategies)
         return {"signals": signals, "count": len(signals), "tickers_scanned": tickers}
     except Exception as e:
@@ -88,18 +90,10 @@ def handle_scan_ticker(ticker):
         signal = process_ticker(ticker)
         news_text = get_market_news(ticker, max_results=5)
 
-        cached = _cache.get(ticker, "3y")
-        if cached:
-            backtest_stats = cached
-        else:
-            try:
-                bt = Backtester([ticker], "3y")
-                bt.load_data()
-                bt.run()
-                backtest_stats = bt.get_summary_metrics()
-                _cache.set(ticker, "3y", backtest_stats)
-            except Exception:
-                backtest_stats = None
+        try:
+            ((_, backtest_stats),) = solo_backtests([ticker], "3y", cache=_cache, checkpoints=_checkpoints)
+        except Exception:
+            backtest_stats = None
 
         return {
             "ticker": ticker,
@@ -131,6 +125,7 @@ def handle_backtest(ticker, period="3y", strategy=None):
             "win_rate": metrics.get("wr"),
             "total_trades": metrics.get("trades"),
             "pnl": metrics.get("pnl"),
+            "monte_carlo": bt.monte_carlo().summary(),
         }
     except Exception as e:
         return {"error": f"Backtest failed for {ticker}: {str(e)}"}
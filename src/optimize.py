@@ -1,39 +1,33 @@
+import argparse
 import sys
 import os
 import itertools
-import pandas as pd
-import yfinance as yf
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.backtest import Backtester
+from src.sweep import SweepConfig, expand_grid, run_sweep, successive_halving
 from src.config import RISK_PARAMS, STRATEGY_PARAMS
-from src.core.data_fetcher import get_sp500_tickers
+from src.core.data_fetcher import get_sp500_tickers, fetch_many
+from src.core.panel import universe_panel
 
-def fetch_benchmark(period='1y'):
+def fetch_benchmark(period='1y', panel=None):
     print(f"📊 Fetching SPY benchmark for {period}...")
-    spy = yf.download("SPY", period=period, progress=False)
-    if spy.empty:
-        return 0.0
-    
-    if isinstance(spy.columns, pd.MultiIndex):
-        spy = spy.xs('SPY', axis=1, level=1, drop_level=False) 
-        # Safe way:
-        close_col = spy['Close']
-        if isinstance(close_col, pd.DataFrame):
-             close_col = close_col.iloc[:, 0] # Take first column if multiple
-        
-        start_price = float(close_col.iloc[0])
-        end_price = float(close_col.iloc[-1])
+    if panel is not None and "SPY" in panel:
+        spy = panel.frame("SPY")
     else:
-        start_price = float(spy.iloc[0]['Close'])
-        end_price = float(spy.iloc[-1]['Close'])
+        spy = fetch_many(["SPY"], period=period).frames.get("SPY")
+    if spy is None or spy.empty:
+        return 0.0
+
+    start_price = float(spy['Close'].iloc[0])
+    end_price = float(spy['Close'].iloc[-1])
 
     roi = ((end_price - start_price) / start_price) * 100
     print(f"📉 SPY ROI: {roi:.2f}%")
     return roi
 
-def optimize():
+def optimize(search="profiles"):
     print("🚀 Starting SP500 Optimization Loop...")
     
     # 1. Fetch SP500 Data
@@ -45,10 +39,14 @@ def optimize():
         
     print(f"Testing on {len(tickers)} tickers.")
     
-    tester = Backtester(tickers, period="1y") 
-    tester.load_data() # Cache data
-    
-    benchmark_roi = fetch_benchmark("1y")
+    # Universe + benchmark share one panel; a rerun after the same close
+    # opens it from disk instead of refetching.
+    panel = universe_panel(list(tickers) + ["SPY"], period="1y")
+
+    tester = Backtester(tickers, period="1y")
+    tester.load_data(panel=panel)
+
+    benchmark_roi = fetch_benchmark("1y", panel=panel)
     
     # 2. Define Parameter Grid (Trinity Win Rate Focus)
     # Constraints: Size 10-30%
@@ -88,39 +86,49 @@ def optimize():
         }
     ]
     
-    best_roi = -999
-    best_profile = None
-    
-    print(f"\n🧪 Testing {len(profiles)} Configurations on {len(tickers)} tickers...")
-    
-    for p in profiles:
-        print(f"\n👉 Running Profile: {p['name']}")
-        
-        # Reset Portfolio
-        tester.portfolio = type(tester.portfolio)()
-        
-        # Run Backtest
-        strat_params = {"TRINITY": p['trinity']}
-        tester.run(min_confidence=60, strategies=["TRINITY"], strategy_params=strat_params, risk_params=p['risk'])
-        
-        # Stats
-        stats = tester.get_summary_metrics()
-        print(f"   [Result] ROI: {stats['roi']}% | WR: {stats['wr']}% | Trades: {stats['trades']} | PnL: ${stats['pnl']}")
-        
-        if stats['roi'] > best_roi:
-            best_roi = stats['roi']
-            best_profile = p
-            
+    if search == "halving":
+        # Adaptive search over a much larger space: every config gets a
+        # quarter of the universe over the last half of the year, the best
+        # third moves on to half the universe, and the best third of those
+        # to the full run.
+        configs = expand_grid({
+            "TRINITY.rsi_min": [35, 40, 45],
+            "TRINITY.rsi_max": [60, 65, 70],
+            "DONCHIAN.sl_atr_mult": [1.5, 2.0, 2.5],
+            "DONCHIAN.tp_atr_mult": [3.0, 4.0],
+            "RISK.breakeven_trigger_atr": [1.0, 1.5],
+            "RISK.trailing_stop_atr": [2.0, 2.5, 3.0],
+        }, base=SweepConfig(min_confidence=60, strategies=["TRINITY", "DONCHIAN"], risk_params=dict(base_risk)))
+        print(f"\n🧪 Successive halving over {len(configs)} Configurations on {len(tickers)} tickers...")
+        result = successive_halving(tester, configs)
+        print(result.stages.to_string(index=False))
+        table = result.table
+    else:
+        configs = [
+            SweepConfig(name=p['name'], min_confidence=60, strategies=["TRINITY"],
+                        strategy_params={"TRINITY": p['trinity']}, risk_params=p['risk'])
+            for p in profiles
+        ]
+        print(f"\n🧪 Testing {len(configs)} Configurations on {len(tickers)} tickers...")
+        table = run_sweep(tester, configs)
+    print(table[["name", "roi", "wr", "trades", "pnl"]].head(10).to_string())
+
+    best_roi = table.iloc[0]['roi']
+    best = next(c for c in configs if c.name == table.iloc[0]['name'])
+
     print("\n" + "="*40)
-    print(f"🏆 Optimization Winner: {best_profile['name']}")
+    print(f"🏆 Optimization Winner: {best.name}")
     print(f"📈 Best ROI: {best_roi:.2f}% (vs SPY {benchmark_roi:.2f}%)")
     
     if best_roi > benchmark_roi:
         print("✅ SUCCESS: Strategy beats benchmark.")
         print("To apply, update src/config.py with these params:")
-        print(best_profile)
+        print({"strategy_params": best.strategy_params, "risk_params": best.risk_params})
     else:
         print("❌ FAILURE: Strategy underperformed benchmark.")
         
 if __name__ == "__main__":
-    optimize()
+    parser = argparse.ArgumentParser(description="OpenClaw SP500 parameter optimization")
+    parser.add_argument('--search', choices=['profiles', 'halving'], default='profiles',
+                        help='profiles: the hand-written profiles; halving: successive halving over a parameter grid')
+    optimize(search=parser.parse_args().search)
@@ -8,11 +8,14 @@ from core.data_fetcher import fetch_data
 from core.scanner import scan_market
 from core.indicators import calculate_indicators
 from core.news import get_market_news
-from backtest import Backtester
+from backtest import solo_backtests
+from core.checkpoint import CheckpointStore
 
 load_dotenv()
 
-def analyze_ticker(ticker):
+def analyze_ticker(ticker, stats=None):
+    """Print a technical / quant / news summary. `stats` are the ticker's 3y
+    sim metrics if they were already run (see __main__)."""
     print(f"\n🔍 Analyzing {ticker}...")
     
     # 1. Technical Analysis
@@ -33,10 +36,11 @@ def analyze_ticker(ticker):
     """
     
     # 2. Simulation (Quant)
-    bt = Backtester([ticker], period="3y")
-    bt.load_data()
-    bt.run(min_confidence=0) # Run all signals found
-    stats = bt.get_summary_metrics()
+    if stats is None:
+        ((_, stats),) = solo_backtests([ticker], period="3y", min_confidence=0, checkpoints=CheckpointStore())  # Run all signals found
+    if stats is None:
+        print("Simulation failed.")
+        return
     
     quant_summary = f"""
     3y Backtest ROI: {stats['roi']}%
@@ -57,5 +61,8 @@ def analyze_ticker(ticker):
     print(news)
 
 if __name__ == "__main__":
-    analyze_ticker("SPY")
-    analyze_ticker("BTC-USD")
+    tickers = ["SPY", "BTC-USD"]
+    # Both 3y sims run side by side up front.
+    sims = dict(solo_backtests(tickers, period="3y", min_confidence=0, checkpoints=CheckpointStore()))
+    for t in tickers:
+        analyze_ticker(t, stats=sims[t])
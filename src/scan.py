@@ -9,8 +9,9 @@ from core.scanner import scan_market
 from core.news import get_market_news, news_query_for_ticker
 from core.notifier import send_telegram_report
 from core.report_builder import build_report
-from backtest import Backtester
+from backtest import solo_backtests
 from core.cache_manager import BacktestCache
+from core.checkpoint import CheckpointStore
 
 load_dotenv()
 
@@ -35,25 +36,23 @@ def _resolve_tickers(args):
 def _enrich_signals(candidates):
     """Attach 3y portfolio sim stats + a news snippet to each signal.
 
-    Mutates candidates in place: adds 'sim_stats' and 'news' fields.
+    Mutates candidates in place: adds 'sim_stats' and 'news' fields. The
+    sims for cache misses run in parallel (backtest.solo_backtests); each
+    ticker's news is fetched as soon as its sim is back.
     """
-    cache = BacktestCache()
+    by_ticker = {}
     for c in candidates:
-        sim_stats = cache.get(c["ticker"], "3y")
-        if sim_stats is None:
-            print(f"🔄 Running 3y sim for {c['ticker']}...")
-            bt = Backtester([c["ticker"]], period="3y")
-            bt.load_data()
-            bt.run(min_confidence=60)
-            sim_stats = bt.get_summary_metrics()
-            cache.set(c["ticker"], "3y", sim_stats)
-        c["sim_stats"] = sim_stats
-
-        try:
-            c["news"] = get_market_news(news_query_for_ticker(c["ticker"]), max_results=2)
-        except Exception as e:
-            print(f"⚠️ News fetch failed for {c['ticker']}: {e}")
-            c["news"] = None
+        by_ticker.setdefault(c["ticker"], []).append(c)
+
+    for ticker, sim_stats in solo_backtests(by_ticker, period="3y", min_confidence=60, cache=BacktestCache(),
+                                           checkpoints=CheckpointStore()):
+        for c in by_ticker[ticker]:
+            c["sim_stats"] = sim_stats
+            try:
+                c["news"] = get_market_news(news_query_for_ticker(c["ticker"]), max_results=2)
+            except Exception as e:
+                print(f"⚠️ News fetch failed for {c['ticker']}: {e}")
+                c["news"] = None
 
 
 def main():
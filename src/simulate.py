@@ -6,6 +6,8 @@ import argparse
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.backtest import Backtester, Portfolio
+from src.core.edge_stats import EDGE_KEYS, EDGE_STATS_FILE, MIN_EDGE_TRADES
+from src.sweep import SweepConfig, expand_grid, run_sweep
 from src.config import US_STOCKS, SP500_TOP_100, AI_LIST, SPACE_LIST
 
 def main():
@@ -13,6 +15,8 @@ def main():
     parser.add_argument('--mode', type=str, default='US', choices=['US', 'AI', 'SPACE', 'CRYPTO', 'ALL', 'SP100'], help='Asset class to backtest')
     parser.add_argument('--period', type=str, default='3y', help='Data lookback period (e.g. 1y, 2y, 3y)')
     parser.add_argument('--optimize', action='store_true', help='Run optimization loop to find best parameters')
+    parser.add_argument('--walk-forward', action='store_true', help='Walk-forward: pick the confidence threshold on each 1y window, test it on the next quarter')
+    parser.add_argument('--edge-stats', action='store_true', help='Refresh the per-strategy edge stats (all strategies, each solo) in one simulation')
     parser.add_argument('--strategy', type=str, help='Filter for specific strategy (TRINITY, PANIC, 2B, DONCHIAN)')
     
     parser.add_argument('--ticker', type=str, help='Specific ticker to simulate (overrides mode)')
@@ -46,32 +50,36 @@ def main():
     sim = Backtester(tickers, period=args.period)
     sim.load_data()
     
+    if args.walk_forward:
+        print("\n🚶 Walk-forward (252-day in-sample / 63-day out-of-sample folds, Confidence 60-90)...")
+        base = SweepConfig(strategies=target_strategies)
+        result = sim.walk_forward(expand_grid({"min_confidence": [60, 70, 80, 90]}, base=base))
+        print(result.folds[["fold", "oos_start", "oos_end", "min_confidence", "is_roi", "oos_roi", "oos_trades"]].to_string(index=False))
+        final = result.equity['equity'].iloc[-1]
+        print(f"\n✅ Stitched out-of-sample ROI: {(final / sim.portfolio.initial_balance - 1) * 100:.2f}%")
+        return
+
+    if args.edge_stats:
+        print("\n📊 Refreshing edge stats (combined + each strategy solo, one pass)...")
+        artifact = sim.refresh_edge_stats(exit_modes=('donchian',))
+        for key in EDGE_KEYS.values():
+            stat = artifact['books'][key]
+            kept = "" if key in artifact['strategies'] else f" (under {MIN_EDGE_TRADES} trades: keeping configured)"
+            print(f"   {key:<12} WR {stat['wr_pct']:.1f}% · ${stat['avg_pnl']}/trade · {stat['trades']} trades · {stat['edge']}{kept}")
+        print(f"\n✅ Saved {EDGE_STATS_FILE} (params {artifact['param_version']})")
+        return
+
     if args.optimize:
         print("\n🧪 Running Optimization (Testing Confidence Thresholds: 60, 70, 80, 90)...")
-        best_roi = -999
-        best_conf = 0
-        results = []
-        
-        for conf in [60, 70, 80, 90]:
-            print(f"   > Testing Min Confidence: {conf}...")
-            # Reset Portfolio for each run
-            sim.portfolio = type(sim.portfolio)() 
-            sim.run(min_confidence=conf, strategies=target_strategies)
-            
-            final_equity = sim.portfolio.equity_curve[-1]['equity']
-            roi = ((final_equity - sim.portfolio.initial_balance) / sim.portfolio.initial_balance) * 100
-            trades = len(sim.portfolio.history)
-            
-            results.append((conf, roi, trades))
-            if roi > best_roi:
-                best_roi = roi
-                best_conf = conf
-                
+        base = SweepConfig(strategies=target_strategies)
+        table = run_sweep(sim, expand_grid({"min_confidence": [60, 70, 80, 90]}, base=base))
+
         print("\n🏆 Optimization Results:")
-        for conf, roi, trades in results:
-            marker = "  (*)" if conf == best_conf else ""
-            print(f"   Confidence {conf}: ROI {roi:.2f}% ({trades} trades){marker}")
-            
+        for rank, row in table.iterrows():
+            marker = "  (*)" if rank == 1 else ""
+            print(f"   Confidence {row['min_confidence']}: ROI {row['roi']:.2f}% ({row['trades']} trades){marker}")
+
+        best_conf = int(table.iloc[0]['min_confidence'])
         print(f"\n✅ Best Parameter: Min Confidence = {best_conf}")
         # Rerun best for report
         sim.portfolio = type(sim.portfolio)()
@@ -84,5 +92,15 @@ def main():
     print(sim.generate_report())
     print("="*40)
 
+    # How much of the result is the particular trade sequence.
+    print("\n🎲 Monte Carlo (10,000 paths, 5th / 50th / 95th percentile):")
+    for method in ("bootstrap", "shuffle"):
+        mc = sim.monte_carlo(method=method).summary()
+        eq, dd, uw = mc["final_equity"], mc["max_drawdown_pct"], mc["time_under_water_trades"]
+        print(f"   {method:9s} Final Equity ${eq['p5']:,.0f} / ${eq['p50']:,.0f} / ${eq['p95']:,.0f} | "
+              f"Max DD {dd['p5']:.1f}% / {dd['p50']:.1f}% / {dd['p95']:.1f}% | "
+              f"Under Water {uw['p5']:.0f} / {uw['p50']:.0f} / {uw['p95']:.0f} trades | "
+              f"P(loss) {mc['prob_loss']}%")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,323 @@
+"""
+Parameter sweeps over one loaded universe.
+
+A sweep runs Backtester.run once per configuration: min_confidence,
+strategies, strategy params and risk params. All the runs share the
+Backtester's loaded indicator frames. Worker processes get them once,
+when they start. With the default fork start method they are inherited
+and never pickled. Each task only carries its configurations.
+
+Configurations with the same strategy params go to the same worker, in
+order. Backtester keeps the per-ticker signals and confidence scores of
+the last params it saw for each strategy, so those runs only redo the
+day loop. The same holds for any strategy whose params did not change.
+
+>>> tester = Backtester(tickers); tester.load_data(panel=panel)
+>>> configs = expand_grid({"min_confidence": [60, 70, 80],
+...                        "TRINITY.rsi_min": [35, 40],
+...                        "RISK.risk_per_trade": [0.01, 0.015]})
+>>> table = run_sweep(tester, configs)     # ranked, best first
+"""
+import contextlib
+import copy
+import io
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Optional
+
+import pandas as pd
+
+try:
+    from src.config import RISK_PARAMS, STRATEGY_PARAMS
+except ImportError:
+    from config import RISK_PARAMS, STRATEGY_PARAMS
+
+RANK_COLUMNS = ["roi", "wr", "wr_lb", "wr_ub", "trades", "pnl"]
+
+
+@dataclass
+class SweepConfig:
+    """One Backtester.run configuration. None means run()'s own default."""
+    name: str = ""
+    min_confidence: int = 70
+    strategies: Optional[list] = None
+    strategy_params: Optional[dict] = None    # {STRATEGY: params}
+    risk_params: Optional[dict] = None
+    tags: dict = field(default_factory=dict)  # swept values, shown in the table
+
+    def signal_key(self) -> str:
+        """Everything that decides the signals and their confidence."""
+        return json.dumps([self.strategies, self.strategy_params], sort_keys=True)
+
+    def run_kwargs(self) -> dict:
+        return {"min_confidence": self.min_confidence, "strategies": self.strategies,
+                "strategy_params": self.strategy_params, "risk_params": self.risk_params}
+
+
+def expand_grid(axes, base=None):
+    """
+    Every combination of `axes` as SweepConfigs.
+
+    Axis names are 'min_confidence', 'strategies', '<STRATEGY>.<param>'
+    (e.g. 'TRINITY.rsi_min') or 'RISK.<param>'. A swept strategy or risk
+    param is set on a copy of its STRATEGY_PARAMS / RISK_PARAMS entry, so
+    the params that are not swept keep their configured values. `base` is
+    a SweepConfig whose values the axes override.
+    """
+    base = base or SweepConfig()
+    names = list(axes)
+    configs = []
+    for values in itertools.product(*(axes[n] for n in names)):
+        cfg = copy.deepcopy(base)
+        for name, value in zip(names, values):
+            if name in ("min_confidence", "strategies"):
+                setattr(cfg, name, value)
+                continue
+            group, _, param = name.partition(".")
+            if not param:
+                raise ValueError(f"Unknown sweep axis {name!r}")
+            if group == "RISK":
+                if cfg.risk_params is None:
+                    cfg.risk_params = dict(RISK_PARAMS)
+                cfg.risk_params[param] = value
+            elif group in STRATEGY_PARAMS:
+                cfg.strategy_params = cfg.strategy_params or {}
+                cfg.strategy_params.setdefault(group, dict(STRATEGY_PARAMS[group]))[param] = value
+            else:
+                raise ValueError(f"Unknown sweep axis {name!r}")
+        cfg.tags = {**base.tags, **dict(zip(names, values))}
+        cfg.name = cfg.name or ", ".join(f"{n}={v}" for n, v in cfg.tags.items())
+        configs.append(cfg)
+    return configs
+
+
+# The loaded Backtester, set in each worker by _init_worker.
+_tester = None
+
+
+def _init_worker(tester):
+    global _tester
+    _tester = tester
+
+
+def _run_config(cfg, start=None, end=None):
+    """Run one configuration on this process' Backtester, on a fresh
+    portfolio, and return its summary metrics."""
+    _tester.portfolio = type(_tester.portfolio)()
+    with contextlib.redirect_stdout(io.StringIO()):   # run() prints per call
+        _tester.run(**cfg.run_kwargs(), start=start, end=end)
+    return _tester.get_summary_metrics()
+
+
+def _run_configs(indexed_configs):
+    """Run configurations on this process' Backtester. Returns
+    [(index, summary metrics, seconds)]."""
+    out = []
+    for index, cfg in indexed_configs:
+        start = time.perf_counter()
+        metrics = _run_config(cfg)
+        out.append((index, metrics, time.perf_counter() - start))
+    return out
+
+
+def _pool(tester, workers):
+    """A process pool whose workers each hold `tester`. fork hands them the
+    loaded frames without pickling them."""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=_init_worker, initargs=(tester,))
+
+
+def _tasks(configs, workers):
+    """Split configs into per-worker tasks. Configs that share a signal key
+    stay together and in order. Large groups are split only as far as
+    needed to keep every worker busy."""
+    groups = {}
+    for index, cfg in enumerate(configs):
+        groups.setdefault(cfg.signal_key(), []).append((index, cfg))
+    size = max(1, math.ceil(len(configs) / workers))
+    tasks = []
+    for group in groups.values():
+        tasks += [group[i:i + size] for i in range(0, len(group), size)]
+    return tasks
+
+
+def run_sweep(tester, configs, max_workers=None, rank_by="roi"):
+    """
+    Run every configuration on `tester` (a Backtester with data loaded) and
+    return the results as a DataFrame ranked by `rank_by`, best first: name,
+    the swept values, the summary metrics and the seconds each run took.
+
+    Runs are spread over a process pool (max_workers defaults to the CPU
+    count). With a single worker they run in this process, on `tester`
+    itself, whose portfolio is left holding the last run.
+    """
+    configs = list(configs)
+    if not configs:
+        return pd.DataFrame(columns=["name"] + RANK_COLUMNS)
+    workers = min(max_workers or os.cpu_count() or 1, len(configs))
+    tasks = _tasks(configs, workers)
+
+    results = {}
+    if workers <= 1:
+        _init_worker(tester)
+        try:
+            for task in tasks:
+                results.update((i, (m, s)) for i, m, s in _run_configs(task))
+        finally:
+            _init_worker(None)
+    else:
+        with _pool(tester, workers) as pool:
+            for future in as_completed([pool.submit(_run_configs, task) for task in tasks]):
+                results.update((i, (m, s)) for i, m, s in future.result())
+
+    rows = []
+    for index, cfg in enumerate(configs):
+        metrics, seconds = results[index]
+        rows.append({"name": cfg.name, **cfg.tags, **metrics, "seconds": round(seconds, 3)})
+    table = pd.DataFrame(rows).sort_values(rank_by, ascending=False, kind="stable")
+    table.index = pd.RangeIndex(1, len(table) + 1, name="rank")
+    return table
+
+
+@dataclass
+class HalvingResult:
+    table: pd.DataFrame    # the configs that reached the last stage, ranked
+    stages: pd.DataFrame   # one row per stage: budget, time, survivors
+
+
+def _stage_tester(tester, ticker_fraction, window_fraction):
+    """A Backtester over an evenly spread subset of tester's tickers and
+    the most recent part of each one's bars. The indicators were computed
+    on the full history, so they are warmed up from the first bar of the
+    window. The signal memo is shared wherever the frames are the same."""
+    tickers = [t for t in tester.tickers if t in tester.data_store]
+    count = max(1, round(len(tickers) * ticker_fraction))
+    step = len(tickers) / count
+    subset = [tickers[int(i * step)] for i in range(count)]
+
+    stage = type(tester)(subset, period=tester.period)
+    if window_fraction >= 1:
+        stage.data_store = {t: tester.data_store[t] for t in subset}
+        stage._score_memo = tester._score_memo
+    else:
+        stage.data_store = {t: tester.data_store[t].iloc[-max(2, round(len(tester.data_store[t]) * window_fraction)):]
+                            for t in subset}
+    return stage
+
+
+def successive_halving(tester, configs, stages=((0.25, 0.5), (0.5, 1.0), (1.0, 1.0)),
+                       keep=1 / 3, max_workers=None, rank_by="roi"):
+    """
+    Search `configs` with successive halving: every config is run on a
+    cheap slice of the data, and only the best `keep` fraction of each
+    stage is promoted to the next, more expensive, one.
+
+    `stages` are (ticker fraction, window fraction) budgets. A ticker
+    fraction picks an evenly spread subset of the universe. A window
+    fraction keeps only the most recent part of each ticker's bars. The
+    last stage should be (1.0, 1.0), the full universe and period. Each
+    stage's timing and pruning are printed and returned in `stages`.
+    """
+    survivors = list(configs)
+    if len({cfg.name for cfg in survivors}) < len(survivors):
+        raise ValueError("successive_halving needs a unique name per config")
+    log = []
+    table = None
+    for number, (ticker_fraction, window_fraction) in enumerate(stages, 1):
+        stage = _stage_tester(tester, ticker_fraction, window_fraction)
+        days = max((len(df) for df in stage.data_store.values()), default=0)
+        start = time.perf_counter()
+        table = run_sweep(stage, survivors, max_workers=max_workers, rank_by=rank_by)
+        seconds = time.perf_counter() - start
+
+        last = number == len(stages)
+        kept = len(survivors) if last else max(1, math.ceil(len(survivors) * keep))
+        promoted = set(table["name"].iloc[:kept])
+        print(f"Stage {number}/{len(stages)}: {len(survivors)} configs on {len(stage.tickers)} tickers x "
+              f"{days} days in {seconds:.1f}s"
+              + ("" if last else f"; kept {kept}, pruned {len(survivors) - kept} "
+                                 f"({rank_by} cutoff {table[rank_by].iloc[kept - 1]})"))
+        log.append({"stage": number, "tickers": len(stage.tickers), "days": days,
+                    "configs": len(survivors), "kept": kept, "seconds": round(seconds, 2),
+                    "cutoff": table[rank_by].iloc[kept - 1], "best": table["name"].iloc[0]})
+        survivors = [cfg for cfg in survivors if cfg.name in promoted]
+
+    return HalvingResult(table=table, stages=pd.DataFrame(log))
+
+
+@dataclass
+class WalkForwardResult:
+    folds: pd.DataFrame    # per fold: windows, chosen config, in- and out-of-sample metrics
+    equity: pd.DataFrame   # stitched out-of-sample equity curve: date, equity, fold
+
+
+def _run_fold(fold, configs, rank_by):
+    """Pick the best config on the fold's in-sample window and run it on the
+    out-of-sample window that follows."""
+    # Configs that share signals run back to back, so they are built once.
+    in_sample = [None] * len(configs)
+    for group in _tasks(configs, 1):
+        for index, cfg in group:
+            in_sample[index] = _run_config(cfg, fold["is_start"], fold["oos_start"])
+    best = max(range(len(configs)), key=lambda k: in_sample[k][rank_by])   # first on ties
+    oos = _run_config(configs[best], fold["oos_start"], fold["oos_end"])
+    days = _tester.portfolio.equity_curve
+    curve = list(zip(days.dates('date'), days.column('equity').tolist()))
+    return {**fold, "config": configs[best].name, **configs[best].tags,
+            f"is_{rank_by}": in_sample[best][rank_by],
+            **{f"oos_{k}": v for k, v in oos.items()}}, curve
+
+
+def walk_forward(tester, configs, in_sample_days=252, out_of_sample_days=63,
+                 rank_by="roi", max_workers=None):
+    """
+    Walk-forward optimization over tester's history. The days are cut
+    into rolling folds: `in_sample_days` to pick the best config by
+    `rank_by`, then the next `out_of_sample_days` to run it on. Each fold
+    starts from a fresh portfolio. Folds run in parallel. Signals and
+    regime stats come from the whole-history precompute, which only ever
+    looks back, so all folds and configs share it.
+
+    The out-of-sample curves are stitched into one: each fold's curve is
+    scaled to start where the previous one ended.
+    """
+    configs = list(configs)
+    dates = reduce(pd.Index.union, (df.index for df in tester.data_store.values()))
+    folds = []
+    for first in range(0, len(dates) - in_sample_days, out_of_sample_days):
+        oos_first = first + in_sample_days
+        oos_stop = min(oos_first + out_of_sample_days, len(dates))
+        folds.append({"fold": len(folds) + 1, "is_start": dates[first], "oos_start": dates[oos_first],
+                      "oos_end": dates[oos_stop] if oos_stop < len(dates) else None})
+    if not folds:
+        raise ValueError(f"{len(dates)} days is not enough for a {in_sample_days}-day in-sample window")
+
+    workers = min(max_workers or os.cpu_count() or 1, len(folds))
+    if workers <= 1:
+        _init_worker(tester)
+        try:
+            results = [_run_fold(fold, configs, rank_by) for fold in folds]
+        finally:
+            _init_worker(None)
+    else:
+        with _pool(tester, workers) as pool:
+            results = list(pool.map(_run_fold, folds, [configs] * len(folds), [rank_by] * len(folds)))
+
+    initial = type(tester.portfolio)().initial_balance
+    equity, level = [], initial
+    for summary, curve in results:
+        scale = level / initial
+        equity += [(date, value * scale, summary["fold"]) for date, value in curve]
+        if curve:
+            level = curve[-1][1] * scale
+    return WalkForwardResult(folds=pd.DataFrame([summary for summary, _ in results]),
+                             equity=pd.DataFrame(equity, columns=["date", "equity", "fold"]))
@@ -163,7 +163,9 @@ def main():
         
     elif args.command == "monitor":
         print("\n🔍 Syncing Market Data...")
+        service.load_indicator_state()
         report, alerts = service.update_market()
+        service.save_indicator_state()
 
         print("\n=== Active Positions ===")
         if not report:
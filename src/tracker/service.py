@@ -5,6 +5,7 @@ from src.tracker.position import PositionManager, EXIT_MODE_ATR, EXIT_MODE_DONCH
 from src.tracker.risk import CapitalAllocator
 from src.core.data_fetcher import fetch_data
 from src.core.indicators import calculate_indicators
+from src.core.streaming import IndicatorEngine
 from src.core.earnings import get_position_earnings, EARNINGS_NEAR_THRESHOLD_DAYS
 from src.core.news import get_market_news, news_query_for_ticker, format_news_lines
 from src.config import ACCOUNT_BALANCE, STRATEGY_PARAMS
@@ -39,6 +40,10 @@ class TrackerService:
         self.risk_manager = CapitalAllocator(initial_balance)
         self.balance = initial_balance
         self.positions_file = os.path.join(os.path.dirname(__file__), "..", "..", "data", "positions.json")
+        # Per-ticker streaming indicator state, so each poll only folds in the
+        # newest bar instead of recomputing indicators over the whole window.
+        self.indicators = {}  # {ticker: IndicatorEngine}
+        self.indicator_state_file = os.path.join(os.path.dirname(self.positions_file), "indicator_state.json")
 
     def add_position(self, ticker, entry_price, qty, side='LONG', tp1=None,
                       strategy=None, initial_sl=None):
@@ -58,7 +63,7 @@ class TrackerService:
         df = fetch_data(ticker, period="1mo")
         atr = 0
         if df is not None:
-            df = calculate_indicators(df)
+            df = calculate_indicators(df, columns=['ATR_14'])
             atr = df['ATR_14'].iloc[-1]
 
         if ticker in self.positions:
@@ -119,6 +124,34 @@ class TrackerService:
         print(f"Started tracking {ticker} | Entry: {entry_price} | "
               f"SL: ${pos.current_sl:.2f} | ATR: {atr:.2f} | Mode: {mode_tag}")
 
+    def _latest_indicators(self, ticker, df):
+        """Indicator values for the newest bar of `df`. Resumes the ticker's
+        engine when `df` still contains the engine's last bar; otherwise
+        (first poll, or a gap longer than the fetched window) re-seeds."""
+        engine = self.indicators.get(ticker)
+        if engine is None or engine.last_label not in df.index:
+            engine = IndicatorEngine.seed(df)
+            self.indicators[ticker] = engine
+            return engine.latest
+        return engine.extend(df)
+
+    def save_indicator_state(self):
+        os.makedirs(os.path.dirname(self.indicator_state_file), exist_ok=True)
+        data = {t: e.to_dict() for t, e in self.indicators.items() if t in self.positions}
+        with open(self.indicator_state_file, "w") as f:
+            json.dump(data, f)
+
+    def load_indicator_state(self):
+        if not os.path.exists(self.indicator_state_file):
+            return
+        try:
+            with open(self.indicator_state_file) as f:
+                data = json.load(f)
+            self.indicators = {t: IndicatorEngine.from_dict(s) for t, s in data.items()}
+        except (json.JSONDecodeError, IOError, KeyError, ValueError) as e:
+            print(f"Warning: Ignoring indicator state: {e}")
+            self.indicators = {}
+
     def update_market(self):
         """Polls market data, updates all positions, attaches per-position
         earnings + news as side effects on each PositionManager.
@@ -135,9 +168,9 @@ class TrackerService:
             df = fetch_data(ticker, period="3mo")
             if df is None: continue
 
-            df = calculate_indicators(df)
-            current_price = df['Close'].iloc[-1]
-            current_atr = df['ATR_14'].iloc[-1]
+            latest = self._latest_indicators(ticker, df)
+            current_price = latest['Close']
+            current_atr = latest['ATR_14']
 
             # Donchian channel low — only meaningful for donchian-exit positions
             # but cheap to compute either way; we just don't pass it for ATR mode.
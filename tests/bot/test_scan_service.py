@@ -128,3 +128,17 @@ async def test_news_timeout_returns_none(scan_svc, mock_redis):
 
     assert ticker == "AAPL"
     assert news is None  # timed out gracefully
+
+
+def test_union_strategies_falls_back_to_all_when_any_user_has_none():
+    users = {1: ["AAPL"], 2: ["MSFT"]}
+    assert ScanService._union_strategies(users, {1: ["TRINITY"], 2: ["PANIC"]}) == ["PANIC", "TRINITY"]
+    assert ScanService._union_strategies(users, {1: ["TRINITY"], 2: None}) is None
+    assert ScanService._union_strategies(users, None) is None
+
+
+@pytest.mark.asyncio
+async def test_scan_for_user_passes_strategies_to_scanner(scan_svc):
+    with patch("src.bot.services.scan_service.scan_market", return_value=[]) as scan:
+        await scan_svc.scan_for_user(user_id=1, tickers=["AAPL"], strategies=["DONCHIAN"])
+    assert scan.call_args.kwargs["strategies"] == ["DONCHIAN"]
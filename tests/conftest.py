@@ -0,0 +1,68 @@
+"""Shared fixtures: plain daily bars for the bar store / panel tests, and
+for the backtester tests synthetic universes, loaded Backtesters and their
+trade ledgers."""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import Backtester
+from src.core.panel import build_panel
+from src.core.providers import synthetic_bars
+from src.core.sessions import MARKET_TZ
+
+SYNTHETIC_TICKERS = ("MSFT", "XOM", "AMD", "NVDA")
+
+
+@pytest.fixture(scope="session")
+def make_bars():
+    """Steadily rising daily OHLCV, `periods` business days ending at `end`
+    (today by default), for the bar store / panel tests."""
+    def make(periods, base=100.0, end=None):
+        end = end or pd.Timestamp.now(tz=MARKET_TZ).normalize()
+        idx = pd.bdate_range(end=end, periods=periods, tz=MARKET_TZ, name="Date")
+        close = base + np.arange(periods, dtype=float)
+        return pd.DataFrame({
+            "Open": close - 0.5, "High": close + 1.0, "Low": close - 1.0,
+            "Close": close, "Volume": np.full(periods, 1_000_000, dtype=np.int64),
+        }, index=idx)
+    return make
+
+
+@lru_cache(maxsize=None)
+def _synthetic(tickers, bars):
+    return {t: synthetic_bars(t, bars) for t in tickers}
+
+
+@pytest.fixture(scope="session")
+def synthetic_frames():
+    """{ticker: synthetic OHLCV, `bars` each}. The frames are shared between
+    tests — slice or copy before mutating."""
+    def make(bars, tickers=SYNTHETIC_TICKERS):
+        return dict(_synthetic(tuple(tickers), bars))
+    return make
+
+
+@pytest.fixture(scope="session")
+def synthetic_panel(synthetic_frames):
+    """A Panel over synthetic_frames(bars, tickers)."""
+    def make(bars, tickers=SYNTHETIC_TICKERS):
+        return build_panel(synthetic_frames(bars, tickers))
+    return make
+
+
+@pytest.fixture(scope="session")
+def tester():
+    """A Backtester over `panel`'s tickers with the panel loaded."""
+    def make(panel, period="3y"):
+        bt = Backtester(panel.tickers, period=period)
+        bt.load_data(panel=panel)
+        return bt
+    return make
+
+
+@pytest.fixture(scope="session")
+def ledger():
+    """A portfolio's trade ledger as a DataFrame."""
+    return lambda portfolio: pd.DataFrame(list(portfolio.history))
@@ -0,0 +1,88 @@
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core import cache_manager
+from src.core.cache_manager import BacktestCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_manager, "CACHE_FILE", str(tmp_path / "stats.db"))
+    return BacktestCache()
+
+
+def _clock(monkeypatch, now):
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+    monkeypatch.setattr(cache_manager, "datetime", Clock)
+
+
+def test_round_trip_and_batch_reads(cache):
+    assert cache.get("MSFT", "3y") is None
+    cache.set("MSFT", "3y", {"roi": 1.5, "trades": 3})
+    cache.set_many({"AMD": {"roi": -2.0}, "XOM": {"roi": 0.0}}, "3y")
+    cache.set("MSFT", "3y", {"roi": 2.5, "trades": 4})   # replaces
+
+    assert cache.get("MSFT", "3y") == {"roi": 2.5, "trades": 4}
+    assert cache.get("MSFT", "1y") is None
+    assert cache.get_many(["AMD", "NONE", "MSFT"], "3y") == {"AMD": {"roi": -2.0}, "MSFT": {"roi": 2.5, "trades": 4}}
+    # Another instance (another process) sees the same entries.
+    assert BacktestCache().get("XOM", "3y") == {"roi": 0.0}
+
+
+def test_batch_is_one_transaction(cache, monkeypatch):
+    statements = []
+    connect = cache._connect
+
+    def traced():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+    monkeypatch.setattr(cache, "_connect", traced)
+    cache.set_many({f"T{i:03d}": {"roi": float(i)} for i in range(100)}, "3y")
+    assert sum(s.startswith("BEGIN") for s in statements) == 1
+    assert len(cache.get_many([f"T{i:03d}" for i in range(100)], "3y")) == 100
+
+
+def test_expired_entries_are_missed_then_evicted(cache, monkeypatch):
+    start = datetime(2026, 3, 2, 12, 0)
+    _clock(monkeypatch, start)
+    cache.set("OLD", "3y", {"roi": 1.0})
+    _clock(monkeypatch, start + timedelta(days=8))
+    assert cache.get("OLD", "3y") is None
+
+    cache.set("NEW", "3y", {"roi": 2.0})
+    _clock(monkeypatch, start)
+    assert cache.get("OLD", "3y") is None          # gone, not just expired
+    assert cache.get("NEW", "3y") == {"roi": 2.0}
+
+
+def test_param_changes_use_a_fresh_namespace(cache, monkeypatch):
+    cache.set("MSFT", "3y", {"roi": 1.0})
+    monkeypatch.setattr(cache_manager, "_param_version", lambda: "other")
+    assert cache.get("MSFT", "3y") is None
+    cache.set("MSFT", "3y", {"roi": 9.0})
+    assert cache.get("MSFT", "3y") == {"roi": 9.0}
+
+
+def _writer(path, worker):
+    cache_manager.CACHE_FILE = path
+    cache = BacktestCache()
+    for batch in range(20):
+        cache.set_many({f"W{worker}_{batch}_{i}": {"roi": float(i)} for i in range(5)}, "3y")
+
+
+def test_concurrent_writers_do_not_clobber_each_other(cache):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_writer, args=(cache.cache_file, w)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    keys = [f"W{w}_{b}_{i}" for w in range(4) for b in range(20) for i in range(5)]
+    assert len(cache.get_many(keys, "3y")) == len(keys)
@@ -0,0 +1,115 @@
+import pandas as pd
+import pytest
+
+from src.backtest import Backtester, solo_backtests
+from src.core import checkpoint as checkpoint_mod
+from src.core.checkpoint import CheckpointStore
+from src.core.panel import build_panel
+
+ALL = ["TRINITY", "PANIC", "2B", "DONCHIAN"]
+
+
+@pytest.fixture(scope="module")
+def frames(synthetic_frames):
+    frames = synthetic_frames(760)
+    frames["XOM"] = frames["XOM"].iloc[100:]         # later listing: gaps in the union
+    return frames
+
+
+@pytest.fixture
+def fresh(tester):
+    def run(frames, period="3y"):
+        bt = tester(build_panel(frames), period=period)
+        bt.run(strategies=ALL, checkpoint=True)
+        return bt
+    return run
+
+
+def _head(frames, drop):
+    return {t: f.iloc[:len(f) - drop] for t, f in frames.items()}
+
+
+@pytest.mark.parametrize("new_bars", [1, 20])
+def test_resume_matches_a_fresh_run_while_history_fits_the_window(frames, new_bars, fresh, ledger):
+    checkpoint = fresh(_head(frames, new_bars)).checkpoint()
+    resumed = Backtester(list(frames))
+    assert resumed.resume(checkpoint, frames)
+
+    full = fresh(frames)
+    pd.testing.assert_frame_equal(ledger(resumed.portfolio), ledger(full.portfolio))
+    assert len(resumed.portfolio.equity_curve) == len(full.portfolio.equity_curve)
+    assert resumed.portfolio.cash == pytest.approx(full.portfolio.cash)
+    assert set(resumed.portfolio.positions) == set(full.portfolio.positions)
+
+    # The resumed state checkpoints again, from the new last bar.
+    again = resumed.checkpoint()
+    assert again.as_of == max(f.index[-1] for f in frames.values())
+    assert all(len(again.frames[t]) == len(frames[t]) for t in frames)
+
+
+def test_resume_refuses_frames_that_no_longer_reach_the_checkpoint(frames, fresh):
+    checkpoint = fresh(_head(frames, 30)).checkpoint()
+    later = {t: f.iloc[-10:] for t, f in frames.items()}
+    bt = Backtester(list(frames))
+    assert not bt.resume(checkpoint, later)
+    assert bt.data_store == {} and not len(bt.portfolio.history)
+
+
+def test_resume_trims_frames_and_trades_to_the_rolling_window(frames, fresh):
+    checkpoint = fresh(_head(frames, 5), period="1y").checkpoint()
+    bt = Backtester(list(frames), period="1y")
+    assert bt.resume(checkpoint, frames)
+
+    last = max(f.index[-1] for f in frames.values())
+    cutoff = (last.normalize() - pd.DateOffset(years=1)).value
+    p = bt.portfolio
+    assert len(p.history) and (p.history.column('entry_date') >= cutoff).all()
+    assert (p.equity_curve.column('date') >= cutoff).all()
+    assert all(df.index[0].value >= cutoff for df in bt.data_store.values())
+    assert p.start_equity != p.initial_balance
+    roi = (p.equity_curve[-1]['equity'] / p.start_equity - 1) * 100
+    assert bt.get_summary_metrics()["roi"] == round(roi, 2)
+
+
+def test_resume_refuses_re_adjusted_history(frames, tmp_path, monkeypatch):
+    nvda = frames["NVDA"]
+    store = CheckpointStore(str(tmp_path))
+    dict(solo_backtests(["NVDA"], min_confidence=60, max_workers=1,
+                        frames={"NVDA": nvda.iloc[:-5]}, checkpoints=store))
+    checkpoint = store.load("NVDA", "3y", 60)
+
+    split = nvda.copy()
+    split[["Open", "High", "Low", "Close"]] /= 4                 # e.g. a 4:1 split
+    assert not Backtester(["NVDA"]).resume(checkpoint, {"NVDA": split})
+
+    # solo_backtests falls back to a full rerun on the adjusted bars.
+    rerun = dict(solo_backtests(["NVDA"], min_confidence=60, max_workers=1,
+                                frames={"NVDA": split}, checkpoints=store))
+    assert rerun["NVDA"] is not None
+    resaved = store.load("NVDA", "3y", 60).frames["NVDA"]
+    assert resaved["Close"].iloc[0] == pytest.approx(split["Close"].iloc[0])
+    assert resaved["SMA_200"].iloc[-1] < split["Close"].max()
+
+
+def test_solo_backtests_resume_from_saved_checkpoints(frames, tmp_path, monkeypatch):
+    store = CheckpointStore(str(tmp_path))
+    first = dict(solo_backtests(list(frames), min_confidence=60, max_workers=1,
+                                frames=_head(frames, 3), checkpoints=store))
+    assert all(first.values())
+    assert len(list(tmp_path.glob("*.pkl"))) == len(frames)
+
+    def no_full_rerun(self, panel=None):
+        raise AssertionError("resumed tickers should not rebuild their indicators")
+    monkeypatch.setattr(Backtester, "load_data", no_full_rerun)
+    second = dict(solo_backtests(list(frames), min_confidence=60, max_workers=1,
+                                 frames=frames, checkpoints=store))
+    assert all(second.values())
+
+    # Other strategy / risk params: the checkpoints no longer apply, and
+    # saving under the new ones removes the ticker's old one.
+    msft = store.load("MSFT", "3y", 60)
+    monkeypatch.setattr(checkpoint_mod, "_param_version", lambda: "other")
+    assert store.load("MSFT", "3y", 60) is None
+    store.save("MSFT", "3y", 60, msft)
+    assert [p.name for p in tmp_path.glob("MSFT_*.pkl")] == ["MSFT_3y_60_other.pkl"]
+    assert len(list(tmp_path.glob("*.pkl"))) == len(frames)
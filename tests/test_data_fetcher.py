@@ -0,0 +1,322 @@
+import threading
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.core import data_fetcher, providers
+from src.core.bar_store import BarStore, merge_bars
+from src.core.sessions import last_session_close, is_session_open, MARKET_TZ
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = BarStore(root=str(tmp_path / "bars"))
+    with patch.object(data_fetcher, "_store", s), \
+            patch.object(data_fetcher, "_series_cache", data_fetcher.SeriesCache()):
+        yield s
+
+
+@pytest.fixture
+def mock_yf():
+    previous = providers.set_provider(providers.LiveProvider())
+    try:
+        with patch.object(providers, "yf") as yf:
+            yield yf
+    finally:
+        providers.set_provider(previous)
+
+
+def test_store_round_trip_preserves_frame(tmp_path, make_bars):
+    s = BarStore(root=str(tmp_path))
+    df = make_bars(30)
+    s.save("BRK-B", df, history_start=pd.Timestamp("2023-12-01", tz="UTC"))
+
+    loaded = s.load("BRK-B")
+    pd.testing.assert_frame_equal(loaded.df, df, check_freq=False, check_index_type=False)
+    assert loaded.history_start == pd.Timestamp("2023-12-01", tz="UTC")
+
+
+def test_store_missing_ticker_returns_none(tmp_path):
+    assert BarStore(root=str(tmp_path)).load("NOPE") is None
+
+
+def test_merge_bars_prefers_newer_overlap(make_bars):
+    old = make_bars(5)
+    new = make_bars(3, base=500.0, end=old.index[-1] + pd.offsets.BDay(2))  # overlaps old's last bar
+    merged = merge_bars(old, new)
+    assert len(merged) == 7
+    assert merged["Close"].iloc[4] == 500.0
+
+
+def test_session_close_walks_back_over_weekend():
+    sat = datetime(2026, 3, 7, 12, 0, tzinfo=MARKET_TZ)
+    assert last_session_close(sat).date().isoformat() == "2026-03-06"
+    mon_morning = datetime(2026, 3, 9, 8, 0, tzinfo=MARKET_TZ)
+    assert last_session_close(mon_morning).date().isoformat() == "2026-03-06"
+    assert not is_session_open(mon_morning)
+    assert is_session_open(datetime(2026, 3, 9, 10, 0, tzinfo=MARKET_TZ))
+
+
+def test_cold_fetch_downloads_and_persists(store, mock_yf, make_bars):
+    full = make_bars(600)
+    mock_yf.Ticker.return_value.history.return_value = full
+
+    df = data_fetcher.fetch_data("AAPL", period="2y")
+
+    assert df is not None and not df.empty
+    assert store.load("AAPL") is not None
+    # Cold downloads are widened to BASE_PERIOD (3y) so later longer requests
+    # are served locally too.
+    kwargs = mock_yf.Ticker.return_value.history.call_args.kwargs
+    assert pd.Timestamp(kwargs["start"]) < pd.Timestamp.now() - pd.DateOffset(years=2, months=11)
+
+
+def test_fresh_store_skips_network(store, mock_yf, make_bars):
+    full = make_bars(600)
+    store.save("AAPL", full, history_start=pd.Timestamp("2000-01-01", tz="UTC"))
+
+    with patch.object(data_fetcher, "_is_fresh", return_value=True):
+        df = data_fetcher.fetch_data("AAPL", period="1mo")
+
+    mock_yf.Ticker.assert_not_called()
+    assert 15 <= len(df) <= 25  # ~1 month of business days
+
+
+def test_stale_store_tops_up_only_new_bars(store, mock_yf, make_bars):
+    full = make_bars(600)
+    stored, tail = full.iloc[:595], full.iloc[590:]
+    store.save("AAPL", stored, history_start=pd.Timestamp("2000-01-01", tz="UTC"),
+               fetched_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    mock_yf.Ticker.return_value.history.return_value = tail
+
+    with patch.object(data_fetcher, "_is_fresh", return_value=False):
+        df = data_fetcher.fetch_data("AAPL", period="5d")
+
+    kwargs = mock_yf.Ticker.return_value.history.call_args.kwargs
+    assert "start" in kwargs and "period" not in kwargs
+    assert df.index[-1] == full.index[-1]
+    assert len(store.load("AAPL").df) == 600
+
+
+def test_adjusted_history_triggers_full_refetch(store, mock_yf, make_bars):
+    full = make_bars(600)
+    store.save("AAPL", full.iloc[:595], history_start=pd.Timestamp("2023-01-01", tz="UTC"))
+    adjusted = full.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.5  # e.g. a 2:1 split
+    mock_yf.Ticker.return_value.history.side_effect = [adjusted.iloc[590:], adjusted]
+
+    with patch.object(data_fetcher, "_is_fresh", return_value=False):
+        data_fetcher.fetch_data("AAPL", period="5d")
+
+    assert mock_yf.Ticker.return_value.history.call_count == 2
+    assert store.load("AAPL").df["Close"].iloc[0] == adjusted["Close"].iloc[0]
+
+
+def test_unsupported_period_bypasses_store(store, mock_yf, make_bars):
+    mock_yf.Ticker.return_value.history.return_value = make_bars(10)
+    data_fetcher.fetch_data("AAPL", period="max")
+    assert store.load("AAPL") is None
+
+
+def test_shorter_periods_slice_cached_series(store, mock_yf, make_bars):
+    """scan (2y) → indicators (1y) → tracker (1mo) hits the provider once."""
+    mock_yf.Ticker.return_value.history.return_value = make_bars(800)
+
+    with patch.object(data_fetcher.SeriesCache, "_is_valid", return_value=True):
+        d2y = data_fetcher.fetch_data("NVDA", period="2y")
+        d1y = data_fetcher.fetch_data("NVDA", period="1y")
+        d1mo = data_fetcher.fetch_data("NVDA", period="1mo")
+        d3y = data_fetcher.fetch_data("NVDA", period="3y")
+
+    assert mock_yf.Ticker.return_value.history.call_count == 1
+    assert len(d1mo) < len(d1y) < len(d2y) < len(d3y)
+    assert d1mo.index[-1] == d3y.index[-1]
+
+
+def test_cached_series_is_not_mutated_by_callers(store, mock_yf, make_bars):
+    mock_yf.Ticker.return_value.history.return_value = make_bars(300)
+    with patch.object(data_fetcher.SeriesCache, "_is_valid", return_value=True):
+        df = data_fetcher.fetch_data("NVDA", period="1y")
+        df["SMA_200"] = 1.0
+        again = data_fetcher.fetch_data("NVDA", period="1y")
+    assert "SMA_200" not in again.columns
+
+
+def test_series_cache_expires_at_next_session_close(make_bars):
+    cache = data_fetcher.SeriesCache()
+    fetched = datetime(2026, 3, 6, 17, 0, tzinfo=MARKET_TZ)     # Fri after close
+    cache.put("AAPL", make_bars(10), pd.Timestamp("2020-01-01", tz="UTC"), fetched_at=fetched)
+    need = pd.Timestamp("2024-01-01", tz="UTC")
+
+    weekend = datetime(2026, 3, 8, 12, 0, tzinfo=MARKET_TZ)
+    assert cache.get("AAPL", need, now=weekend) is not None
+    mon_after_close = datetime(2026, 3, 9, 16, 30, tzinfo=MARKET_TZ)
+    assert cache.get("AAPL", need, now=mon_after_close) is None
+
+
+def test_series_cache_short_ttl_while_session_open(make_bars):
+    cache = data_fetcher.SeriesCache(intraday_ttl_seconds=300)
+    fetched = datetime(2026, 3, 9, 10, 0, tzinfo=MARKET_TZ)
+    cache.put("AAPL", make_bars(10), pd.Timestamp("2020-01-01", tz="UTC"), fetched_at=fetched)
+    need = pd.Timestamp("2024-01-01", tz="UTC")
+
+    assert cache.get("AAPL", need, now=datetime(2026, 3, 9, 10, 4, tzinfo=MARKET_TZ)) is not None
+    assert cache.get("AAPL", need, now=datetime(2026, 3, 9, 10, 6, tzinfo=MARKET_TZ)) is None
+
+
+def _bulk(frames):
+    """Shape per-ticker frames like yf.download(group_by='ticker')."""
+    return pd.concat(frames, axis=1, names=["Ticker", "Price"])
+
+
+def test_fetch_many_splits_bulk_download_and_isolates_failures(store, mock_yf, make_bars):
+    a, b = make_bars(800), make_bars(790, base=50.0)
+    mock_yf.download.return_value = _bulk({"AAA": a, "BBB": b})
+
+    batch = data_fetcher.fetch_many(["AAA", "BBB", "ZZZ"], period="2y")
+
+    assert set(batch.frames) == {"AAA", "BBB"}
+    assert "ZZZ" in batch.failures
+    assert list(batch.frames["AAA"].columns) == list(a.columns)
+    assert batch.frames["BBB"]["Close"].notna().all()  # calendar padding dropped
+    mock_yf.download.assert_called_once()
+    mock_yf.Ticker.assert_not_called()
+    assert store.load("AAA") is not None
+
+
+def test_fetch_many_chunks_requests_and_survives_a_failed_chunk(store, mock_yf, make_bars):
+    tickers = [f"T{i}" for i in range(5)]
+    good = _bulk({t: make_bars(800) for t in tickers[2:4]})
+    mock_yf.download.side_effect = [Exception("rate limited"), good, Exception("boom")]
+
+    with patch.object(data_fetcher, "CHUNK_SIZE", 2):
+        batch = data_fetcher.fetch_many(tickers, period="2y")
+
+    assert mock_yf.download.call_count == 3
+    assert set(batch.frames) == {"T2", "T3"}
+    assert set(batch.failures) == {"T0", "T1", "T4"}
+
+
+def test_fetch_many_serves_fresh_tickers_locally(store, mock_yf, make_bars):
+    store.save("AAA", make_bars(800), history_start=pd.Timestamp("2000-01-01", tz="UTC"))
+    mock_yf.download.return_value = _bulk({"BBB": make_bars(800)})
+
+    with patch.object(data_fetcher, "_is_fresh", return_value=True):
+        batch = data_fetcher.fetch_many(["AAA", "BBB"], period="1y")
+
+    assert set(batch.frames) == {"AAA", "BBB"}
+    assert mock_yf.download.call_args.args[0] == ["BBB"]
+
+
+def _run_concurrently(fn, n, leader_gate, release):
+    """Start a leader call that blocks until `release`, then n-1 followers
+    while it is still in flight."""
+    results = [None] * n
+
+    def worker(i):
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(0,))]
+    threads[0].start()
+    assert leader_gate.wait(2)
+    for i in range(1, n):
+        t = threading.Thread(target=worker, args=(i,))
+        t.start()
+        threads.append(t)
+    time.sleep(0.2)  # let followers reach the in-flight call
+    release.set()
+    for t in threads:
+        t.join(2)
+    return results
+
+
+def test_singleflight_shares_result_and_errors():
+    flight = data_fetcher.SingleFlight()
+    entered, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        entered.set()
+        release.wait(2)
+        return object()
+
+    results = _run_concurrently(lambda: flight.do("k", slow), 4, entered, release)
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.in_flight() == 0
+
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_fetch_data_coalesces_provider_calls(store, mock_yf, make_bars):
+    entered, release = threading.Event(), threading.Event()
+
+    def history(**kwargs):
+        entered.set()
+        release.wait(2)
+        return make_bars(800)
+
+    mock_yf.Ticker.return_value.history.side_effect = history
+    results = _run_concurrently(lambda: data_fetcher.fetch_data("NVDA", period="1y"),
+                                5, entered, release)
+
+    assert mock_yf.Ticker.return_value.history.call_count == 1
+    assert all(r is not None and not r.empty for r in results)
+    assert len({id(r) for r in results}) == 5  # each caller gets its own copy
+
+
+def test_crypto_store_uses_wall_clock_ttl(make_bars):
+    from src.core.bar_store import StoredBars
+    fri_evening = datetime(2026, 3, 6, 18, 0, tzinfo=MARKET_TZ)
+    stored = StoredBars(make_bars(10), pd.Timestamp("2020-01-01", tz="UTC"), fri_evening)
+    saturday = datetime(2026, 3, 7, 12, 0, tzinfo=MARKET_TZ)
+
+    assert data_fetcher._is_fresh(stored, now=saturday, ticker="AAPL")
+    assert not data_fetcher._is_fresh(stored, now=saturday, ticker="BTC-USD")
+    assert data_fetcher._is_fresh(stored, now=datetime(2026, 3, 6, 18, 4, tzinfo=MARKET_TZ), ticker="ETH-USD")
+
+
+def test_series_cache_crypto_uses_intraday_ttl_at_all_times(make_bars):
+    cache = data_fetcher.SeriesCache(intraday_ttl_seconds=300)
+    fetched = datetime(2026, 3, 6, 17, 0, tzinfo=MARKET_TZ)     # Fri after close
+    need = pd.Timestamp("2024-01-01", tz="UTC")
+    for t in ("AAPL", "BTC-USD"):
+        cache.put(t, make_bars(10), pd.Timestamp("2020-01-01", tz="UTC"), fetched_at=fetched)
+
+    saturday = datetime(2026, 3, 7, 12, 0, tzinfo=MARKET_TZ)
+    assert cache.get("AAPL", need, now=saturday) is not None
+    assert cache.get("BTC-USD", need, now=saturday) is None
+    assert cache.get("BTC-USD", need, now=datetime(2026, 3, 6, 17, 4, tzinfo=MARKET_TZ)) is not None
+
+
+def test_failed_top_up_is_retried_on_the_next_call(store, mock_yf, make_bars):
+    full = make_bars(600)
+    store.save("AAPL", full.iloc[:595], history_start=pd.Timestamp("2000-01-01", tz="UTC"),
+               fetched_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    history = mock_yf.Ticker.return_value.history
+    history.side_effect = [Exception("timeout"), full.iloc[590:]]
+
+    first = data_fetcher.fetch_data("AAPL", period="1mo")
+    assert first.index[-1] == full.index[594]          # stored bars still served
+    second = data_fetcher.fetch_data("AAPL", period="1mo")
+    assert history.call_count == 2
+    assert second.index[-1] == full.index[-1]
+
+
+def test_fetch_many_retries_a_failed_top_up(store, mock_yf, make_bars):
+    full = make_bars(800)
+    store.save("AAA", full.iloc[:795], history_start=pd.Timestamp("2000-01-01", tz="UTC"),
+               fetched_at=datetime(2020, 1, 1, tzinfo=timezone.utc))
+    mock_yf.download.side_effect = [Exception("rate limited"), _bulk({"AAA": full.iloc[790:]})]
+
+    first = data_fetcher.fetch_many(["AAA"], period="1y")
+    assert first.frames["AAA"].index[-1] == full.index[794]
+    second = data_fetcher.fetch_many(["AAA"], period="1y")
+    assert mock_yf.download.call_count == 2
+    assert second.frames["AAA"].index[-1] == full.index[-1]
@@ -0,0 +1,101 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.backtest import Portfolio
+from src.core import edge_stats
+from src.core import report_builder
+
+ALL = ["TRINITY", "PANIC", "2B", "DONCHIAN"]
+
+
+@pytest.fixture(scope="module")
+def panel(synthetic_panel):
+    return synthetic_panel(700, ["MSFT", "XOM", "AMD", "NVDA", "TSLA", "KO"])
+
+
+def test_shadow_books_match_separate_runs(panel, tester, ledger):
+    bt = tester(panel)
+    bt.run(strategies=ALL, shadows={name: {'strategies': [name]} for name in ALL})
+    combined = ledger(bt.portfolio)
+
+    alone = tester(panel)
+    alone.run(strategies=ALL)
+    pd.testing.assert_frame_equal(combined, ledger(alone.portfolio))
+
+    for name in ALL:
+        solo = tester(panel)
+        solo.run(strategies=[name])
+        pd.testing.assert_frame_equal(ledger(bt.shadow_portfolios[name]), ledger(solo.portfolio))
+        assert (list(bt.shadow_portfolios[name].equity_curve)
+                == list(solo.portfolio.equity_curve))
+
+
+def test_donchian_exit_book_trails_the_channel(panel, tester, ledger):
+    bt = tester(panel)
+    bt.run(strategies=ALL, shadows={"turtle": {'exit_mode': 'donchian'}})
+    atr, turtle = ledger(bt.portfolio), ledger(bt.shadow_portfolios["turtle"])
+    assert not turtle.empty
+    # No TP1 ladder on long Donchian-exit positions; shorts keep the ATR trail.
+    ladder = turtle[turtle["reason"] == "Take Profit 1 (Ladder)"]
+    assert (ladder["side"] == "SHORT").all()
+    assert not atr.equals(turtle)
+
+
+def test_refresh_writes_artifact_that_report_builder_loads(panel, tmp_path, monkeypatch, tester):
+    path = str(tmp_path / "edge_stats.json")
+    bt = tester(panel)
+    artifact = bt.refresh_edge_stats(exit_modes=('donchian',), path=path)
+
+    # PANIC barely fires on this universe: too few trades to replace config.
+    assert set(artifact["strategies"]) == {"trinity", "2b_reversal", "donchian"}
+    assert artifact["books"]["panic"]["trades"] < edge_stats.MIN_EDGE_TRADES
+    assert {"combined", "combined@donchian", "trinity@donchian"} <= set(artifact["books"])
+    solo = tester(panel)
+    solo.run(strategies=["DONCHIAN"])
+    profit = solo.portfolio.history.column('profit')
+    assert artifact["strategies"]["donchian"]["trades"] == len(profit)
+    assert artifact["strategies"]["donchian"]["avg_pnl"] == int(round(profit.mean()))
+
+    loaded = edge_stats.load_edge_stats(path)
+    assert loaded["donchian"] == artifact["strategies"]["donchian"]
+    assert loaded["panic"] == edge_stats.STRATEGY_EDGE_STATS["panic"]
+
+    # Force a negative edge for trinity: classify_signal now skips it.
+    on_disk = json.loads(open(path).read())
+    on_disk["strategies"]["trinity"].update(edge="negative", avg_pnl=-12)
+    with open(path, "w") as f:
+        json.dump(on_disk, f)
+    monkeypatch.setattr(report_builder, "load_edge_stats", lambda: edge_stats.load_edge_stats(path))
+    verdict, reason = report_builder.classify_signal({"strategy": "trinity", "confidence": 90})
+    assert verdict == "SKIP" and "-12" in reason
+
+
+def test_stale_or_missing_artifact_falls_back_to_config(tmp_path, monkeypatch):
+    path = str(tmp_path / "edge_stats.json")
+    assert edge_stats.load_edge_stats(path) is edge_stats.STRATEGY_EDGE_STATS
+
+    artifact = {"version": edge_stats.EDGE_STATS_VERSION, "param_version": "deadbeef",
+                "strategies": {"trinity": {"wr_pct": 1.0, "avg_pnl": -1, "trades": 1,
+                                           "edge": "negative", "label": "negative edge"}}}
+    with open(path, "w") as f:
+        json.dump(artifact, f)
+    assert edge_stats.load_edge_stats(path) is edge_stats.STRATEGY_EDGE_STATS
+
+    monkeypatch.setattr(edge_stats, "_param_version", lambda: "deadbeef")
+    edge_stats._loaded.clear()
+    assert edge_stats.load_edge_stats(path)["trinity"]["edge"] == "negative"
+    assert edge_stats.load_edge_stats(path)["panic"] == edge_stats.STRATEGY_EDGE_STATS["panic"]
+
+
+def test_strategy_that_never_fired_keeps_its_configured_edge(tmp_path, monkeypatch):
+    path = str(tmp_path / "edge_stats.json")
+    artifact = edge_stats.build_edge_stats({"2b_reversal": Portfolio()}, "3y", 6, 70)
+    assert artifact["books"]["2b_reversal"]["trades"] == 0
+    assert "2b_reversal" not in artifact["strategies"]
+    edge_stats.save_edge_stats(artifact, path)
+
+    monkeypatch.setattr(report_builder, "load_edge_stats", lambda: edge_stats.load_edge_stats(path))
+    verdict, _ = report_builder.classify_signal({"strategy": "2b_reversal", "confidence": 90})
+    assert verdict == "SKIP"
@@ -7,7 +7,8 @@ import os
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-from core.indicators import calculate_indicators, check_trinity_setup, check_panic_setup, check_2b_setup
+from core.indicators import (calculate_indicators, check_trinity_setup, check_panic_setup, check_2b_setup,
+                             required_columns, strategy_columns)
 
 class TestIndicators(unittest.TestCase):
     def setUp(self):
@@ -98,5 +99,27 @@ class TestIndicators(unittest.TestCase):
         result = check_panic_setup(latest, df)
         self.assertIsNone(result)
 
+    def test_strategy_columns_resolve_templates_and_dependencies(self):
+        cols = required_columns(strategy_columns(['donchian']))
+        self.assertIn('DONCHIAN_HIGH_55', cols)
+        self.assertIn('ATR_MEDIAN_100', cols)
+        self.assertIn('ATR_14', cols)        # the median's input
+        self.assertIn('SMA_200', cols)       # Regime's input
+        self.assertNotIn('RSI_14', cols)
+        self.assertIsNone(strategy_columns(None))
+        self.assertEqual(strategy_columns(['2B_Reversal']), {'RSI_14', 'MACD_Hist', 'Regime'})
+
+    def test_calculate_indicators_only_computes_requested_columns(self):
+        full = calculate_indicators(self.df.copy())
+        narrow = calculate_indicators(self.df.copy(), columns=strategy_columns(['TRINITY']))
+        self.assertNotIn('ATR_MEDIAN_100', narrow.columns)
+        self.assertNotIn('DONCHIAN_HIGH_55', narrow.columns)
+        self.assertNotIn('RVOL', narrow.columns)
+        for col in narrow.columns:
+            pd.testing.assert_series_equal(narrow[col], full[col])
+
+        atr_only = calculate_indicators(self.df.copy(), columns=['ATR_14'])
+        self.assertEqual(list(atr_only.columns), list(self.df.columns) + ['ATR_14'])
+
 if __name__ == '__main__':
     unittest.main()
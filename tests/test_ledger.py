@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.ledger import EQUITY_COLUMNS, TRADE_COLUMNS, ColumnLog
+
+
+def _trade(i, tz="America/New_York"):
+    day = pd.Timestamp("2025-01-02", tz=tz) + pd.Timedelta(days=i)
+    return {'ticker': f"T{i % 3}", 'strategy': "trinity", 'side': "LONG",
+            'entry_date': day, 'exit_date': day + pd.Timedelta(days=5), 'duration_days': 5,
+            'entry_price': 100.0 + i, 'exit_price': 101.0 + i, 'qty': 2.5,
+            'profit': 2.5, 'pct_gain': 1 / (100 + i), 'reason': "Stop Loss (Dynamic)"}
+
+
+def test_rows_round_trip_through_growth():
+    log = ColumnLog(TRADE_COLUMNS, capacity=2)
+    rows = [_trade(i) for i in range(9)]
+    for row in rows:
+        log.append(row)
+    assert len(log) == 9
+    assert list(log) == rows
+    assert log[-1] == rows[-1] and log[0]['entry_date'].tz is not None
+    with pytest.raises(IndexError):
+        log[9]
+    np.testing.assert_array_equal(log.column('entry_price'), [r['entry_price'] for r in rows])
+    pd.testing.assert_frame_equal(log.to_frame(), pd.DataFrame(rows), check_dtype=False)
+
+
+def test_naive_dates_and_empty_frame():
+    log = ColumnLog(EQUITY_COLUMNS)
+    assert list(log.to_frame().columns) == ['date', 'equity', 'cash'] and log.to_frame().empty
+    log.append({'date': pd.Timestamp("2025-01-02"), 'equity': 1.0, 'cash': 1.0})
+    assert log[0]['date'] == pd.Timestamp("2025-01-02") and log[0]['date'].tz is None
+    assert log.dates('date')[0] == pd.Timestamp("2025-01-02")
+
+
+def test_keep_drops_rows_and_appends_after():
+    log = ColumnLog(TRADE_COLUMNS, capacity=4)
+    rows = [_trade(i) for i in range(6)]
+    for row in rows:
+        log.append(row)
+    log.keep([i % 2 == 1 for i in range(6)])
+    assert list(log) == rows[1::2]
+    log.append(rows[0])
+    assert list(log) == rows[1::2] + rows[:1]
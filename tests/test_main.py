@@ -7,6 +7,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 from core.scanner import scan_market, process_ticker
+from core.data_fetcher import BatchFetch
 
 class TestMainIntegration(unittest.TestCase):
 
@@ -38,8 +39,9 @@ class TestMainIntegration(unittest.TestCase):
         result = process_ticker("BAD_TICKER")
         self.assertIsNone(result)
 
+    @patch('core.scanner.fetch_many')
     @patch('core.scanner.process_ticker')
-    def test_scan_market_multithreading(self, mock_process):
+    def test_scan_market_multithreading(self, mock_process, mock_fetch_many):
         # Simulate 2 hits and 1 miss
         mock_process.side_effect = [
             {'ticker': 'A', 'strategy': 'Trinity'},
@@ -48,11 +50,37 @@ class TestMainIntegration(unittest.TestCase):
         ]
         
         tickers = ['A', 'B', 'C']
+        mock_fetch_many.return_value = BatchFetch({t: pd.DataFrame({'Close': [100]}) for t in tickers}, {})
         results = scan_market(tickers)
         
         self.assertEqual(len(results), 2)
         found_tickers = sorted([r['ticker'] for r in results])
         self.assertEqual(found_tickers, ['A', 'C'])
+        mock_fetch_many.assert_called_once_with(tickers)
+
+    @patch('core.scanner.fetch_many')
+    @patch('core.scanner.process_ticker')
+    def test_scan_market_skips_failed_fetches(self, mock_process, mock_fetch_many):
+        mock_fetch_many.return_value = BatchFetch({'A': pd.DataFrame({'Close': [100]})}, {'B': 'no data returned'})
+        mock_process.return_value = None
+
+        scan_market(['A', 'B'])
+
+        self.assertEqual([c.args[0] for c in mock_process.call_args_list], ['A'])
+    @patch('core.scanner.fetch_data')
+    @patch('core.scanner.calculate_indicators')
+    @patch('core.scanner.check_panic_setup')
+    @patch('core.scanner.check_trinity_setup')
+    def test_process_ticker_runs_only_enabled_strategies(self, mock_trinity, mock_panic, mock_calc, mock_fetch):
+        mock_fetch.return_value = pd.DataFrame({'Close': [100]})
+        mock_calc.return_value = pd.DataFrame({'Close': [100]})
+        mock_trinity.return_value = None
+
+        process_ticker("AAPL", strategies=["TRINITY"])
+
+        mock_trinity.assert_called_once()
+        mock_panic.assert_not_called()
+        self.assertNotIn('ATR_MEDIAN_100', mock_calc.call_args.kwargs['columns'])
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,8 @@ from unittest.mock import patch
 import pandas as pd
 import pytest
 
+from src.core.data_fetcher import BatchFetch
+
 from src.core.market_analysis import (
     GaugeReading,
     fetch_market_snapshot,
@@ -88,12 +90,12 @@ def test_format_block_no_commentary_section_by_default():
 def test_fetch_market_snapshot_skips_failed_fetches():
     """When a gauge fetch returns None or empty data, it's silently skipped."""
 
-    def fake_fetch(symbol, period="2y"):
-        if symbol == "SPY":
-            return _mock_df([580, 581, 582, 583, 584, 585])
-        return None  # All others fail
+    def fake_fetch_many(symbols, period="2y"):
+        # All but SPY fail
+        return BatchFetch({"SPY": _mock_df([580, 581, 582, 583, 584, 585])},
+                          {s: "no data returned" for s in symbols if s != "SPY"})
 
-    with patch("src.core.market_analysis.fetch_data", side_effect=fake_fetch):
+    with patch("src.core.market_analysis.fetch_many", side_effect=fake_fetch_many):
         readings = fetch_market_snapshot()
 
     assert len(readings) == 1
@@ -106,9 +108,25 @@ def test_fetch_market_snapshot_skips_failed_fetches():
 
 def test_fetch_market_snapshot_handles_short_history():
     """Less than 6 bars → can't compute 5d % → skip gauge."""
-    def fake_fetch(symbol, period="2y"):
-        return _mock_df([100, 101, 102])  # only 3 bars
+    def fake_fetch_many(symbols, period="2y"):
+        return BatchFetch({s: _mock_df([100, 101, 102]) for s in symbols}, {})  # only 3 bars
 
-    with patch("src.core.market_analysis.fetch_data", side_effect=fake_fetch):
+    with patch("src.core.market_analysis.fetch_many", side_effect=fake_fetch_many):
         readings = fetch_market_snapshot()
     assert readings == []
+
+
+def test_fetch_market_snapshot_uses_one_batch_call():
+    calls = []
+
+    def fake_fetch_many(symbols, period="2y"):
+        calls.append((list(symbols), period))
+        return BatchFetch({s: _mock_df([100, 101, 102, 103, 104, 105]) for s in symbols}, {})
+
+    with patch("src.core.market_analysis.fetch_many", side_effect=fake_fetch_many), \
+            patch("src.core.market_analysis.fetch_data") as single:
+        readings = fetch_market_snapshot()
+
+    assert len(calls) == 1 and calls[0][1] == "1mo"
+    single.assert_not_called()
+    assert len(readings) == len(calls[0][0])
@@ -54,7 +54,7 @@ def test_handle_scan_ticker():
     with patch("src.mcp_server.process_ticker", return_value=signal):
         with patch("src.mcp_server.get_market_news", return_value="Good news"):
             with patch("src.mcp_server._cache") as mock_cache:
-                mock_cache.get.return_value = {"wr": 60, "trades": 30}
+                mock_cache.get_many.return_value = {"NVDA": {"wr": 60, "trades": 30}}
                 from src.mcp_server import handle_scan_ticker
                 result = handle_scan_ticker(ticker="NVDA")
     assert result["signal"]["ticker"] == "NVDA"
@@ -66,14 +66,13 @@ def test_handle_scan_ticker_no_signal():
     with patch("src.mcp_server.process_ticker", return_value=None):
         with patch("src.mcp_server.get_market_news", return_value="Some news"):
             with patch("src.mcp_server._cache") as mock_cache:
-                mock_cache.get.return_value = None
-                with patch("src.mcp_server.Backtester") as MockBT:
-                    instance = MagicMock()
-                    instance.get_summary_metrics.return_value = {"wr": 50}
-                    MockBT.return_value = instance
-                    from src.mcp_server import handle_scan_ticker
+                mock_cache.get_many.return_value = {}
+                with patch("src.mcp_server.solo_backtests", return_value=iter([("MSFT", {"wr": 50})])) as sims:
+                    from src.mcp_server import _checkpoints, handle_scan_ticker
                     result = handle_scan_ticker(ticker="MSFT")
+    sims.assert_called_once_with(["MSFT"], "3y", cache=mock_cache, checkpoints=_checkpoints)
     assert result["signal"] is None
+    assert result["backtest"] == {"wr": 50}
 
 
 def test_handle_backtest():
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.core import monte_carlo
+from src.core.monte_carlo import resample_trades
+
+PROFITS = np.array([500.0, -300.0, -400.0, 250.0, 900.0, -1200.0, 100.0, 300.0, -50.0, 700.0])
+
+
+def _path_stats(profits, initial):
+    equity = initial + np.cumsum(profits)
+    peak, longest, run, max_dd = initial, 0, 0, 0.0
+    for value in equity:
+        peak = max(peak, value)
+        run = 0 if value >= peak else run + 1
+        longest = max(longest, run)
+        max_dd = max(max_dd, (peak - value) / peak * 100)
+    return equity[-1], max_dd, longest
+
+
+def test_single_shuffled_path():
+    result = resample_trades([-100.0, -100.0, 300.0, -50.0], 1000.0, n_paths=1, method="shuffle", seed=0)
+    assert result.final_equity[0] == 1050.0
+    assert result.max_drawdown.shape == result.time_under_water.shape == (1,)
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "shuffle"])
+def test_matches_per_path_loop_across_blocks(method, monkeypatch):
+    monkeypatch.setattr(monte_carlo, "BLOCK_CELLS", 7 * len(PROFITS))   # 7 paths per block
+    result = resample_trades(PROFITS, 2000.0, n_paths=50, method=method, seed=3)
+
+    rng = np.random.default_rng(3)
+    for lo in range(0, 50, 7):
+        k = min(7, 50 - lo)
+        if method == "bootstrap":
+            block = PROFITS[rng.integers(0, len(PROFITS), size=(k, len(PROFITS)))]
+        else:
+            block = rng.permuted(np.tile(PROFITS, (k, 1)), axis=1)
+        for r, path in enumerate(block):
+            final, dd, uw = _path_stats(path, 2000.0)
+            assert result.final_equity[lo + r] == pytest.approx(final)
+            assert result.max_drawdown[lo + r] == pytest.approx(dd)
+            assert result.time_under_water[lo + r] == uw
+    if method == "shuffle":
+        assert np.allclose(result.final_equity, 2000.0 + PROFITS.sum())
+
+
+def test_summary_and_edge_cases():
+    summary = resample_trades(PROFITS, 2000.0, n_paths=2000, seed=1).summary()
+    assert summary["paths"] == 2000 and summary["method"] == "bootstrap"
+    eq = summary["final_equity"]
+    assert eq["p5"] < eq["p50"] < eq["p95"]
+    assert 0 < summary["prob_loss"] < 100
+
+    empty = resample_trades([], 1000.0, n_paths=5).summary()
+    assert empty["final_equity"]["p50"] == 1000.0 and empty["max_drawdown_pct"]["p95"] == 0.0
+    with pytest.raises(ValueError):
+        resample_trades(PROFITS, 1000.0, method="jackknife")
@@ -9,7 +9,7 @@ from core.news import get_market_news, news_query_for_ticker
 
 class TestNews(unittest.TestCase):
     
-    @patch('core.news.DDGS')
+    @patch('src.core.providers.DDGS')
     def test_get_news_success(self, mock_ddgs_cls):
         # Setup Mock
         mock_instance = mock_ddgs_cls.return_value
@@ -25,7 +25,7 @@ class TestNews(unittest.TestCase):
         self.assertIn("Stock goes up", result)
         self.assertIn("Bad News", result)
         
-    @patch('core.news.DDGS')
+    @patch('src.core.providers.DDGS')
     def test_get_news_empty(self, mock_ddgs_cls):
         mock_instance = mock_ddgs_cls.return_value
         mock_instance.news.return_value = []
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from src.core.outcomes import OUTCOME_HOLD, OUTCOME_LOSS, OUTCOME_WIN, first_passage
+
+
+def _loop_outcome(open_, high, low, i, sl, tp, horizon=20):
+    """The original per-candle loop from backtest_regime_performance."""
+    for j in range(i + 1, min(i + 1 + horizon, len(high))):
+        hit_tp, hit_sl = high[j] >= tp, low[j] <= sl
+        if hit_tp and hit_sl:
+            if open_[j] <= sl:
+                return OUTCOME_LOSS, j
+            if open_[j] >= tp:
+                return OUTCOME_WIN, j
+            return OUTCOME_LOSS, j
+        if hit_sl:
+            return OUTCOME_LOSS, j
+        if hit_tp:
+            return OUTCOME_WIN, j
+    return OUTCOME_HOLD, -1
+
+
+def test_matches_per_candle_loop():
+    rng = np.random.default_rng(7)
+    n = 400
+    close = 100 + np.cumsum(rng.normal(0, 2, n))
+    open_ = close + rng.normal(0, 1.5, n)
+    high = np.maximum(open_, close) + rng.exponential(2, n)   # wide bars → many ties
+    low = np.minimum(open_, close) - rng.exponential(2, n)
+    high[[50, 51]] = np.nan
+    entries = np.arange(n)
+    atr = rng.uniform(0.5, 3, n)
+    sl, tp = close - atr, close + atr
+
+    outcome, exit_idx = first_passage(open_, high, low, entries, sl, tp)
+    expected = [_loop_outcome(open_, high, low, i, sl[i], tp[i]) for i in entries]
+
+    assert outcome.tolist() == [o for o, _ in expected]
+    assert exit_idx.tolist() == [j for _, j in expected]
+    assert (outcome == OUTCOME_HOLD).any() and (outcome == OUTCOME_WIN).any()
+
+
+@pytest.mark.parametrize("bar_open, expected", [
+    (89.0, OUTCOME_LOSS),    # gapped down through SL
+    (111.0, OUTCOME_WIN),    # gapped up through TP
+    (100.0, OUTCOME_LOSS),   # opened between: assume SL first
+    (np.nan, OUTCOME_LOSS),
+])
+def test_bar_hitting_both_levels_uses_open(bar_open, expected):
+    open_ = np.array([100.0, bar_open])
+    high, low = np.array([100.0, 115.0]), np.array([100.0, 85.0])
+    outcome, exit_idx = first_passage(open_, high, low, [0], sl=[90.0], tp=[110.0])
+    assert outcome[0] == expected and exit_idx[0] == 1
+
+
+@pytest.mark.parametrize("bar_open, expected", [
+    (111.0, OUTCOME_LOSS),   # gapped up through a short's SL
+    (89.0, OUTCOME_WIN),     # gapped down through its TP
+    (100.0, OUTCOME_LOSS),
+])
+def test_short_entries_are_mirrored(bar_open, expected):
+    open_ = np.array([100.0, 100.0, bar_open])
+    high, low = np.array([100.0, 105.0, 115.0]), np.array([100.0, 95.0, 85.0])
+    outcome, exit_idx = first_passage(open_, high, low, [0, 0], sl=[110.0, 90.0], tp=[90.0, 110.0],
+                                      short=[True, False])
+    assert outcome[0] == expected and exit_idx[0] == 2
+    # the long entry alongside it is unaffected
+    long_only = first_passage(open_, high, low, [0], sl=[90.0], tp=[110.0])
+    assert (outcome[1], exit_idx[1]) == (long_only[0][0], long_only[1][0])
+
+
+def test_short_matches_negated_long():
+    rng = np.random.default_rng(3)
+    n = 200
+    close = 100 + np.cumsum(rng.normal(0, 2, n))
+    open_ = close + rng.normal(0, 1.5, n)
+    high = np.maximum(open_, close) + rng.exponential(2, n)
+    low = np.minimum(open_, close) - rng.exponential(2, n)
+    entries = np.arange(n)
+    sl, tp = close + 2, close - 3
+
+    outcome, exit_idx = first_passage(open_, high, low, entries, sl, tp, short=np.ones(n, dtype=bool))
+    expected = first_passage(-open_, -low, -high, entries, -sl, -tp)
+    assert outcome.tolist() == expected[0].tolist()
+    assert exit_idx.tolist() == expected[1].tolist()
+
+
+def test_horizon_and_series_end_give_hold():
+    flat = np.full(30, 100.0)
+    high = flat.copy()
+    high[25] = 120.0                          # beyond the 20-bar horizon of entry 0
+    outcome, exit_idx = first_passage(flat, high, flat, [0, 24, 29], sl=[90.0] * 3, tp=[110.0] * 3)
+    assert outcome.tolist() == [OUTCOME_HOLD, OUTCOME_WIN, OUTCOME_HOLD]
+    assert exit_idx.tolist() == [-1, 25, -1]
+
+
+def test_no_entries():
+    outcome, exit_idx = first_passage(np.ones(5), np.ones(5), np.ones(5), [], [], [])
+    assert len(outcome) == 0 and len(exit_idx) == 0
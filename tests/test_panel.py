@@ -0,0 +1,122 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import panel as panel_mod
+from src.core.data_fetcher import BatchFetch
+from src.core.panel import build_panel, load_panel, universe_panel
+from src.core.scanner import prefilter_tickers
+from src.core.sessions import MARKET_TZ
+
+
+@pytest.fixture
+def frames(make_bars):
+    penny = make_bars(40, base=1.0, end="2026-03-06")    # shorter history, closes < $5
+    penny[["Open", "High", "Low", "Close"]] *= 0.1
+    return {"AAA": make_bars(60, end="2026-03-06"), "BBB": penny,
+            "CCC": make_bars(30, end="2026-02-20")}
+
+
+def test_build_aligns_on_union_of_dates_with_nan_gaps(frames):
+    p = build_panel(frames)
+    assert p.shape == (5, 3, len(p.dates))
+    assert p.dates[0] == frames["AAA"].index[0] and p.dates[-1] == frames["AAA"].index[-1]
+    assert p.valid.sum(axis=1).tolist() == [60, 40, 30]
+    assert np.isnan(p.field("Close")[p.ticker_index("CCC"), -1])
+
+
+def test_frame_round_trips_original_bars(frames):
+    p = build_panel(frames)
+    for t, df in frames.items():
+        pd.testing.assert_frame_equal(p.frame(t), df, check_freq=False)
+    assert p.frame("NOPE") is None
+
+
+def test_save_and_mmap_load(tmp_path, frames):
+    p = build_panel(frames, period="3y")
+    path = str(tmp_path / "panel")
+    p.save(path)
+    p.save(path)  # overwrite in place
+
+    loaded = load_panel(path)
+    assert isinstance(loaded.values, np.memmap)
+    assert not loaded.values.flags.writeable
+    assert loaded.tickers == p.tickers and loaded.period == "3y"
+    np.testing.assert_array_equal(loaded.values, p.values)
+    assert (loaded.dates == p.dates).all()
+
+    df = loaded.frame("AAA")
+    df["Close"] += 1  # frames are private, writable copies
+    pd.testing.assert_frame_equal(loaded.frame("AAA"), frames["AAA"],
+                                  check_freq=False, check_index_type=False)
+
+
+def test_load_missing_panel_returns_none(tmp_path):
+    assert load_panel(str(tmp_path / "absent")) is None
+
+
+def test_universe_panel_reuses_fresh_panel(tmp_path, frames):
+    path = str(tmp_path / "u")
+    with patch.object(panel_mod, "fetch_many", return_value=BatchFetch(frames=frames, failures={})) as fm:
+        first = universe_panel(["AAA", "BBB", "CCC"], period="3y", path=path)
+        with patch.object(panel_mod, "_is_fresh", return_value=True):
+            again = universe_panel(["AAA", "BBB"], period="3y", path=path)
+        with patch.object(panel_mod, "_is_fresh", return_value=False):
+            universe_panel(["AAA"], period="3y", path=path)
+
+    assert fm.call_count == 2
+    assert again.tickers == first.tickers
+
+
+def test_panel_with_a_crypto_ticker_expires_on_the_short_ttl(frames):
+    built = datetime(2026, 3, 6, 18, 0, tzinfo=MARKET_TZ)             # Fri after close
+    saturday = datetime(2026, 3, 7, 12, 0, tzinfo=MARKET_TZ)
+    stocks = build_panel(frames)
+    mixed = build_panel({**frames, "BTC-USD": frames["AAA"]})
+    stocks.built_at = mixed.built_at = built
+    assert panel_mod._is_fresh(stocks, now=saturday)
+    assert not panel_mod._is_fresh(mixed, now=saturday)
+    assert panel_mod._is_fresh(mixed, now=datetime(2026, 3, 6, 18, 4, tzinfo=MARKET_TZ))
+
+
+def test_prefilter_drops_cheap_short_and_stale_tickers(frames):
+    p = build_panel(frames)
+    assert prefilter_tickers(p, ["AAA", "BBB", "CCC", "NEW"]) == ["AAA", "NEW"]
+    assert prefilter_tickers(p, min_price=1.0) == ["AAA", "BBB"]
+
+
+def test_backtester_loads_from_panel(frames):
+    from src.backtest import Backtester
+    p = build_panel(frames)
+    bt = Backtester(["AAA", "BBB", "ZZZ"])
+    with patch("src.backtest.fetch_many") as fm:
+        bt.load_data(panel=p)
+    fm.assert_not_called()
+    assert set(bt.data_store) == {"AAA", "BBB"}
+    assert "ATR_14" in bt.data_store["AAA"].columns
+
+
+def test_backtester_fills_at_next_open_once_per_ticker():
+    from src.backtest import Backtester
+    from src.core.providers import synthetic_bars
+    tickers = ["MSFT", "XOM", "AMD", "NVDA"]
+    frames = {t: synthetic_bars(t, 600) for t in tickers}
+    frames["XOM"] = frames["XOM"].iloc[100:]         # later listing: gaps in the union
+    bt = Backtester(tickers)
+    bt.load_data(panel=build_panel(frames))
+    bt.run(strategies=["TRINITY", "PANIC", "2B", "DONCHIAN"])
+
+    assert len(bt.portfolio.equity_curve) == 600
+    hist = pd.DataFrame(bt.portfolio.history)
+    assert not hist.empty
+    for trade in hist.drop_duplicates(["ticker", "entry_date"]).itertuples():
+        df = bt.data_store[trade.ticker]
+        i = df.index.get_loc(trade.entry_date)
+        assert i > 0 and trade.entry_price == df['Open'].iloc[i]
+    # At most one open position per ticker at a time.
+    for _, trades in hist.groupby("ticker"):
+        spans = trades.groupby("entry_date")["exit_date"].max().sort_index()
+        assert (spans.index[1:] >= spans.to_numpy()[:-1]).all()
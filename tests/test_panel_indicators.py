@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.core.indicators import calculate_indicators
+from src.core.panel import build_panel
+from src.core.panel_indicators import calculate_panel_indicators
+from src.core.providers import synthetic_bars
+
+
+@pytest.fixture
+def frames():
+    full = {t: synthetic_bars(t, 420) for t in ("MSFT", "AAPL", "XOM")}
+    full["AAPL"] = full["AAPL"].iloc[150:]                               # listed later
+    full["XOM"] = full["XOM"].drop(full["XOM"].index[200:204])           # trading halt
+    full["NEW"] = synthetic_bars("NEW", 30)                              # too short for most windows
+    return full
+
+
+def test_matches_per_ticker_calculate_indicators(frames):
+    out = calculate_panel_indicators(build_panel(frames))
+
+    for t, df in frames.items():
+        ref = calculate_indicators(df.copy())
+        got = out.frame(t)
+        assert got.index.equals(ref.index)
+        for col in ref.columns:
+            if col in ("Dividends", "Stock Splits"):
+                continue
+            if col == "Regime":
+                assert (got[col] == ref[col]).all(), t
+                continue
+            np.testing.assert_allclose(got[col].to_numpy(float), ref[col].to_numpy(float),
+                                       rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=f"{t} {col}")
+
+
+def test_indicator_panel_keeps_raw_fields_and_gaps(frames):
+    panel = build_panel(frames)
+    out = calculate_panel_indicators(panel)
+    assert out.fields[:len(panel.fields)] == panel.fields
+    assert "ATR_MEDIAN_100" in out.fields and "Regime" in out.fields
+    # No indicator values leak onto dates a ticker has no bar for.
+    atr = out.field("ATR_14")
+    assert np.isnan(atr[~panel.valid]).all()
+
+
+def test_scan_market_uses_one_panel_pass(frames):
+    from unittest.mock import patch
+    from src.core import scanner
+    from src.core.data_fetcher import BatchFetch
+
+    with patch.object(scanner, "fetch_many", return_value=BatchFetch(frames, {})), \
+            patch.object(scanner, "calculate_indicators") as per_ticker:
+        scanner.scan_market(list(frames), max_workers=2)
+    per_ticker.assert_not_called()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from src.core.ledger import EQUITY_COLUMNS, TRADE_COLUMNS, ColumnLog
+from src.core.performance import performance_metrics
+
+
+def _curve(equity, cash):
+    log = ColumnLog(EQUITY_COLUMNS)
+    for day, (e, c) in zip(pd.bdate_range("2025-01-02", periods=len(equity)), zip(equity, cash)):
+        log.append({'date': day, 'equity': e, 'cash': c})
+    return log
+
+
+def _ledger(trades):
+    log = ColumnLog(TRADE_COLUMNS)
+    day = pd.Timestamp("2025-01-02")
+    for strategy, entry, exit_, qty in trades:
+        log.append({'ticker': "AAA", 'strategy': strategy, 'side': "LONG", 'entry_date': day,
+                    'exit_date': day, 'duration_days': 0, 'entry_price': entry, 'exit_price': exit_,
+                    'qty': qty, 'profit': (exit_ - entry) * qty, 'pct_gain': exit_ / entry - 1,
+                    'reason': "x"})
+    return log
+
+
+def test_metrics_match_pandas():
+    equity = np.array([100.0, 104.0, 102.0, 99.0, 101.0, 106.0, 105.0, 103.0])
+    cash = np.array([100.0, 50.0, 50.0, 40.0, 40.0, 106.0, 60.0, 60.0])
+    trades = [("trinity", 10.0, 12.0, 5.0), ("panic", 20.0, 18.0, 3.0), ("trinity", 5.0, 4.0, 2.0)]
+    m = performance_metrics(_curve(equity, cash), _ledger(trades), initial_balance=100.0)
+
+    returns = pd.Series(np.concatenate(([100.0], equity))).pct_change().dropna()
+    assert m["sharpe"] == round(returns.mean() / returns.std() * np.sqrt(252), 2)
+    downside = np.sqrt((returns.clip(upper=0) ** 2).mean())
+    assert m["sortino"] == round(returns.mean() / downside * np.sqrt(252), 2)
+    assert m["max_drawdown_pct"] == round((104 - 99) / 104 * 100, 2)
+    assert m["max_drawdown_days"] == 3                      # 102, 99, 101 below the 104 peak
+    assert m["exposure_pct"] == round(((equity - cash) / equity).mean() * 100, 1)
+    notional = (5 * 22 + 3 * 38 + 2 * 9) / 2
+    assert m["turnover"] == round(notional / equity.mean() / (8 / 252), 2)
+    assert m["strategies"] == {
+        "panic": {"trades": 1, "win_rate": 0.0, "pnl": -6.0, "avg_pnl": -6.0, "roi_contribution": -6.0},
+        "trinity": {"trades": 2, "win_rate": 50.0, "pnl": 8.0, "avg_pnl": 4.0, "roi_contribution": 8.0},
+    }
+
+
+def test_empty_run():
+    m = performance_metrics(ColumnLog(EQUITY_COLUMNS), ColumnLog(TRADE_COLUMNS), 100.0)
+    assert m == {"days": 0, "max_drawdown_pct": 0.0, "max_drawdown_days": 0, "sharpe": 0.0,
+                 "sortino": 0.0, "exposure_pct": 0.0, "turnover": 0.0, "strategies": {}}
@@ -0,0 +1,102 @@
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.core import data_fetcher, providers
+from src.core.bar_store import BarStore
+from src.core.providers import ReplayProvider, record, synthetic_bars
+
+
+@pytest.fixture
+def replay(tmp_path):
+    p = ReplayProvider(root=str(tmp_path), synthetic_bars_count=400)
+    previous = providers.set_provider(p)
+    yield p
+    providers.set_provider(previous)
+
+
+def test_synthetic_bars_are_deterministic_and_well_formed():
+    a, b = synthetic_bars("NVDA", 300), synthetic_bars("NVDA", 300)
+    pd.testing.assert_frame_equal(a, b)
+    assert not a.equals(synthetic_bars("AMD", 300))
+    assert (a["High"] >= a[["Open", "Close"]].max(axis=1)).all()
+    assert (a["Low"] <= a[["Open", "Close"]].min(axis=1)).all()
+
+
+def test_replay_slices_period_relative_to_replay_clock(replay):
+    full = replay.history("NVDA", period="3y")
+    one_mo = replay.history("NVDA", period="1mo")
+    assert one_mo.index[-1] == full.index[-1]
+    assert 15 <= len(one_mo) <= 25
+    assert len(replay.history("NVDA", period="5d")) == 5
+
+
+def test_replay_prefers_recorded_bars(tmp_path):
+    (tmp_path / "bars").mkdir()
+    recorded = synthetic_bars("XYZ", 50, end="2024-06-28")
+    recorded.to_csv(tmp_path / "bars" / "XYZ.csv")
+
+    df = ReplayProvider(root=str(tmp_path)).history("XYZ", period="max")
+    assert len(df) == 50
+    assert df["Close"].iloc[-1] == pytest.approx(recorded["Close"].iloc[-1])
+
+
+def test_replay_without_synthetic_reports_missing(tmp_path):
+    p = ReplayProvider(root=str(tmp_path), synthetic=False)
+    frames, failures = p.history_many(["NOPE"], period="1y")
+    assert frames == {} and "NOPE" in failures
+    assert p.next_earnings("NOPE") is None
+    assert p.news("NOPE stock news", 3) == []
+
+
+def test_replay_serves_recorded_earnings_and_news(tmp_path):
+    (tmp_path / "earnings.json").write_text(json.dumps({"NVDA": "2026-05-20", "AMD": None}))
+    (tmp_path / "news.json").write_text(json.dumps(
+        {"NVDA stock news": [{"title": "Recorded", "body": "b", "url": "u", "date": None}]}))
+    p = ReplayProvider(root=str(tmp_path))
+    assert p.next_earnings("nvda") == date(2026, 5, 20)
+    assert p.next_earnings("AMD") is None
+    assert p.news("NVDA stock news", 5)[0]["title"] == "Recorded"
+
+
+def test_replay_synthetic_earnings_are_pinned_to_the_replay_end(tmp_path):
+    p = ReplayProvider(root=str(tmp_path))
+    d = p.next_earnings("MSFT")
+    assert date(2026, 1, 5) <= d <= date(2026, 3, 4)
+    assert ReplayProvider(root=str(tmp_path), synthetic_end="2025-01-02").next_earnings("MSFT") == d.replace(year=2025)
+
+
+def test_fetch_data_under_replay_bypasses_bar_store(replay, tmp_path, monkeypatch):
+    store = BarStore(root=str(tmp_path / "store"))
+    monkeypatch.setattr(data_fetcher, "_store", store)
+    df = data_fetcher.fetch_data("NVDA", period="1y")
+    assert df is not None and not df.empty
+    assert store.load("NVDA") is None
+
+
+def test_news_and_earnings_route_through_provider(replay):
+    from src.core.earnings import fetch_next_earnings
+    from src.core.news import get_market_news
+
+    assert "Replay headline" in get_market_news("NVDA stock news", max_results=2)
+    assert fetch_next_earnings("NVDA") is not None
+    assert data_fetcher.get_sp500_tickers()[:3] == ["AAPL", "MSFT", "NVDA"]
+
+
+def test_scan_market_runs_offline(replay):
+    from src.core.scanner import scan_market
+    results = scan_market(["AAA", "BBB", "CCC"])
+    assert isinstance(results, list)
+
+
+def test_record_round_trips_into_replay(tmp_path):
+    source = ReplayProvider(root=str(tmp_path / "src"), synthetic_bars_count=120)
+    out = tmp_path / "rec"
+    written = record(["AAA", "BBB"], period="3y", root=str(out), source=source)
+
+    assert written == {"AAA": 120, "BBB": 120}
+    replayed = ReplayProvider(root=str(out), synthetic=False).history("AAA", period="max")
+    original = source.history("AAA", period="max")
+    assert replayed["Close"].to_numpy() == pytest.approx(original["Close"].to_numpy())
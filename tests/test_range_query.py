@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.range_query import SparseTable
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 20, 300).astype(float)   # small ints → many ties
+    x[[5, 17, 18, 200]] = np.nan
+    return x
+
+
+@pytest.mark.parametrize("op", ["max", "min"])
+def test_ranges_match_pandas(series, op):
+    table, s = SparseTable(series, op), pd.Series(series)
+    starts, stops = np.meshgrid(np.arange(0, 300, 7), np.arange(0, 301, 11))
+    starts, stops = starts.ravel(), stops.ravel()
+    values, positions = table.extreme(starts, stops)
+    for a, b, v, p in zip(starts, stops, values, positions):
+        seg = s.iloc[a:b]
+        if seg.notna().any():
+            assert v == getattr(seg, op)()
+            assert p == (seg.idxmax() if op == "max" else seg.idxmin())
+        else:
+            assert np.isnan(v) and p == -1
+
+
+def test_scalar_queries_and_bounds(series):
+    table = SparseTable(series, "max")
+    assert table.value(20, 40) == np.nanmax(series[20:40])
+    assert table.arg(20, 40) == 20 + np.nanargmax(series[20:40])
+    assert np.isnan(table.value(17, 19)) and table.arg(17, 19) == -1   # all NaN
+    assert table.arg(10, 10) == -1 and table.arg(-1, 5) == -1 and table.arg(290, 301) == -1
+
+
+@pytest.mark.parametrize("op", ["max", "min"])
+@pytest.mark.parametrize("window", [1, 3, 55, 64, 300, 301])
+def test_rolling_matches_pandas(series, op, window):
+    s = pd.Series(series)
+    for shift in (0, 1):
+        expected = getattr(s.rolling(window), op)().shift(shift).to_numpy()
+        np.testing.assert_array_equal(SparseTable(series, op).rolling(window, shift), expected)
+
+
+def test_matrix_rows_are_independent():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(4, 120))
+    x[1, :30] = np.nan
+    table = SparseTable(x, "min")
+    expected = pd.DataFrame(x.T).rolling(20).min().shift(1).to_numpy().T
+    np.testing.assert_array_equal(table.rolling(20, shift=1), expected)
+    values, positions = table.extreme([0, 10], [50, 40])
+    assert values.shape == positions.shape == (4, 2)
+    for r in range(4):
+        assert positions[r, 1] == 10 + np.nanargmin(x[r, 10:40])
+    assert positions[1, 0] == 30 + np.argmin(x[1, 30:50])
+
+
+def test_rejects_unknown_op():
+    with pytest.raises(ValueError):
+        SparseTable([1.0, 2.0], "mean")
@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.core import indicators
+from src.core.indicators import backtest_regime_performance, calculate_indicators, check_trinity_setup
+from src.core.providers import synthetic_bars
+from src.core.regime_stats import RegimeStatsAccumulator
+
+
+@pytest.fixture(scope="module")
+def msft():
+    return calculate_indicators(synthetic_bars("MSFT", 300))
+
+
+@pytest.mark.parametrize("strategy, params", [
+    ("trinity", None),
+    ("panic", {"rsi_oversold": 40, "rvol_min": 1.0}),
+    ("donchian", {"lookback": 55, "atr_median_window": 100, "require_vol_expansion": False}),
+    ("2b", None),
+])
+def test_matches_backtest_on_every_prefix(msft, strategy, params):
+    acc = RegimeStatsAccumulator(msft, strategy, params=params)
+    seen_trades = False
+    for t in range(len(msft)):
+        expected = backtest_regime_performance(msft.iloc[:t + 1], strategy, params=params)
+        assert acc.at(t) == expected, t
+        seen_trades |= expected['total']['count'] > 0
+    assert seen_trades
+
+
+def _prefix_stats(df, t):
+    return backtest_regime_performance(df.iloc[:t + 1], "trinity")
+
+
+def test_recent_decay_tracks_the_window(msft):
+    acc = RegimeStatsAccumulator(msft, "trinity")
+    decayed = [t for t in range(len(msft)) if acc.at(t)['recent_decay']]
+    # MSFT's synthetic trinity run decays for a few days, recovers once those
+    # losses age out of the 14-day window, and decays again later.
+    gaps = [b for a, b in zip(decayed, decayed[1:]) if b != a + 1]
+    assert decayed and gaps
+    assert not _prefix_stats(msft, decayed[0] - 1)['recent_decay']
+    assert backtest_regime_performance(msft.iloc[:decayed[0] + 1], "trinity")['recent_decay']
+
+
+def test_skipped_days_and_no_going_back(msft):
+    acc = RegimeStatsAccumulator(msft, "trinity")
+    assert acc.at(250) == backtest_regime_performance(msft.iloc[:251], "trinity")
+    assert acc.at(250) is acc.stats()
+    with pytest.raises(ValueError):
+        acc.advance(100)
+
+
+def test_check_setup_uses_given_stats(msft):
+    row = msft.iloc[-1].copy()
+    row[['Close', 'SMA_200', 'EMA_50', 'RSI_14', 'ATR_14']] = [100.0, 90.0, 99.0, 50.0, 2.0]
+    stats = RegimeStatsAccumulator(msft, "trinity").at(len(msft) - 1)
+    with patch.object(indicators, "backtest_regime_performance") as brp:
+        result = check_trinity_setup(row, msft, stats=stats)
+    brp.assert_not_called()
+    assert result["stats"] is stats
+
+
+@pytest.mark.parametrize("strategy", ["trinity", "panic", "2b"])
+def test_stats_at_matches_stepping(msft, strategy):
+    stepped = RegimeStatsAccumulator(msft, strategy)
+    expected = [stepped.at(t) for t in range(len(msft))]
+    acc = RegimeStatsAccumulator(msft, strategy)
+    positions = list(range(len(msft) - 1, -1, -3))   # any order, gaps allowed
+    assert acc.stats_at(positions) == [expected[t] for t in positions]
+    assert acc.t == -1                                # did not move
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.core.indicators import backtest_regime_performance, calculate_indicators, check_2b_setup
+from src.core.providers import synthetic_bars
+from src.core.regime_stats import RegimeStatsAccumulator
+from src.core.reversal import detect_2b_reversals
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return {t: calculate_indicators(synthetic_bars(t, 400)) for t in ("MSFT", "XOM", "AMD", "NVDA")}
+
+
+@pytest.mark.parametrize("params", [
+    None,
+    {"lookback_min": 40, "lookback_max": 90, "sl_limit_pct": 0.02},
+])
+def test_matches_check_2b_setup_bar_for_bar(frames, params):
+    sides = set()
+    for ticker, df in frames.items():
+        bars = detect_2b_reversals(df, params)
+        acc = RegimeStatsAccumulator(df, "2b", params=params)
+        for i in range(len(df)):
+            stats = acc.at(i)
+            expected = check_2b_setup(df.iloc[i], df.iloc[:i + 1], params=params, stats=stats)
+            assert bool(bars.signal[i]) == bool(expected), (ticker, i)
+            if not expected:
+                continue
+            metrics = expected['metrics']
+            assert metrics['type'] == ("Bearish 2B" if bars.bearish[i] else "Bullish 2B")
+            assert metrics['key_level'] == f"${bars.key_level[i]:.2f}"
+            assert metrics['rsi_div'] == str(bars.divergence[i])
+            assert metrics['macd_weak'] == str(bars.macd_shrinking[i])
+            assert metrics['rating'] == bars.rating(i)
+            assert expected['plan']['stop_loss'] == np.round(bars.stop[i], 2)
+            assert expected['plan']['take_profit'] == np.round(bars.take_profit[i], 2)
+            sides.add(expected['side'])
+    assert sides == {"LONG", "SHORT"}
+
+
+def test_nothing_before_lookback(frames):
+    df = frames["MSFT"]
+    assert not detect_2b_reversals(df).signal[:60].any()
+    assert not detect_2b_reversals(df.iloc[:50]).signal.any()
+
+
+def test_check_reports_regime_stats(frames):
+    df = frames["AMD"]
+    bars = detect_2b_reversals(df)
+    i = int(np.flatnonzero(bars.signal)[-1])
+    result = check_2b_setup(df.iloc[i], df.iloc[:i + 1])
+    assert result['stats'] == backtest_regime_performance(df.iloc[:i + 1], "2b")
+    assert result['stats']['total']['count'] > 0
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.rolling import RollingMedian, rolling_median
+
+
+def _pandas_median(x, window):
+    return pd.Series(x).rolling(window=window).median().to_numpy()
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 20, 99, 100])
+def test_matches_pandas_exactly(window):
+    rng = np.random.default_rng(window)
+    x = rng.normal(size=757).round(1)        # plenty of ties
+    x[:13] = np.nan                          # ATR_14 warm-up
+    x[[200, 431]] = np.nan
+    np.testing.assert_array_equal(rolling_median(x, window), _pandas_median(x, window))
+
+
+def test_short_and_empty_series_are_all_nan():
+    assert rolling_median(np.array([]), 5).shape == (0,)
+    assert np.isnan(rolling_median(np.arange(4.0), 5)).all()
+
+
+def test_rows_are_independent():
+    rng = np.random.default_rng(0)
+    x = rng.lognormal(size=(6, 300))
+    x[1, :250] = np.nan                      # short history, right-aligned
+    x[4] = np.nan
+    expected = np.array([_pandas_median(row, 100) for row in x])
+    np.testing.assert_array_equal(rolling_median(x, 100), expected)
+
+
+def test_streaming_median_matches_batch():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=400)
+    x[50] = np.nan
+    med = RollingMedian(100)
+    out = []
+    for v in x:
+        out.append(med.peek(v))
+        med.push(v)
+    np.testing.assert_array_equal(np.array(out), rolling_median(x, 100))
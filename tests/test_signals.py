@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.core.indicators import (calculate_indicators, check_2b_setup, check_donchian_setup,
+                                 check_panic_setup, check_trinity_setup)
+from src.core.providers import synthetic_bars
+from src.core.regime_stats import RegimeStatsAccumulator
+from src.core.signals import strategy_signals
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return {t: calculate_indicators(synthetic_bars(t, 400)) for t in ("MSFT", "XOM", "AMD")}
+
+
+CHECKS = {
+    "TRINITY": check_trinity_setup,
+    "PANIC": check_panic_setup,
+    "2B": check_2b_setup,
+    "DONCHIAN": check_donchian_setup,
+}
+
+
+@pytest.mark.parametrize("key, params", [
+    ("TRINITY", None),
+    ("TRINITY", {"dist_to_ema_min": -0.05, "dist_to_ema_max": 0.05, "rsi_min": 30, "rsi_max": 70}),
+    ("PANIC", None),
+    ("PANIC", {"rsi_oversold": 45, "rvol_min": 0.8}),
+    ("2B", None),
+    ("DONCHIAN", None),
+    ("DONCHIAN", {"lookback": 55, "atr_median_window": 100, "require_vol_expansion": False}),
+])
+def test_matches_check_functions_bar_for_bar(frames, key, params):
+    fired = 0
+    for ticker, df in frames.items():
+        (sig,) = strategy_signals(df, [key], {key: params} if params else None)
+        acc = RegimeStatsAccumulator(df, key.lower(), params=params)
+        for i in range(len(df)):
+            stats = acc.at(i)
+            expected = CHECKS[key](df.iloc[i], df.iloc[:i + 1], params=params, stats=stats)
+            assert bool(sig.signal[i]) == bool(expected), (ticker, i)
+            if expected:
+                fired += 1
+                assert sig.strategy == expected['strategy']
+                assert sig.side_at(i) == expected['side']
+                plan = sig.plan(i)
+                assert plan == {k: expected['plan'][k] for k in plan}
+                assert sig.confidence(i, stats) == expected['confidence']
+    assert fired
+
+
+def test_nan_warmup_never_signals(frames):
+    df = frames["MSFT"]
+    no_atr = np.isnan(df['ATR_14'].to_numpy())
+    for sig in strategy_signals(df, ["TRINITY", "PANIC", "DONCHIAN"]):
+        assert not sig.signal[no_atr].any()
+        if sig.key != "PANIC":  # the rest need SMA_200
+            assert not sig.signal[:199].any()
+
+
+def test_missing_columns_and_unknown_strategies(frames):
+    df = frames["MSFT"].drop(columns=['RVOL'])
+    sigs = strategy_signals(df, ["PANIC", "SWING", "TRINITY"])
+    assert [s.key for s in sigs] == ["PANIC", "TRINITY"]
+    assert not sigs[0].signal.any()
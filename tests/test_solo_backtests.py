@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.backtest import Backtester, solo_backtests
+from src.core import cache_manager
+from src.core.cache_manager import BacktestCache
+from src.core.panel import build_panel
+from src.core.providers import synthetic_bars
+
+TICKERS = ["MSFT", "XOM", "AMD"]
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return {t: synthetic_bars(t, 500) for t in TICKERS}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_manager, "CACHE_FILE", str(tmp_path / "stats.db"))
+    return BacktestCache()
+
+
+def _sequential(ticker, frame):
+    bt = Backtester([ticker])
+    bt.load_data(panel=build_panel({ticker: frame}))
+    bt.run(min_confidence=60)
+    return bt.get_summary_metrics()
+
+
+def test_pool_matches_sequential_runs_and_writes_cache_once(frames, cache, monkeypatch):
+    save = MagicMock(wraps=cache.set_many)
+    monkeypatch.setattr(cache, "set_many", save)
+    results = dict(solo_backtests(TICKERS, min_confidence=60, cache=cache, max_workers=2, frames=frames))
+
+    assert results == {t: _sequential(t, frames[t]) for t in TICKERS}
+    assert save.call_count == 1
+    assert {t: BacktestCache().get(t, "3y") for t in TICKERS} == results
+
+
+def test_cache_hits_first_and_missing_data_not_cached(frames, cache):
+    cache.set("AMD", "3y", {"trades": 1})
+    results = list(solo_backtests(["MSFT", "AMD", "NONE"], min_confidence=60, cache=cache,
+                                  max_workers=1, frames=frames))
+    assert results[0] == ("AMD", {"trades": 1})
+    assert dict(results) == {"AMD": {"trades": 1}, "NONE": None, "MSFT": _sequential("MSFT", frames["MSFT"])}
+    assert cache.get("NONE", "3y") is None and cache.get("MSFT", "3y") == dict(results)["MSFT"]
@@ -0,0 +1,124 @@
+import pandas as pd
+import pytest
+
+from src.config import RISK_PARAMS, STRATEGY_PARAMS
+from src.sweep import SweepConfig, expand_grid, run_sweep
+
+STRATEGIES = ["TRINITY", "PANIC", "DONCHIAN"]
+
+
+@pytest.fixture(scope="module")
+def panel(synthetic_panel):
+    return synthetic_panel(600)
+
+
+@pytest.fixture
+def fresh_metrics(tester):
+    def run(panel, cfg):
+        bt = tester(panel)
+        bt.run(**cfg.run_kwargs())
+        return bt.get_summary_metrics()
+    return run
+
+
+def test_expand_grid_overrides_configured_params():
+    before = dict(STRATEGY_PARAMS["TRINITY"])
+    configs = expand_grid({"min_confidence": [60, 80], "TRINITY.rsi_min": [30, 35],
+                           "RISK.risk_per_trade": [0.01]}, base=SweepConfig(strategies=["TRINITY"]))
+    assert len(configs) == 4
+    cfg = configs[1]
+    assert cfg.min_confidence == 60 and cfg.strategies == ["TRINITY"]
+    assert cfg.strategy_params == {"TRINITY": {**STRATEGY_PARAMS["TRINITY"], "rsi_min": 35}}
+    assert cfg.risk_params == {**RISK_PARAMS, "risk_per_trade": 0.01}
+    assert cfg.tags == {"min_confidence": 60, "TRINITY.rsi_min": 35, "RISK.risk_per_trade": 0.01}
+    assert STRATEGY_PARAMS["TRINITY"] == before     # copies, not the config itself
+    with pytest.raises(ValueError):
+        expand_grid({"NOPE.x": [1]})
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_ranked_results_match_fresh_runs(panel, max_workers, tester, fresh_metrics):
+    configs = expand_grid({"TRINITY.rsi_min": [35, 45], "min_confidence": [60, 75],
+                           "RISK.max_position_size": [0.1, 0.2]},
+                          base=SweepConfig(strategies=STRATEGIES))
+    sweeper = tester(panel)
+    table = run_sweep(sweeper, configs, max_workers=max_workers)
+
+    assert list(table.index) == list(range(1, len(configs) + 1))
+    assert table["roi"].is_monotonic_decreasing
+    by_name = table.set_index("name")
+    for cfg in configs:
+        row = by_name.loc[cfg.name]
+        expected = fresh_metrics(panel, cfg)
+        assert {k: row[k] for k in expected} == expected, cfg.name
+    assert (table["trades"] > 0).any()
+
+
+def test_reruns_reuse_unchanged_strategy_scores(panel, monkeypatch, tester):
+    from src import backtest
+    sweeper = tester(panel)
+    calls = []
+    real = backtest.strategy_signals
+    monkeypatch.setattr(backtest, "strategy_signals", lambda df, keys, params=None: calls.append(keys) or real(df, keys, params))
+    configs = expand_grid({"PANIC.rvol_min": [1.0, 1.5], "min_confidence": [60, 70, 80]},
+                          base=SweepConfig(strategies=STRATEGIES))
+    run_sweep(sweeper, configs, max_workers=1)
+    # TRINITY / DONCHIAN once per ticker, PANIC once per ticker and rvol_min.
+    assert sorted(map(tuple, calls)) == sorted([("TRINITY",), ("DONCHIAN",)] * 4 + [("PANIC",)] * 8)
+
+
+def test_successive_halving_prunes_to_the_full_universe(panel, capsys, tester, fresh_metrics):
+    from src.sweep import successive_halving
+    sweeper = tester(panel)
+    configs = expand_grid({"TRINITY.rsi_min": [30, 35, 40, 45], "min_confidence": [60, 70]},
+                          base=SweepConfig(strategies=STRATEGIES))
+    result = successive_halving(sweeper, configs, stages=((0.5, 0.5), (1.0, 1.0)), keep=0.25, max_workers=1)
+
+    first, last = result.stages.to_dict("records")
+    assert (first["configs"], first["kept"], first["tickers"], first["days"]) == (8, 2, 2, 300)
+    assert (last["configs"], last["tickers"], last["days"]) == (2, 4, 600)
+    assert len(result.table) == 2
+    for name, row in result.table.set_index("name").iterrows():
+        cfg = next(c for c in configs if c.name == name)
+        expected = fresh_metrics(panel, cfg)
+        assert {k: row[k] for k in expected} == expected
+    assert "kept 2, pruned 6" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_walk_forward_folds_and_stitched_curve(panel, max_workers, tester):
+    sweeper = tester(panel)
+    configs = expand_grid({"min_confidence": [60, 80], "TRINITY.rsi_min": [35, 45]},
+                          base=SweepConfig(strategies=STRATEGIES))
+    result = sweeper.walk_forward(configs, in_sample_days=300, out_of_sample_days=100, max_workers=max_workers)
+
+    dates = sweeper.data_store["MSFT"].index
+    folds = result.folds
+    assert list(folds["fold"]) == [1, 2, 3]
+    assert list(folds["oos_start"]) == [dates[300], dates[400], dates[500]]
+    assert pd.isna(folds["oos_end"].iloc[-1])     # runs to the end of the data
+    assert set(folds["config"]) <= {c.name for c in configs}
+
+    # Each fold's choice is the in-sample winner, and its out-of-sample
+    # numbers are a plain windowed run of that config.
+    fold = folds.iloc[1]
+    scores = []
+    for cfg in configs:
+        bt = tester(panel)
+        bt.run(**cfg.run_kwargs(), start=fold["is_start"], end=fold["oos_start"])
+        scores.append(bt.get_summary_metrics()["roi"])
+    best = configs[scores.index(max(scores))]
+    assert fold["config"] == best.name and fold["is_roi"] == max(scores)
+    bt = tester(panel)
+    bt.run(**best.run_kwargs(), start=fold["oos_start"], end=fold["oos_end"])
+    assert fold["oos_roi"] == bt.get_summary_metrics()["roi"]
+    assert all(entry > fold["oos_start"] for entry in (t["entry_date"] for t in bt.portfolio.history))
+
+    # The stitched curve covers every out-of-sample day once and chains the folds.
+    equity = result.equity
+    assert list(equity["date"]) == list(dates[300:])
+    assert equity["equity"].iloc[0] == 100000
+    for k in (2, 3):
+        prev, cur = equity[equity["fold"] == k - 1], equity[equity["fold"] == k]
+        growth = 1 + folds.iloc[k - 1]["oos_roi"] / 100
+        assert cur["equity"].iloc[-1] == pytest.approx(prev["equity"].iloc[-1] * growth, rel=1e-3)